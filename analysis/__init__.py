@@ -0,0 +1,20 @@
+"""Build analysis package: enumeration and optimization over the build space."""
+
+from .build_enumerator import BuildEnumerator
+from .slot_allocator import SlotAllocator
+from .pareto import pareto_mask, Skyline
+from .point_buy import PointBuyOptimizer
+from .gear_frontier import GearFrontier
+from .gear_deltas import GearDeltaEvaluator
+from .build_search import BuildSearch
+
+__all__ = [
+    'BuildEnumerator',
+    'SlotAllocator',
+    'pareto_mask',
+    'Skyline',
+    'PointBuyOptimizer',
+    'GearFrontier',
+    'GearDeltaEvaluator',
+    'BuildSearch',
+]
@@ -0,0 +1,312 @@
+"""Enumeration of multiclass level splits and subclass choices."""
+from itertools import combinations, product
+
+import numpy as np
+
+from models import Character, FeatureTables
+
+
+class BuildEnumerator:
+    """
+    Enumerates every multiclass split up to the level cap.
+
+    A build is identified by a sorted tuple of (class, level, subclass)
+    entries. ESL, spell slots and compiled class features are memoized per
+    build key, so repeated queries over the same space only pay once.
+    """
+
+    SPELL_LEVELS = 6
+
+    def __init__(self, features_loader, spell_slot_calc, feature_tables=None):
+        """Initialize with a ClassFeaturesLoader and a SpellSlotCalculator."""
+        self.features_loader = features_loader
+        self.spell_slot_calc = spell_slot_calc
+        self.feature_tables = feature_tables or FeatureTables(features_loader)
+
+        self.classes = features_loader.get_available_classes()
+        self.class_index = {name: i for i, name in enumerate(self.classes)}
+        self.subclass_levels = {
+            c: features_loader.get_subclass_level(c) or Character.MAX_LEVEL + 1
+            for c in self.classes
+        }
+        self.subclass_options = {c: features_loader.get_subclass_options(c) for c in self.classes}
+
+        self._cache = {}        # {build_key: (esl, slots, feature_row)}
+        self._esl_cache = {}    # {build_key: esl}
+        self._slot_cache = {}   # {esl: slots tuple}
+        self._array_cache = {}  # {filters: structured array}
+        self._caster_subclasses = {}  # {subclass: sets its own caster type}
+        self._option_cache = {}  # {(class, reached subclass level): option info}
+
+        self.dtype = self.get_dtype()
+        # Slot counts by ESL for spell levels 1-6, straight from the calculator's dense table
+        self._slot_table = spell_slot_calc.slot_table[:, 1:self.SPELL_LEVELS + 1]
+
+    # --- Enumeration ---
+
+    @staticmethod
+    def _compositions(total, parts):
+        """Yield every way to split total into `parts` positive integers."""
+        for cuts in combinations(range(1, total), parts - 1):
+            bounds = (0,) + cuts + (total,)
+            yield tuple(bounds[i + 1] - bounds[i] for i in range(parts))
+
+    def iter_splits(self, total_level=Character.MAX_LEVEL, max_classes=3, required_classes=()):
+        """
+        Yield level splits as tuples of (class, level), classes in sorted order.
+
+        Args:
+            total_level: Total character level of every split
+            max_classes: Maximum number of distinct classes (None for no limit)
+            required_classes: Classes every split must include
+        """
+        required = {c.lower() for c in required_classes}
+        max_classes = min(max_classes or len(self.classes), len(self.classes), total_level)
+
+        for count in range(max(1, len(required)), max_classes + 1):
+            for class_combo in combinations(self.classes, count):
+                if not required.issubset(class_combo):
+                    continue
+                for levels in self._compositions(total_level, count):
+                    yield tuple(zip(class_combo, levels))
+
+    def iter_build_keys(self, total_level=Character.MAX_LEVEL, max_classes=3,
+                        required_classes=(), required_subclasses=()):
+        """
+        Yield build keys: sorted tuples of (class, level, subclass or "").
+
+        Classes that reached their subclass level branch over every subclass.
+        required_subclasses filters to builds that contain all listed subclasses.
+        """
+        required_subs = {s.lower() for s in required_subclasses}
+        required_classes = set(c.lower() for c in required_classes)
+
+        # A required subclass implies its class
+        for subclass in required_subs:
+            for class_name, options in self.subclass_options.items():
+                if subclass in options:
+                    required_classes.add(class_name)
+
+        for split in self.iter_splits(total_level, max_classes, required_classes):
+            choices = []
+            for class_name, level in split:
+                if level >= self.subclass_levels[class_name] and self.subclass_options[class_name]:
+                    choices.append(self.subclass_options[class_name])
+                else:
+                    choices.append([""])
+
+            for subclasses in product(*choices):
+                if required_subs and not required_subs.issubset(subclasses):
+                    continue
+                yield tuple(
+                    (class_name, level, subclass)
+                    for (class_name, level), subclass in zip(split, subclasses)
+                )
+
+    # --- Evaluation ---
+
+    def get_spell_slots(self, esl):
+        """Get the slot vector (levels 1-6) for an ESL, memoized."""
+        slots = self._slot_cache.get(esl)
+        if slots is None:
+            row = self.spell_slot_calc.get_slot_vector(esl)
+            slots = self._slot_cache.setdefault(esl, tuple(row[1:self.SPELL_LEVELS + 1].tolist()))
+        return slots
+
+    def _evaluate_keys(self, keys):
+        """Fill the cache for any keys not evaluated yet (features in one batch)."""
+        missing = [key for key in keys if key not in self._cache]
+        if not missing:
+            return
+
+        width = max(len(key) for key in missing)
+        table_keys = np.zeros((len(missing), width), dtype=np.int64)
+        table_levels = np.zeros((len(missing), width), dtype=np.int64)
+        esls = []
+
+        for row, key in enumerate(missing):
+            for col, (class_name, level, subclass) in enumerate(key):
+                table_keys[row, col] = self.feature_tables.get_key(class_name, subclass)
+                table_levels[row, col] = level
+            esls.append(self._get_esl(key))
+
+        features = self.feature_tables.resolve_batch(table_keys, table_levels)
+        for key, esl, row in zip(missing, esls, features):
+            self._cache.setdefault(key, (esl, self.get_spell_slots(esl), row))
+
+    def summarize(self, key):
+        """
+        Get the summary of one build key.
+        Returns: dict with levels, subclasses, esl, spell_slots and features
+        """
+        self._evaluate_keys([key])
+        esl, slots, row = self._cache[key]
+        return {
+            'levels': {class_name: level for class_name, level, _ in key},
+            'subclasses': {class_name: sub for class_name, _, sub in key if sub},
+            'esl': esl,
+            'spell_slots': {i + 1: count for i, count in enumerate(slots)},
+            'features': dict(zip(self.feature_tables.column_names, row.tolist())),
+        }
+
+    def enumerate_builds(self, **filters):
+        """Yield build summaries for every build key matching iter_build_keys filters."""
+        for key in self.iter_build_keys(**filters):
+            yield self.summarize(key)
+
+    def get_dtype(self):
+        """Structured dtype of enumerate_array rows."""
+        n_classes = len(self.classes)
+        fields = [
+            ('levels', np.int8, (n_classes,)),      # level per class, ordered as self.classes
+            ('subclasses', np.int8, (n_classes,)),  # index into subclass options, -1 for none
+            ('esl', np.int8),
+            ('slots', np.int8, (self.SPELL_LEVELS,)),
+        ]
+        fields += [(name, np.int16) for name in self.feature_tables.column_names]
+        return np.dtype(fields)
+
+    def _is_caster_subclass(self, subclass):
+        """Check whether a subclass sets its own caster type, memoized."""
+        caster = self._caster_subclasses.get(subclass)
+        if caster is None:
+            caster = self._caster_subclasses.setdefault(subclass, bool(
+                subclass and self.spell_slot_calc.get_subclass_caster_type(subclass)
+            ))
+        return caster
+
+    def _get_esl(self, key):
+        """
+        ESL of a build key, memoized. Subclasses that don't change caster type
+        are dropped from the memo key since they can't change the result.
+        """
+        key = tuple(
+            (class_name, level, sub if self._is_caster_subclass(sub) else "")
+            for class_name, level, sub in key
+        )
+        esl = self._esl_cache.get(key)
+        if esl is None:
+            levels = {class_name: level for class_name, level, _ in key}
+            subclasses = {class_name: sub for class_name, _, sub in key if sub}
+            esl = self._esl_cache.setdefault(
+                key, self.spell_slot_calc.calculate_effective_spell_level(levels, subclasses))
+        return esl
+
+    def _options_for(self, class_name, level):
+        """
+        Subclass choices of a class at a level, memoized.
+        Returns: (options, feature table keys, caster codes) where caster codes
+        tell apart only the options that change caster type (0 for the rest)
+        """
+        reached = level >= self.subclass_levels[class_name] and bool(self.subclass_options[class_name])
+        cache_key = (class_name, reached)
+        cached = self._option_cache.get(cache_key)
+        if cached is None:
+            options = self.subclass_options[class_name] if reached else [""]
+            table_keys = np.array([self.feature_tables.get_key(class_name, o) for o in options])
+            caster_codes = np.array([
+                i + 1 if self._is_caster_subclass(o) else 0 for i, o in enumerate(options)
+            ])
+            cached = self._option_cache.setdefault(cache_key, (options, table_keys, caster_codes))
+        return cached
+
+    def _split_block(self, split, required_subs):
+        """Evaluate every subclass combination of one level split into structured rows."""
+        classes = [class_name for class_name, _ in split]
+        levels = np.array([level for _, level in split], dtype=np.int64)
+        option_info = [self._options_for(c, level) for c, level in split]
+        options = [info[0] for info in option_info]
+
+        # One row per subclass combination: (rows, classes) of option indices
+        grid = np.indices([len(o) for o in options]).reshape(len(split), -1).T
+        if required_subs:
+            keep = np.ones(len(grid), dtype=bool)
+            for subclass in required_subs:
+                has_sub = np.zeros(len(grid), dtype=bool)
+                for j, opts in enumerate(options):
+                    if subclass in opts:
+                        has_sub |= grid[:, j] == opts.index(subclass)
+                keep &= has_sub
+            grid = grid[keep]
+            if not len(grid):
+                return None
+
+        block = np.zeros(len(grid), dtype=self.dtype)
+        block['subclasses'] = -1
+        cols = [self.class_index[c] for c in classes]
+        block['levels'][:, cols] = levels
+
+        table_keys = np.empty(grid.shape, dtype=np.int64)
+        caster_grid = np.empty(grid.shape, dtype=np.int64)
+        for j, (opts, option_keys, caster_codes) in enumerate(option_info):
+            table_keys[:, j] = option_keys[grid[:, j]]
+            caster_grid[:, j] = caster_codes[grid[:, j]]
+            if opts != [""]:
+                block['subclasses'][:, cols[j]] = grid[:, j]
+
+        features = self.feature_tables.resolve_batch(table_keys, np.broadcast_to(levels, grid.shape))
+        for col, name in enumerate(self.feature_tables.column_names):
+            block[name] = features[:, col]
+
+        # ESL only varies across subclass choices that change caster type
+        if caster_grid.any():
+            _, first, inverse = np.unique(caster_grid, axis=0, return_index=True, return_inverse=True)
+            inverse = inverse.reshape(-1)
+        else:
+            first, inverse = [0], np.zeros(len(grid), dtype=np.int64)
+        esl = np.array([
+            self._get_esl(tuple(
+                (c, int(level), opts[i]) for c, level, opts, i in zip(classes, levels, options, grid[row])
+            ))
+            for row in first
+        ])[inverse]
+        block['esl'] = esl
+        block['slots'] = self._slot_table[esl]
+
+        return block
+
+    def enumerate_array(self, total_level=Character.MAX_LEVEL, max_classes=3,
+                        required_classes=(), required_subclasses=()):
+        """
+        Evaluate every matching build into one read-only NumPy structured array.
+        Results are memoized per filter combination.
+
+        Example - 12-level builds with 6th-level slots and Extra Attack:
+            builds = enumerator.enumerate_array(total_level=12)
+            hits = builds[(builds['slots'][:, 5] > 0) & (builds['attacks_per_action'] >= 2)]
+        """
+        required_subs = tuple(sorted(s.lower() for s in required_subclasses))
+        required = {c.lower() for c in required_classes}
+        for subclass in required_subs:
+            for class_name, options in self.subclass_options.items():
+                if subclass in options:
+                    required.add(class_name)
+
+        cache_key = (total_level, max_classes, tuple(sorted(required)), required_subs)
+        cached = self._array_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        blocks = []
+        for split in self.iter_splits(total_level, max_classes, required):
+            block = self._split_block(split, required_subs)
+            if block is not None:
+                blocks.append(block)
+
+        result = np.concatenate(blocks) if blocks else np.zeros(0, dtype=self.dtype)
+        result.flags.writeable = False
+        return self._array_cache.setdefault(cache_key, result)
+
+    def describe(self, row):
+        """Turn a structured array row back into a readable build string."""
+        parts = []
+        for col, level in enumerate(row['levels']):
+            if level:
+                class_name = self.classes[col]
+                sub_index = row['subclasses'][col]
+                label = f"{class_name.capitalize()} {level}"
+                if sub_index >= 0:
+                    subclass = self.subclass_options[class_name][sub_index]
+                    label += f" ({subclass.replace('_', ' ').title()})"
+                parts.append(label)
+        return " / ".join(parts)
@@ -0,0 +1,362 @@
+"""Stochastic whole-build search: multiclass split, subclasses, point buy and gear."""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from models import Character
+from utils import make_executor
+from .point_buy import PointBuyOptimizer
+
+
+# Evaluator state of a worker process (set by _init_worker)
+_WORKER = None
+
+
+def _init_worker(gear_frontier, mods_table):
+    global _WORKER
+    _WORKER = (gear_frontier, mods_table)
+
+
+def _evaluate_chunk(genomes, target_ac):
+    """Evaluate genomes in a worker process."""
+    gear_frontier, mods_table = _WORKER
+    return evaluate_genomes(gear_frontier, mods_table, genomes, target_ac)
+
+
+def evaluate_genomes(gear_frontier, mods_table, genomes, target_ac=15):
+    """Objectives of several genomes (see evaluate_genome)."""
+    return [evaluate_genome(gear_frontier, mods_table, genome, target_ac) for genome in genomes]
+
+
+def evaluate_genome(gear_frontier, mods_table, genome, target_ac=15):
+    """
+    Objectives (AC, Melee, Ranged) of one build genome.
+
+    Args:
+        gear_frontier: GearFrontier used for the gear model
+        mods_table: List of {ability: modifier} dicts, indexed by point-buy row
+        genome: (build key, point-buy row, gear tuple in BuildSearch.GEAR_SLOTS order)
+    """
+    build_key, point_buy_row, gear = genome
+    levels = {class_name: level for class_name, level, _ in build_key}
+    subclasses = {class_name: subclass for class_name, _, subclass in build_key if subclass}
+    turn_stats = gear_frontier.get_turn_stats(levels, subclasses)
+    return gear_frontier.evaluate(dict(zip(BuildSearch.GEAR_SLOTS, gear)), turn_stats,
+                                  mods_table[point_buy_row], target_ac)
+
+
+class BuildSearch:
+    """
+    Simulated annealing over complete builds.
+
+    A genome is (build key, point-buy row, gear tuple): the build key is a
+    sorted tuple of (class, level, subclass) as in BuildEnumerator, the
+    point-buy row indexes PointBuyOptimizer's allocations and the gear tuple
+    holds one item per GEAR_SLOTS entry. Several annealing chains run side by
+    side; each step mutates every chain once and evaluates the new genomes as
+    one batch, optionally spread over worker threads (free-threaded builds)
+    or processes. Objectives are cached per genome, so revisited candidates
+    are free and a later search with different weights reuses earlier work.
+
+    Accessory and armour options are limited to items not dominated in the
+    GearFrontier feature space, which never removes an optimum.
+    """
+
+    GEAR_SLOTS = ("slot_helmet", "slot_cape", "slot_armor", "slot_gloves", "slot_boots", "slot_amulet",
+                  "slot_ring1", "slot_ring2", "melee_main", "melee_off", "ranged_main", "ranged_off")
+    MUTATIONS = ("level", "subclass", "point_buy", "gear", "gear")
+
+    def __init__(self, features_loader, gear_frontier, point_buy=None, max_classes=3):
+        """
+        Args:
+            features_loader: ClassFeaturesLoader (classes and subclasses)
+            gear_frontier: GearFrontier (gear model and item features)
+            point_buy: PointBuyOptimizer with the legal allocations (built when None)
+            max_classes: Maximum number of distinct classes in a build
+        """
+        self.gear_frontier = gear_frontier
+        self.point_buy = point_buy or PointBuyOptimizer(gear_frontier.turn_engine)
+        self.max_classes = max_classes
+
+        self.classes = features_loader.get_available_classes()
+        self.subclass_levels = {
+            c: features_loader.get_subclass_level(c) or Character.MAX_LEVEL + 1 for c in self.classes
+        }
+        self.subclass_options = {c: features_loader.get_subclass_options(c) for c in self.classes}
+
+        self.mods_table = [
+            dict(zip(self.point_buy.ABILITIES, row)) for row in self.point_buy.mods.tolist()
+        ]
+        self.slot_options = self._build_slot_options()
+
+        self._cache = {}  # {(genome, target AC): objectives}
+        self.evaluations = 0
+        self.cache_hits = 0
+
+    def _build_slot_options(self):
+        """Candidate items per gear slot, dropping items dominated in the gear feature space."""
+        frontier = self.gear_frontier
+        options = {}
+        for slot in frontier.ACCESSORY_SLOTS:
+            names = ["None"] + frontier.slot_items[slot]
+            features = np.array([frontier.get_item_features(name) for name in names])
+            options[slot] = [names[i] for i in sorted(frontier.prune(features))]
+
+        armors = ["None"] + frontier.slot_items["slot_armor"]
+        rows = []
+        for name in armors:
+            base_ac, max_dex, is_unarmored = frontier.armor_calc.get_armor_base(name)
+            rows.append(np.concatenate([[base_ac, max_dex, is_unarmored], frontier.get_item_features(name)]))
+        options["slot_armor"] = [armors[i] for i in sorted(frontier.prune(np.array(rows)))]
+
+        # Rings are worn in pairs: keep up to two rings per feature vector (two
+        # identical rings can be worn together), then drop rings dominated by
+        # two or more of the others
+        rings = ["None"] + frontier.slot_items["slot_ring"]
+        features = np.array([frontier.get_item_features(name) for name in rings])
+        _, group = np.unique(features, axis=0, return_inverse=True)
+        group = group.ravel()
+        kept = np.array([i for i, g in enumerate(group) if np.count_nonzero(group[:i] == g) < 2])
+        block = features[kept]
+        dominated_by = (np.all(block[:, np.newaxis, :] >= block[np.newaxis, :, :], axis=2)
+                        & np.any(block[:, np.newaxis, :] > block[np.newaxis, :, :], axis=2)).sum(axis=0)
+        options["slot_ring1"] = options["slot_ring2"] = [rings[i] for i in kept[dominated_by <= 1]]
+
+        options["melee_main"] = ["Unarmed"] + frontier.melee_mains
+        options["melee_off"] = ["None"] + frontier.melee_offhands
+        options["ranged_main"] = ["None"] + frontier.ranged_mains
+        options["ranged_off"] = ["None"] + frontier.ranged_offhands
+        return options
+
+    # --- Genomes ---
+
+    def _fix_subclasses(self, levels, subclasses, rng):
+        """Pick a subclass for classes that reached their subclass level, drop the rest."""
+        fixed = {}
+        for class_name, level in levels.items():
+            options = self.subclass_options[class_name]
+            if level >= self.subclass_levels[class_name] and options:
+                current = subclasses.get(class_name)
+                fixed[class_name] = current if current in options else options[rng.integers(len(options))]
+        return fixed
+
+    @staticmethod
+    def _build_key(levels, subclasses):
+        return tuple(sorted((c, level, subclasses.get(c, "")) for c, level in levels.items() if level))
+
+    def _fix_gear(self, gear):
+        """Clear off-hand items that can't be held with the main hand, and duplicate rings."""
+        gear = dict(gear)
+        if not self.gear_frontier.melee_offhand_allowed(gear["melee_main"], gear["melee_off"]):
+            gear["melee_off"] = "None"
+        if not self.gear_frontier.ranged_offhand_allowed(gear["ranged_main"], gear["ranged_off"]):
+            gear["ranged_off"] = "None"
+        if gear["slot_ring1"] == gear["slot_ring2"]:
+            gear["slot_ring2"] = "None"
+        return tuple(gear[slot] for slot in self.GEAR_SLOTS)
+
+    def random_genome(self, rng, total_level=Character.MAX_LEVEL):
+        """A uniformly random class split, point-buy allocation and gear set."""
+        count = int(rng.integers(1, min(self.max_classes, total_level) + 1))
+        classes = rng.choice(self.classes, size=count, replace=False).tolist()
+        cuts = np.sort(rng.choice(np.arange(1, total_level), size=count - 1, replace=False))
+        split = np.diff(np.concatenate([[0], cuts, [total_level]])).tolist()
+        levels = dict(zip(classes, split))
+
+        gear = {slot: options[rng.integers(len(options))] for slot, options in self.slot_options.items()}
+        return (self._build_key(levels, self._fix_subclasses(levels, {}, rng)),
+                int(rng.integers(len(self.point_buy))),
+                self._fix_gear(gear))
+
+    def genome_from_character(self, character_levels, character_subclasses, point_buy_row, gear):
+        """Encode a character (e.g. the one in the GUI) as a genome."""
+        levels = {c.lower(): level for c, level in character_levels.items() if level}
+        subclasses = {c.lower(): s.lower() for c, s in (character_subclasses or {}).items() if s}
+        gear = {slot: gear.get(slot) or "None" for slot in self.GEAR_SLOTS}
+        if gear["melee_main"] == "None":
+            gear["melee_main"] = "Unarmed"
+        return self._build_key(levels, subclasses), int(point_buy_row), self._fix_gear(gear)
+
+    def mutate(self, genome, rng):
+        """Apply one random change: move a level, swap a subclass, change point buy or one gear slot."""
+        build_key, point_buy_row, gear = genome
+        levels = {c: level for c, level, _ in build_key}
+        subclasses = {c: s for c, _, s in build_key if s}
+        mutation = self.MUTATIONS[rng.integers(len(self.MUTATIONS))]
+
+        if mutation == "level":
+            source = list(levels)[rng.integers(len(levels))]
+            targets = [c for c in self.classes if c != source and (c in levels or len(levels) < self.max_classes)]
+            if not targets:
+                # Single-class builds (max_classes=1) have nowhere to move a level
+                mutation = "gear"
+
+        if mutation == "level":
+            target = targets[rng.integers(len(targets))]
+            levels[source] -= 1
+            levels[target] = levels.get(target, 0) + 1
+            levels = {c: level for c, level in levels.items() if level}
+            subclasses = self._fix_subclasses(levels, subclasses, rng)
+        elif mutation == "subclass" and subclasses:
+            class_name = list(subclasses)[rng.integers(len(subclasses))]
+            options = self.subclass_options[class_name]
+            subclasses[class_name] = options[rng.integers(len(options))]
+        elif mutation == "point_buy":
+            # Mostly small steps: the closest of a few random allocations
+            sample = rng.integers(len(self.point_buy), size=16)
+            distance = np.abs(self.point_buy.mods[sample] - self.point_buy.mods[point_buy_row]).sum(axis=1)
+            distance[sample == point_buy_row] = 1 << 30
+            point_buy_row = int(sample[distance.argmin()] if rng.random() < 0.8 else sample[0])
+        else:
+            gear = dict(zip(self.GEAR_SLOTS, gear))
+            slot = self.GEAR_SLOTS[rng.integers(len(self.GEAR_SLOTS))]
+            options = self.slot_options[slot]
+            gear[slot] = options[rng.integers(len(options))]
+            gear = self._fix_gear(gear)
+
+        return self._build_key(levels, subclasses), point_buy_row, gear
+
+    # --- Evaluation ---
+
+    def evaluate_batch(self, genomes, target_ac=15, executor=None, workers=1):
+        """
+        Objectives of many genomes; cached genomes are not evaluated again.
+
+        Returns:
+            List of objective dicts in genome order
+        """
+        missing = list(dict.fromkeys(g for g in genomes if (g, target_ac) not in self._cache))
+        self.cache_hits += len(genomes) - len(missing)
+        self.evaluations += len(missing)
+
+        if executor is not None and len(missing) > workers:
+            chunks = [missing[w::workers] for w in range(workers)]
+            if isinstance(executor, ThreadPoolExecutor):
+                # Threads share this process's GearFrontier and its caches
+                futures = [executor.submit(evaluate_genomes, self.gear_frontier, self.mods_table, chunk, target_ac)
+                           for chunk in chunks]
+            else:
+                futures = [executor.submit(_evaluate_chunk, chunk, target_ac) for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                for genome, objectives in zip(chunk, future.result()):
+                    self._cache[(genome, target_ac)] = objectives
+        else:
+            for genome in missing:
+                self._cache[(genome, target_ac)] = evaluate_genome(
+                    self.gear_frontier, self.mods_table, genome, target_ac)
+
+        return [self._cache[(g, target_ac)] for g in genomes]
+
+    def caches(self):
+        """Memo caches by name (for size reporting; treat as read-only)."""
+        return {'objectives': self._cache}
+
+    @staticmethod
+    def score(objectives, weights):
+        """Weighted sum of objectives."""
+        return sum(weight * objectives[name] for name, weight in weights.items())
+
+    # --- Search ---
+
+    def search(self, time_budget=60.0, weights=None, target_ac=15, chains=32, seed=None,
+               initial=None, workers=1, backend="auto", progress=None, progress_interval=1.0):
+        """
+        Anneal builds until the wall-clock budget runs out.
+
+        Args:
+            time_budget: Seconds to search
+            weights: Dict of objective -> weight, e.g. {"Melee": 1.0, "AC": 2.0}
+            target_ac: Armor class of the target for expected damage
+            chains: Number of annealing chains mutated per batch
+            seed: Seed for the search (fresh entropy when None)
+            initial: Optional genomes to start some chains from (e.g. genome_from_character)
+            workers: Number of threads or processes evaluating each batch
+            backend: "thread", "process" or "auto" (threads on free-threaded builds, see utils.parallel)
+            progress: Optional callback(report) called with the best-so-far report
+            progress_interval: Minimum seconds between progress callbacks
+
+        Returns:
+            Report dict: best (describe() of the best build), score, evaluations,
+            cache_hits, batches, elapsed and history [(elapsed, best score)]
+        """
+        weights = weights or {"Melee": 1.0, "AC": 2.0}
+        rng = np.random.default_rng(seed)
+        start = time.perf_counter()
+
+        current = list(initial or [])[:chains]
+        current += [self.random_genome(rng) for _ in range(chains - len(current))]
+
+        executor = None
+        if workers > 1:
+            executor, _ = make_executor(workers, backend, _init_worker, (self.gear_frontier, self.mods_table),
+                                        name="build-search")
+        evaluations, cache_hits = self.evaluations, self.cache_hits
+        try:
+            scores = np.array([self.score(o, weights) for o in
+                               self.evaluate_batch(current, target_ac, executor, workers)])
+            best_index = int(scores.argmax())
+            best, best_score = current[best_index], float(scores[best_index])
+            history = [(time.perf_counter() - start, best_score)]
+
+            # Temperature falls geometrically from the initial score spread to 1% of it
+            start_temperature = max(float(scores.std()), 1e-6)
+            batches = 0
+            last_report = start
+            while True:
+                elapsed = time.perf_counter() - start
+                if elapsed >= time_budget:
+                    break
+                temperature = start_temperature * 0.01 ** (elapsed / time_budget)
+
+                proposals = [self.mutate(genome, rng) for genome in current]
+                proposal_scores = np.array([self.score(o, weights) for o in
+                                            self.evaluate_batch(proposals, target_ac, executor, workers)])
+                accept = (proposal_scores >= scores) | (
+                    rng.random(len(scores)) < np.exp(np.minimum(proposal_scores - scores, 0) / temperature))
+                current = [p if a else g for p, g, a in zip(proposals, current, accept)]
+                scores = np.where(accept, proposal_scores, scores)
+                batches += 1
+
+                if scores.max() > best_score:
+                    best_index = int(scores.argmax())
+                    best, best_score = current[best_index], float(scores[best_index])
+                    history.append((time.perf_counter() - start, best_score))
+
+                now = time.perf_counter()
+                if progress and now - last_report >= progress_interval:
+                    last_report = now
+                    progress(self._report(best, best_score, target_ac, weights, start, history, batches,
+                                          evaluations, cache_hits))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        report = self._report(best, best_score, target_ac, weights, start, history, batches,
+                              evaluations, cache_hits)
+        if progress:
+            progress(report)
+        return report
+
+    def _report(self, best, best_score, target_ac, weights, start, history, batches, evaluations, cache_hits):
+        return {
+            'best': self.describe(best, target_ac),
+            'score': best_score,
+            'weights': dict(weights),
+            'evaluations': self.evaluations - evaluations,
+            'cache_hits': self.cache_hits - cache_hits,
+            'batches': batches,
+            'elapsed': time.perf_counter() - start,
+            'history': list(history),
+        }
+
+    def describe(self, genome, target_ac=15):
+        """Turn a genome into a dict with levels, subclasses, point buy, gear and objectives."""
+        build_key, point_buy_row, gear = genome
+        return {
+            'levels': {class_name: level for class_name, level, _ in build_key},
+            'subclasses': {class_name: subclass for class_name, _, subclass in build_key if subclass},
+            'point_buy': self.point_buy.describe(point_buy_row),
+            'gear': dict(zip(self.GEAR_SLOTS, gear)),
+            'objectives': self._cache.get((genome, target_ac)) or self.evaluate_batch([genome], target_ac)[0],
+        }
@@ -0,0 +1,161 @@
+"""Per-slot item contributions and best single swaps for an equipped gear set."""
+import numpy as np
+
+
+class GearDeltaEvaluator:
+    """
+    Leave-one-out contributions and top swaps for every gear slot in one pass.
+
+    Uses the GearFrontier feature model: accessories and armour add up as
+    feature vectors and weapon loadouts have memoized features, so swapping
+    one slot is a vector subtraction and addition. Every candidate of a slot
+    is scored at once with GearFrontier.objectives instead of recomputing the
+    whole character per candidate.
+    """
+
+    def __init__(self, gear_frontier):
+        """Initialize with a GearFrontier (item and loadout features)."""
+        self.frontier = gear_frontier
+        self.refresh()
+
+    def refresh(self):
+        """Rebuild the slot candidate lists from the frontier and drop the feature tables."""
+        frontier = self.frontier
+        self.slot_candidates = {slot: ["None"] + frontier.slot_items[slot] for slot in frontier.ACCESSORY_SLOTS}
+        self.slot_candidates["slot_armor"] = ["None"] + frontier.slot_items["slot_armor"]
+        self.slot_candidates["slot_ring1"] = self.slot_candidates["slot_ring2"] = ["None"] + frontier.slot_items["slot_ring"]
+        self.slot_candidates["melee_main"] = ["None", "Unarmed"] + frontier.melee_mains
+        self.slot_candidates["melee_off"] = ["None"] + frontier.melee_offhands
+        self.slot_candidates["ranged_main"] = ["None"] + frontier.ranged_mains
+        self.slot_candidates["ranged_off"] = ["None"] + frontier.ranged_offhands
+
+        self._feature_tables = {}  # {slot: (n, 6) item features}
+        self._armor_table = None
+
+    def _features(self, slot):
+        """Feature matrix of a slot's candidates, built once."""
+        if slot not in self._feature_tables:
+            self._feature_tables[slot] = np.array([
+                self.frontier.get_item_features(name) for name in self.slot_candidates[slot]
+            ])
+        return self._feature_tables[slot]
+
+    def _armors(self):
+        """(features with no unarmoured bonus, base AC, max DEX, unarmoured) of every armour candidate."""
+        if self._armor_table is None:
+            names = self.slot_candidates["slot_armor"]
+            features = self._features("slot_armor").copy()
+            features[:, self.frontier.AC_UNARMORED] = 0
+            base = [self.frontier.armor_calc.get_armor_base(name) for name in names]
+            base_ac, max_dex, unarmored = (np.array(column) for column in zip(*base))
+            self._armor_table = (features, base_ac, max_dex, unarmored)
+        return self._armor_table
+
+    def _candidate_values(self, slot, gear, state, ability_mods, turn_stats, target_ac):
+        """
+        Objectives with each candidate in one slot, the rest unchanged.
+        Returns: (candidate names, values (3, n)) where an off hand that can't
+        be held with a new main hand is dropped
+        """
+        frontier = self.frontier
+        features, armor, melee, ranged = state
+        dex_mod = ability_mods.get("Dexterity", 0)
+        names = self.slot_candidates[slot]
+
+        if slot == "slot_armor":
+            armor_features, base_ac, max_dex, unarmored = self._armors()
+            current = frontier.get_item_features(gear.get(slot, "None")).copy()
+            current[frontier.AC_UNARMORED] = 0
+            values = frontier.objectives(features - current + armor_features,
+                                         (base_ac, max_dex, unarmored), melee, ranged, dex_mod)
+        elif slot in ("melee_main", "melee_off"):
+            main, offhand = gear.get("melee_main", "Unarmed"), gear.get("melee_off", "None")
+            loadouts = [
+                (name, offhand if frontier.melee_offhand_allowed(name, offhand) else "None") if slot == "melee_main"
+                else (main, name)
+                for name in names
+            ]
+            if slot == "melee_off":
+                keep = [i for i, (m, o) in enumerate(loadouts) if frontier.melee_offhand_allowed(m, o)]
+                names, loadouts = [names[i] for i in keep], [loadouts[i] for i in keep]
+            table = np.array([frontier.get_melee_features(m, o, ability_mods, turn_stats, target_ac)
+                              for m, o in loadouts])
+            values = frontier.objectives(features, armor, table, ranged, dex_mod)
+        elif slot in ("ranged_main", "ranged_off"):
+            main, offhand = gear.get("ranged_main", "None"), gear.get("ranged_off", "None")
+            loadouts = [
+                (name, offhand if frontier.ranged_offhand_allowed(name, offhand) else "None") if slot == "ranged_main"
+                else (main, name)
+                for name in names
+            ]
+            if slot == "ranged_off":
+                keep = [i for i, (m, o) in enumerate(loadouts) if frontier.ranged_offhand_allowed(m, o)]
+                names, loadouts = [names[i] for i in keep], [loadouts[i] for i in keep]
+            table = np.array([frontier.get_ranged_features(m, o, ability_mods, turn_stats, target_ac)
+                              for m, o in loadouts])
+            values = frontier.objectives(features, armor, melee, table, dex_mod)
+        else:
+            # Rings can't be doubled up
+            other = {"slot_ring1": "slot_ring2", "slot_ring2": "slot_ring1"}.get(slot)
+            if other and gear.get(other, "None") != "None":
+                keep = [i for i, name in enumerate(names) if name != gear[other]]
+            else:
+                keep = list(range(len(names)))
+            names = [names[i] for i in keep]
+            current = frontier.get_item_features(gear.get(slot, "None"))
+            values = frontier.objectives(features - current + self._features(slot)[keep],
+                                         armor, melee, ranged, dex_mod)
+
+        return names, np.array(values, dtype=float).reshape(3, -1)
+
+    def analyze(self, gear, character_levels, character_subclasses, ability_mods, target_ac=15,
+                weights=None, top_k=3):
+        """
+        Contribution of every equipped item and the best single swaps per slot.
+
+        Args:
+            gear: Dict of slot tag -> equipped item name
+            character_levels: Dict of class name -> level
+            character_subclasses: Dict of class name -> subclass name
+            ability_mods: Dict of ability name -> modifier
+            target_ac: Armor class of the target for expected damage
+            weights: Dict of objective -> weight used to rank swaps
+                     (default {"Melee": 1.0, "Ranged": 1.0, "AC": 2.0})
+            top_k: Swaps to keep per slot
+
+        Returns:
+            Dict with objectives of the current gear and slots: slot tag ->
+            {item, contribution (objective deltas vs. an empty slot),
+            swaps [{item, delta, score}] best first, only improvements}
+        """
+        weights = weights or {"Melee": 1.0, "Ranged": 1.0, "AC": 2.0}
+        weight_vector = np.array([weights.get(name, 0.0) for name in self.frontier.OBJECTIVES])
+        gear = {slot: gear.get(slot) or "None" for slot in self.slot_candidates}
+
+        frontier = self.frontier
+        turn_stats = frontier.get_turn_stats(character_levels, character_subclasses)
+        state = frontier.get_gear_state(gear, turn_stats, ability_mods, target_ac)
+        current = np.array(frontier.objectives(*state, ability_mods.get("Dexterity", 0)), dtype=float)
+
+        slots = {}
+        for slot in self.slot_candidates:
+            names, values = self._candidate_values(slot, gear, state, ability_mods, turn_stats, target_ac)
+            deltas = values - current[:, np.newaxis]
+            scores = weight_vector @ deltas
+
+            # Leave-one-out: the slot emptied ("None" is always the first candidate)
+            contribution = 0.0 - deltas[:, 0] if names and names[0] == "None" else np.zeros(3)
+
+            order = np.argsort(-scores, kind='stable')
+            swaps = [
+                {'item': names[i], 'delta': dict(zip(frontier.OBJECTIVES, deltas[:, i].tolist())),
+                 'score': float(scores[i])}
+                for i in order[:top_k + 1] if scores[i] > 1e-9 and names[i] != gear[slot]
+            ][:top_k]
+            slots[slot] = {
+                'item': gear[slot],
+                'contribution': dict(zip(frontier.OBJECTIVES, contribution.tolist())),
+                'swaps': swaps,
+            }
+
+        return {'objectives': dict(zip(frontier.OBJECTIVES, current.tolist())), 'slots': slots}
@@ -0,0 +1,570 @@
+"""AC vs. damage trade-off frontier over the gear space."""
+import numpy as np
+
+from .pareto import pareto_mask, Skyline
+
+
+class GearFrontier:
+    """
+    Finds the gear sets that are Pareto-optimal in (AC, melee, ranged damage).
+
+    The full product of slots is far too large to enumerate, so the search
+    works on additive features instead. Every accessory or armour contributes
+    AC and per-hit weapon/unarmed damage; every weapon loadout contributes its
+    own expected damage plus the hit and crit chances per turn that scale the
+    accessory bonuses. Expected damage is monotone in each of those features,
+    so dominated items are dropped per slot and after each slot is added to
+    the accessory bundles, and the result is exact.
+
+    The surviving gear sets form a candidate pool held in a Skyline. Minimum
+    AC / damage and shield constraints only switch pool rows on and off, so
+    the frontier is updated incrementally as they change.
+    """
+
+    ACCESSORY_SLOTS = ("slot_helmet", "slot_cape", "slot_gloves", "slot_boots", "slot_amulet")
+    OBJECTIVES = ("AC", "Melee", "Ranged")
+
+    # Accessory feature columns
+    AC_ALWAYS, AC_UNARMORED, W_DICE, W_FLAT, U_DICE, U_FLAT = range(6)
+
+    def __init__(self, equipment_categorizer, damage_calc, armor_calc, turn_engine):
+        """
+        Args:
+            equipment_categorizer: EquipmentCategorizer with the slot item lists
+            damage_calc: DamageCalculator (weapon attacks, equipment damage)
+            armor_calc: ArmorCalculator (armour, shield and item AC)
+            turn_engine: TurnEngine (attacks per turn, proficiency, hit chances)
+        """
+        self.categorizer = equipment_categorizer
+        self.damage_calc = damage_calc
+        self.armor_calc = armor_calc
+        self.turn_engine = turn_engine
+
+        categories = equipment_categorizer.get_all_categories()
+        self.slot_items = {
+            "slot_helmet": categories['helmets'],
+            "slot_cape": categories['capes'],
+            "slot_gloves": categories['gloves'],
+            "slot_boots": categories['boots'],
+            "slot_amulet": categories['amulets'],
+            "slot_armor": categories['armor_clothing'],
+            "slot_ring": categories['rings'],
+        }
+        self.melee_mains, self.melee_offhands, self.ranged_mains, self.ranged_offhands = [], [], [], []
+        self._set_weapon_lists()
+
+        # Memo caches are read with get() and filled with setdefault(), so evaluation threads can share them
+        self._item_features = {}  # {item name: accessory feature vector}
+        self._loadout_cache = {}  # {(kind, main, off, mods, turn stats, target AC): loadout features}
+        self._turn_cache = {}     # {(levels, subclasses): turn stats}
+        self._profile_cache = {}  # {(weapon, handedness, ability, proficiency, target AC, off hand): profile}
+        self.pool = None
+        self.skyline = None
+
+    def _set_weapon_lists(self):
+        """Weapon slot lists from the categorizer (updated in place)."""
+        categories = self.categorizer.get_all_categories()
+        self.melee_mains[:] = sorted(set(categories['melee_1h'] + categories['melee_2h']))
+        self.melee_offhands[:] = sorted(set(categories['shields'] + categories['melee_1h']))
+        self.ranged_mains[:] = sorted(set(categories['ranged_1h'] + categories['ranged_2h']))
+        self.ranged_offhands[:] = categories['ranged_1h']
+
+    def refresh_items(self, names):
+        """
+        Forget cached features of reloaded items and re-read the slot lists.
+        The categorizer must already be refreshed; the candidate pool is dropped.
+        """
+        names = set(names)
+        self._set_weapon_lists()
+        for name in names:
+            self._item_features.pop(name, None)
+        self._loadout_cache = {key: value for key, value in self._loadout_cache.items()
+                               if key[1] not in names and key[2] not in names}
+        self._profile_cache = {key: value for key, value in self._profile_cache.items() if key[0] not in names}
+        self.pool = None
+        self.skyline = None
+
+    def refresh_turns(self):
+        """Forget cached turn stats (and the loadouts using them) after class data changed."""
+        self._turn_cache.clear()
+        self._loadout_cache.clear()
+        self.pool = None
+        self.skyline = None
+
+    def caches(self):
+        """Memo caches by name (for size reporting; treat as read-only)."""
+        return {
+            'item_features': self._item_features,
+            'loadouts': self._loadout_cache,
+            'turn_stats': self._turn_cache,
+            'profiles': self._profile_cache,
+        }
+
+    # --- Item features ---
+
+    def get_item_features(self, item_name):
+        """
+        Additive features of one accessory or armour piece:
+        [AC, AC when unarmoured without shield, weapon dice avg, weapon flat,
+        unarmed dice avg, unarmed flat].
+        """
+        features = self._item_features.get(item_name)
+        if features is None:
+            features = np.zeros(6)
+            if item_name and item_name != "None":
+                always = self.armor_calc.get_item_ac_bonus(item_name, False, True)
+                features[self.AC_ALWAYS] = always
+                features[self.AC_UNARMORED] = self.armor_calc.get_item_ac_bonus(item_name, True, False) - always
+                for unarmed, dice_col, flat_col in ((False, self.W_DICE, self.W_FLAT),
+                                                    (True, self.U_DICE, self.U_FLAT)):
+                    _, components = self.damage_calc.get_equipment_damage_components([item_name], unarmed)
+                    features[dice_col] = sum(c["dice_count"] * (c["dice_sides"] + 1) / 2 for c in components)
+                    features[flat_col] = sum(c["flat"] for c in components)
+            features = self._item_features.setdefault(item_name, features)
+        return features
+
+    @staticmethod
+    def prune(features):
+        """Rows of a feature matrix that aren't dominated, one per distinct vector (first kept)."""
+        _, first = np.unique(features, axis=0, return_index=True)
+        first = np.sort(first)
+        return first[pareto_mask(features[first])]
+
+    def _slot_options(self, slot, locked, excluded):
+        """Candidate item names of a slot: the locked item, or "None" plus every allowed item."""
+        if locked.get(slot):
+            return [locked[slot]]
+        return ["None"] + [name for name in self.slot_items[slot] if name not in excluded]
+
+    def _build_bundles(self, locked, excluded):
+        """
+        Combine accessory slots into non-dominated bundles.
+        Returns: (features (bundles, 6), items (bundles, slots) as object array, slot tags)
+        """
+        slots = list(self.ACCESSORY_SLOTS)
+        features = np.zeros((1, 6))
+        items = np.empty((1, 0), dtype=object)
+
+        for slot in slots:
+            names = self._slot_options(slot, locked, excluded)
+            option_features = np.array([self.get_item_features(name) for name in names])
+            keep = self.prune(option_features)
+            features, items = self._add_options(features, items, option_features[keep],
+                                                np.array(names, dtype=object)[keep][:, np.newaxis])
+
+        # Rings: two distinct rings from one list
+        rings = self._slot_options("slot_ring", {}, excluded)
+        first_ring, second_ring = locked.get("slot_ring1"), locked.get("slot_ring2")
+        if first_ring and second_ring:
+            ring_pairs = [(first_ring, second_ring)]
+        elif first_ring or second_ring:
+            ring_pairs = [(first_ring or name, second_ring or name) for name in rings
+                          if name != (first_ring or second_ring)]
+        else:
+            ring_pairs = [(rings[i], rings[j]) for i in range(len(rings)) for j in range(i + 1, len(rings))]
+            ring_pairs.insert(0, ("None", "None"))
+        pair_features = np.array([
+            self.get_item_features(first) + self.get_item_features(second) for first, second in ring_pairs
+        ])
+        keep = self.prune(pair_features)
+        features, items = self._add_options(features, items, pair_features[keep],
+                                            np.array(ring_pairs, dtype=object)[keep])
+
+        return features, items, slots + ["slot_ring1", "slot_ring2"]
+
+    def _add_options(self, features, items, option_features, option_items):
+        """Minkowski-sum bundles with one slot's options and drop dominated bundles."""
+        combined = (features[:, np.newaxis, :] + option_features[np.newaxis, :, :]).reshape(-1, 6)
+        bundle_rows = np.repeat(np.arange(len(features)), len(option_features))
+        option_rows = np.tile(np.arange(len(option_features)), len(features))
+        keep = self.prune(combined)
+        items = np.concatenate([items[bundle_rows[keep]], option_items[option_rows[keep]]], axis=1)
+        return combined[keep], items
+
+    def _build_armors(self, dex_mod, locked, excluded):
+        """
+        Non-dominated body armour options.
+        Returns: (names, ac (without accessories or shield), unarmored flags, features (n, 6))
+        """
+        names = self._slot_options("slot_armor", locked, excluded)
+        ac = []
+        unarmored = []
+        for name in names:
+            base_ac, max_dex, is_unarmored = self.armor_calc.get_armor_base(name)
+            ac.append(base_ac + min(dex_mod, max_dex))
+            unarmored.append(is_unarmored)
+        features = np.array([self.get_item_features(name) for name in names])
+        ac, unarmored = np.array(ac, dtype=float), np.array(unarmored)
+
+        # An armour's own AC bonus never depends on Bracers-style conditions
+        ac = ac + features[:, self.AC_ALWAYS]
+        features = features.copy()
+        features[:, self.AC_ALWAYS] = 0
+        features[:, self.AC_UNARMORED] = 0
+
+        keep = self.prune(np.column_stack([ac, unarmored, features]))
+        return [names[i] for i in keep], ac[keep], unarmored[keep], features[keep]
+
+    # --- Weapon loadouts ---
+
+    def _attack_profile(self, attack, proficiency, target_ac):
+        """(expected damage, hit chance, crit chance) of one attack."""
+        if not attack:
+            return 0.0, 0.0, 0.0
+        engine = self.turn_engine
+        damage = float(engine.expected_attack_damage(attack, proficiency, target_ac))
+        unit = {"components": [{"dice_count": 0, "dice_sides": 0, "flat": 1}], "to_hit": attack["to_hit"]}
+        die = {"components": [{"dice_count": 1, "dice_sides": 1, "flat": 0}], "to_hit": attack["to_hit"]}
+        hit = float(engine.expected_attack_damage(unit, proficiency, target_ac))
+        crit = float(engine.expected_attack_damage(die, proficiency, target_ac)) - hit
+        return damage, hit, crit
+
+    def _weapon_profile(self, name, handedness, ability_mod, proficiency, target_ac, offhand=False):
+        """_attack_profile of a weapon attack, memoized."""
+        key = (name, handedness, ability_mod, proficiency, target_ac, offhand)
+        profile = self._profile_cache.get(key)
+        if profile is None:
+            profile = self._profile_cache.setdefault(key, self._attack_profile(
+                self._weapon_attack(name, handedness, ability_mod, offhand), proficiency, target_ac))
+        return profile
+
+    def _weapon_attack(self, name, handedness, ability_mod, offhand=False):
+        item = self.damage_calc.weap_map.get(name)
+        if not item:
+            return None
+        return self.damage_calc.build_weapon_attack(
+            item, handedness, ability_mod, [], name, add_ability_damage=not offhand
+        )
+
+    def _is_finesse(self, name):
+        return self.damage_calc.is_finesse(self.damage_calc.weap_map.get(name, {}))
+
+    def get_turn_stats(self, character_levels, character_subclasses=None):
+        """(proficiency, attacks per action, bonus unarmed strikes) at the build's final level, memoized."""
+        key = (tuple(sorted(character_levels.items())), tuple(sorted((character_subclasses or {}).items())))
+        if not character_levels:
+            return int(self.turn_engine.get_proficiency_bonus(1)), 1, 0
+        stats = self._turn_cache.get(key)
+        if stats is None:
+            engine = self.turn_engine
+            progression = engine.get_progression_arrays(
+                engine.levels_to_sequence(character_levels), character_subclasses
+            )
+            stats = self._turn_cache.setdefault(key, tuple(
+                int(progression[name][-1]) for name in ('proficiency', 'attacks_per_action', 'bonus_unarmed')
+            ))
+        return stats
+
+    def melee_offhand_allowed(self, main, offhand):
+        """Whether an off-hand item can be held with a melee main hand."""
+        if offhand == "None":
+            return True
+        return (main != "Unarmed" and offhand != main
+                and not self.categorizer.is_strictly_two_handed(main, is_ranged=False))
+
+    def ranged_offhand_allowed(self, main, offhand):
+        """Whether an off-hand weapon can be held with a ranged main hand."""
+        if offhand == "None":
+            return True
+        return (main != "None" and offhand != main
+                and not self.categorizer.is_strictly_two_handed(main, is_ranged=True))
+
+    def get_melee_features(self, main, offhand, ability_mods, turn_stats, target_ac):
+        """
+        Features of a melee loadout, memoized: shield AC, no-shield flag, own
+        damage per turn, weapon hit and crit chances per turn, unarmed hit and
+        crit chances per turn.
+        """
+        str_mod, dex_mod = ability_mods.get("Strength", 0), ability_mods.get("Dexterity", 0)
+        key = ('melee', main, offhand, str_mod, dex_mod, turn_stats, target_ac)
+        cached = self._loadout_cache.get(key)
+        if cached is not None:
+            return cached
+
+        proficiency, attacks, bonus_unarmed = turn_stats
+        if main == "Unarmed":
+            attack = {"components": [{"dice_count": 0, "dice_sides": 0, "flat": 1 + str_mod}],
+                      "to_hit": str_mod}
+            damage, hit, crit = self._attack_profile(attack, proficiency, target_ac)
+            turns = attacks + bonus_unarmed
+            features = (0, 1, turns * damage, 0, 0, turns * hit, turns * crit)
+        else:
+            ability = max(str_mod, dex_mod) if self._is_finesse(main) else str_mod
+            two_handed_only = self.categorizer.is_strictly_two_handed(main, is_ranged=False)
+            versatile = main in self.categorizer.melee_1h and main in self.categorizer.melee_2h
+            handedness = '2h' if two_handed_only or (versatile and offhand == "None") else '1h'
+            damage, hit, crit = self._weapon_profile(main, handedness, ability, proficiency, target_ac)
+
+            shield = self.armor_calc.get_shield_bonus(offhand)
+            off_damage = off_hit = off_crit = 0.0
+            if offhand != "None" and not shield:
+                off_ability = max(str_mod, dex_mod) if self._is_finesse(offhand) else str_mod
+                off_damage, off_hit, off_crit = self._weapon_profile(
+                    offhand, '1h', off_ability, proficiency, target_ac, offhand=True)
+
+            features = (shield, 0 if offhand in self.armor_calc.shields else 1,
+                        attacks * damage + off_damage,
+                        attacks * hit + off_hit, attacks * crit + off_crit, 0, 0)
+
+        return self._loadout_cache.setdefault(key, features)
+
+    def get_ranged_features(self, main, offhand, ability_mods, turn_stats, target_ac):
+        """Features of a ranged loadout, memoized: own damage per turn, hit and crit chances per turn."""
+        dex_mod = ability_mods.get("Dexterity", 0)
+        key = ('ranged', main, offhand, dex_mod, turn_stats, target_ac)
+        cached = self._loadout_cache.get(key)
+        if cached is not None:
+            return cached
+
+        proficiency, attacks, _ = turn_stats
+        item = self.damage_calc.weap_map.get(main)
+        features = (0.0, 0.0, 0.0)
+        if item:
+            handedness = '1h' if self.damage_calc.parse_weapon_damage(item, '2h')[0] == "0d0" else '2h'
+            damage, hit, crit = self._weapon_profile(main, handedness, dex_mod, proficiency, target_ac)
+            off_damage, off_hit, off_crit = self._weapon_profile(
+                offhand, '1h', dex_mod, proficiency, target_ac, offhand=True)
+            features = (attacks * damage + off_damage, attacks * hit + off_hit, attacks * crit + off_crit)
+
+        return self._loadout_cache.setdefault(key, features)
+
+    def _build_melee(self, mods, turn_stats, target_ac, locked, excluded):
+        """Non-dominated melee loadouts (main hand, off hand) and their features."""
+        mains = [locked["melee_main"]] if locked.get("melee_main") else (
+            ["Unarmed"] + [name for name in self.melee_mains if name not in excluded])
+        offhands = [locked["melee_off"]] if locked.get("melee_off") else (
+            ["None"] + [name for name in self.melee_offhands if name not in excluded])
+
+        loadouts = [(main, offhand) for main in mains for offhand in offhands
+                    if self.melee_offhand_allowed(main, offhand)]
+        features = np.array([
+            self.get_melee_features(main, offhand, mods, turn_stats, target_ac) for main, offhand in loadouts
+        ], dtype=float)
+        keep = self.prune(features)
+        return [loadouts[i] for i in keep], features[keep]
+
+    def _build_ranged(self, mods, turn_stats, target_ac, locked, excluded):
+        """Non-dominated ranged loadouts and their features."""
+        mains = [locked["ranged_main"]] if locked.get("ranged_main") else (
+            ["None"] + [name for name in self.ranged_mains if name not in excluded])
+        offhands = [locked["ranged_off"]] if locked.get("ranged_off") else (
+            ["None"] + [name for name in self.ranged_offhands if name not in excluded])
+
+        loadouts = [(main, offhand) for main in mains for offhand in offhands
+                    if self.ranged_offhand_allowed(main, offhand)]
+        features = np.array([
+            self.get_ranged_features(main, offhand, mods, turn_stats, target_ac) for main, offhand in loadouts
+        ], dtype=float)
+        keep = self.prune(features)
+        return [loadouts[i] for i in keep], features[keep]
+
+    # --- Single gear set ---
+
+    def evaluate(self, gear, turn_stats, ability_mods, target_ac=15):
+        """
+        Objectives of one complete gear set, from the same features as the frontier.
+
+        Args:
+            gear: Dict of slot tag -> item name (missing slots count as empty)
+            turn_stats: Tuple from get_turn_stats
+            ability_mods: Dict of ability name -> modifier
+
+        Returns:
+            Dict with AC, Melee and Ranged
+        """
+        state = self.get_gear_state(gear, turn_stats, ability_mods, target_ac)
+        values = self.objectives(*state, ability_mods.get("Dexterity", 0))
+        return {name: float(value) for name, value in zip(self.OBJECTIVES, values)}
+
+    def evaluate_batch(self, gears, turn_stats, ability_mods, target_acs):
+        """
+        Objectives of many gear sets with one vectorized objectives() call.
+
+        Args:
+            gears: List of gear dicts (see evaluate)
+            turn_stats: List of get_turn_stats tuples, one per gear set
+            ability_mods: List of ability modifier dicts
+            target_acs: List of target ACs
+
+        Returns:
+            List of dicts with AC, Melee and Ranged
+        """
+        if not gears:
+            return []
+        states = [self.get_gear_state(*args) for args in zip(gears, turn_stats, ability_mods, target_acs)]
+        features, armors, melee, ranged = zip(*states)
+        dex_mod = np.array([mods.get("Dexterity", 0) for mods in ability_mods])
+        values = self.objectives(np.array(features), tuple(np.array(column) for column in zip(*armors)),
+                                 np.array(melee), np.array(ranged), dex_mod)
+        return [dict(zip(self.OBJECTIVES, row)) for row in np.column_stack(values).tolist()]
+
+    def get_gear_state(self, gear, turn_stats, ability_mods, target_ac=15):
+        """
+        Decompose a gear set into the inputs of objectives().
+
+        Returns:
+            (features (6,), armour (base AC, max DEX, unarmoured), melee features (7,),
+            ranged features (3,)); features sum the armour and every accessory
+        """
+        armor_name = gear.get("slot_armor", "None")
+        features = self.get_item_features(armor_name).copy()
+        features[self.AC_UNARMORED] = 0
+        for slot in self.ACCESSORY_SLOTS + ("slot_ring1", "slot_ring2"):
+            features += self.get_item_features(gear.get(slot, "None"))
+
+        melee = self.get_melee_features(gear.get("melee_main", "Unarmed"), gear.get("melee_off", "None"),
+                                        ability_mods, turn_stats, target_ac)
+        ranged = self.get_ranged_features(gear.get("ranged_main", "None"), gear.get("ranged_off", "None"),
+                                          ability_mods, turn_stats, target_ac)
+        return features, self.armor_calc.get_armor_base(armor_name), np.array(melee), np.array(ranged)
+
+    def objectives(self, features, armor, melee, ranged, dex_mod):
+        """
+        (AC, Melee, Ranged) from gear features. Every argument may carry extra
+        leading axes (e.g. one row per candidate item) and broadcasts.
+
+        Args:
+            features: (..., 6) summed item features
+            armor: (base AC, max DEX bonus, unarmoured) scalars or arrays
+            melee: (..., 7) melee loadout features
+            ranged: (..., 3) ranged loadout features
+        """
+        features, melee, ranged = (np.asarray(x, dtype=float) for x in (features, melee, ranged))
+        base_ac, max_dex, is_unarmored = (np.asarray(x) for x in armor)
+        shield_ac, no_shield, own, hit_w, crit_w, hit_u, crit_u = np.moveaxis(melee, -1, 0)
+        ranged_own, ranged_hit, ranged_crit = np.moveaxis(ranged, -1, 0)
+
+        w_dice, u_dice = features[..., self.W_DICE], features[..., self.U_DICE]
+        w_hit, u_hit = w_dice + features[..., self.W_FLAT], u_dice + features[..., self.U_FLAT]
+        ac = (base_ac + np.minimum(dex_mod, max_dex) + shield_ac + features[..., self.AC_ALWAYS]
+              + np.where(is_unarmored & (no_shield > 0), features[..., self.AC_UNARMORED], 0))
+        melee_value = own + hit_w * w_hit + crit_w * w_dice + hit_u * u_hit + crit_u * u_dice
+        ranged_value = ranged_own + ranged_hit * w_hit + ranged_crit * w_dice
+        return np.broadcast_arrays(ac, melee_value, ranged_value)
+
+    # --- Frontier ---
+
+    def build(self, character_levels, character_subclasses, ability_mods, target_ac=15,
+              locked=None, excluded=()):
+        """
+        Build the candidate pool for a character and reset the frontier.
+
+        Args:
+            character_levels: Dict of class name -> level
+            character_subclasses: Dict of class name -> subclass name
+            ability_mods: Dict of ability name -> modifier
+            target_ac: Armor class of the target for expected damage
+            locked: Dict of slot tag (e.g. "slot_armor", "melee_off") -> item name to keep fixed
+            excluded: Item names never to suggest
+
+        Returns:
+            Number of candidate gear sets in the pool
+        """
+        locked = {slot: name for slot, name in (locked or {}).items() if name and name != "None"}
+        excluded = set(excluded)
+
+        turn_stats = self.get_turn_stats(character_levels, character_subclasses)
+
+        bundle_features, bundle_items, bundle_slots = self._build_bundles(locked, excluded)
+        armors, armor_ac, armor_unarmored, armor_features = self._build_armors(
+            ability_mods.get("Dexterity", 0), locked, excluded)
+        melee, melee_features = self._build_melee(ability_mods, turn_stats, target_ac, locked, excluded)
+        ranged, ranged_features = self._build_ranged(ability_mods, turn_stats, target_ac, locked, excluded)
+
+        # Accessories + armour: (bundles, armours, 6)
+        gear = bundle_features[:, np.newaxis, :] + armor_features[np.newaxis, :, :]
+        w_hit = gear[..., self.W_DICE] + gear[..., self.W_FLAT]
+        u_hit = gear[..., self.U_DICE] + gear[..., self.U_FLAT]
+
+        # Ranged doesn't interact with AC or melee: take the best loadout per gear set
+        ranged_values = (ranged_features[:, 0]
+                         + ranged_features[:, 1] * w_hit[..., np.newaxis]
+                         + ranged_features[:, 2] * gear[..., self.W_DICE, np.newaxis])
+        best_ranged = ranged_values.argmax(axis=2)
+        ranged_value = ranged_values.max(axis=2)
+
+        # (bundles, armours, melee loadouts)
+        shield_ac, no_shield, own, hit_w, crit_w, hit_u, crit_u = melee_features.T
+        ac = (armor_ac[np.newaxis, :, np.newaxis]
+              + bundle_features[:, self.AC_ALWAYS, np.newaxis, np.newaxis]
+              + shield_ac
+              + bundle_features[:, self.AC_UNARMORED, np.newaxis, np.newaxis]
+              * (armor_unarmored[np.newaxis, :, np.newaxis] & (no_shield > 0)))
+        melee_value = (own
+                       + hit_w * w_hit[..., np.newaxis] + crit_w * gear[..., self.W_DICE, np.newaxis]
+                       + hit_u * u_hit[..., np.newaxis] + crit_u * gear[..., self.U_DICE, np.newaxis])
+
+        shape = melee_value.shape
+        bundle_idx, armor_idx, melee_idx = (index.ravel() for index in np.indices(shape))
+        values = np.column_stack([
+            ac.ravel(), melee_value.ravel(), np.broadcast_to(ranged_value[..., np.newaxis], shape).ravel(),
+        ])
+
+        # Equal objective vectors collapse into the first (simplest) gear set
+        has_shield = (no_shield == 0)[melee_idx]
+        _, first = np.unique(np.column_stack([np.round(values, 6), has_shield]), axis=0, return_index=True)
+        first = np.sort(first)
+
+        self.pool = {
+            'values': values[first],
+            'bundle_items': bundle_items[bundle_idx[first]],
+            'bundle_slots': bundle_slots,
+            'armor': [armors[i] for i in armor_idx[first]],
+            'melee': [melee[i] for i in melee_idx[first]],
+            'ranged': [ranged[best_ranged[b, a]] for b, a in zip(bundle_idx[first], armor_idx[first])],
+            'has_shield': has_shield[first],
+        }
+        self.skyline = Skyline(self.pool['values'])
+        self.constraints = {}
+        self.set_constraints()
+        return len(first)
+
+    def set_constraints(self, min_ac=None, min_melee=None, min_ranged=None, shield=None):
+        """
+        Update constraints and the frontier incrementally.
+
+        Args:
+            min_ac, min_melee, min_ranged: Lower bounds on the objectives (None = no bound)
+            shield: True to require a shield, False to forbid one, None for either
+
+        Returns:
+            Number of gear sets on the frontier
+        """
+        self.constraints = {'min_ac': min_ac, 'min_melee': min_melee,
+                            'min_ranged': min_ranged, 'shield': shield}
+        values = self.pool['values']
+        mask = np.ones(len(values), dtype=bool)
+        for column, bound in enumerate((min_ac, min_melee, min_ranged)):
+            if bound is not None:
+                mask &= values[:, column] >= bound
+        if shield is not None:
+            mask &= self.pool['has_shield'] == shield
+        self.skyline.set_active(mask)
+        return len(self.skyline)
+
+    def frontier(self, limit=None):
+        """
+        Gear sets on the frontier, best AC first.
+
+        Returns:
+            List of dicts with gear (slot tag -> item name, "None" for free
+            slots) and objective values AC, Melee, Ranged
+        """
+        if self.skyline is None:
+            return []
+        rows = self.skyline.frontier()
+        values = self.pool['values']
+        rows = rows[np.lexsort(-values[rows].T[::-1])][:limit]
+        return [self.describe(row) for row in rows]
+
+    def describe(self, row):
+        """Turn one pool row into a gear dict with its objective values."""
+        pool = self.pool
+        gear = dict(zip(pool['bundle_slots'], pool['bundle_items'][row].tolist()))
+        gear["slot_armor"] = pool['armor'][row]
+        gear["melee_main"], gear["melee_off"] = pool['melee'][row]
+        gear["ranged_main"], gear["ranged_off"] = pool['ranged'][row]
+        return {
+            'gear': gear,
+            'objectives': dict(zip(self.OBJECTIVES, pool['values'][row].tolist())),
+        }
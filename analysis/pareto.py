@@ -0,0 +1,120 @@
+"""Pareto frontier (skyline) helpers for multi-objective build comparisons."""
+import numpy as np
+
+
+def pareto_mask(values):
+    """
+    Mark the non-dominated rows of an objective matrix (every column maximized).
+
+    A row is dominated when another row is at least as good in every column
+    and strictly better in one. Equal rows don't dominate each other.
+
+    Args:
+        values: Array (points, objectives)
+
+    Returns:
+        Bool array (points,), True for rows on the frontier
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim != 2 or not len(values):
+        return np.zeros(len(values), dtype=bool)
+
+    # Visit points best-first by column sum: a point can only be dominated
+    # by one with a larger sum, which is then already on the frontier
+    order = np.argsort(-values.sum(axis=1), kind='stable')
+    frontier = np.empty((0, values.shape[1]))
+    mask = np.zeros(len(values), dtype=bool)
+
+    for index in order:
+        point = values[index]
+        dominated = np.any(np.all(frontier >= point, axis=1) & np.any(frontier > point, axis=1))
+        if not dominated:
+            frontier = np.vstack([frontier, point])
+            mask[index] = True
+    return mask
+
+
+class Skyline:
+    """
+    Incrementally maintained Pareto frontier over a fixed pool of points.
+
+    Points are switched on and off as constraints change instead of
+    recomputing the frontier from scratch. Every active point off the
+    frontier keeps a witness: an active point that dominates it. Switching
+    points off only re-examines the points they were witnessing, and
+    switching points on only compares them against the current frontier.
+    """
+
+    def __init__(self, values):
+        """
+        Args:
+            values: Array (points, objectives), every objective maximized.
+                    All points start inactive.
+        """
+        self.values = np.asarray(values, dtype=float)
+        n = len(self.values)
+        self.active = np.zeros(n, dtype=bool)
+        self.on_frontier = np.zeros(n, dtype=bool)
+        self.witness = np.full(n, -1)
+
+    def __len__(self):
+        return int(self.on_frontier.sum())
+
+    def frontier(self):
+        """Row indices of the current frontier."""
+        return np.flatnonzero(self.on_frontier)
+
+    def set_active(self, mask):
+        """Switch to a new set of active points, updating only what changed."""
+        mask = np.asarray(mask, dtype=bool)
+        self.deactivate(np.flatnonzero(self.active & ~mask))
+        self.activate(np.flatnonzero(mask & ~self.active))
+
+    def activate(self, rows):
+        """Add points to the pool of frontier candidates."""
+        rows = np.asarray(rows, dtype=int)
+        rows = rows[~self.active[rows]]
+        if not len(rows):
+            return
+        self.active[rows] = True
+        self._merge(rows)
+
+    def deactivate(self, rows):
+        """Remove points; points they were witnessing are re-examined."""
+        rows = np.asarray(rows, dtype=int)
+        rows = rows[self.active[rows]]
+        if not len(rows):
+            return
+        removed = np.zeros(len(self.values), dtype=bool)
+        removed[rows] = True
+
+        self.active[rows] = False
+        self.on_frontier[rows] = False
+        self.witness[rows] = -1
+
+        orphans = np.flatnonzero(self.active & (self.witness >= 0) & removed[np.maximum(self.witness, 0)])
+        if len(orphans):
+            self.witness[orphans] = -1
+            self._merge(orphans)
+
+    def _merge(self, rows):
+        """Merge candidate rows into the frontier and give every loser a witness."""
+        combined = np.concatenate([self.frontier(), rows])
+        mask = pareto_mask(self.values[combined])
+        winners, losers = combined[mask], combined[~mask]
+
+        self.on_frontier[losers] = False
+        self.on_frontier[winners] = True
+        self.witness[winners] = -1
+        if len(losers):
+            self.witness[losers] = winners[self._dominator(self.values[losers], self.values[winners])]
+
+    @staticmethod
+    def _dominator(points, frontier, chunk=4096):
+        """Index into frontier of a point dominating each of points."""
+        found = np.empty(len(points), dtype=int)
+        for start in range(0, len(points), chunk):
+            block = points[start:start + chunk, np.newaxis, :]
+            dominates = np.all(frontier >= block, axis=2) & np.any(frontier > block, axis=2)
+            found[start:start + chunk] = dominates.argmax(axis=1)
+        return found
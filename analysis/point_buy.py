@@ -0,0 +1,190 @@
+"""Point-buy optimizer over every legal ability score allocation."""
+import numpy as np
+
+from utils import AbilityScoreCalculator
+from .pareto import pareto_mask
+
+
+class PointBuyOptimizer:
+    """
+    Enumerates every legal point-buy allocation and finds the Pareto-optimal ones.
+
+    Base scores 8-15 within TOTAL_POINTS are combined with every +2/+1 bonus
+    placement. Allocations are deduplicated by their resulting modifiers,
+    since every stat derived here depends on modifiers only; the cheapest
+    allocation is kept for each modifier vector. Base vectors that could still
+    raise a score within budget are dropped first: raising a score never
+    lowers a modifier, so they can't reach a modifier vector a full spend
+    doesn't reach or beat.
+
+    Objectives are evaluated on the whole (allocations, 6) modifier array at
+    once, so a query over the few thousand candidates is interactive.
+    """
+
+    ABILITIES = AbilityScoreCalculator.ABILITIES
+    MIN_SCORE = 8
+    MAX_SCORE = 15
+
+    def __init__(self, turn_engine=None):
+        """Enumerate allocations; a TurnEngine is needed for damage objectives."""
+        self.turn_engine = turn_engine
+        self.ability_index = {ability: i for i, ability in enumerate(self.ABILITIES)}
+        self._enumerate()
+
+    def _enumerate(self):
+        """Build the deduplicated allocation arrays."""
+        n = len(self.ABILITIES)
+        span = self.MAX_SCORE - self.MIN_SCORE + 1
+        costs = np.array(
+            [AbilityScoreCalculator.calculate_point_cost(self.MIN_SCORE + i) for i in range(span)]
+            + [AbilityScoreCalculator.TOTAL_POINTS + 1]  # one past MAX_SCORE is never affordable
+        )
+
+        offsets = np.indices((span,) * n).reshape(n, -1).T
+        spent = costs[offsets].sum(axis=1)
+        affordable = spent <= AbilityScoreCalculator.TOTAL_POINTS
+        offsets, spent = offsets[affordable], spent[affordable]
+
+        # Keep only base vectors where no score can be raised within budget
+        raise_cost = costs[offsets + 1] - costs[offsets]
+        left = AbilityScoreCalculator.TOTAL_POINTS - spent
+        maximal = ~(raise_cost <= left[:, np.newaxis]).any(axis=1)
+        base, spent = offsets[maximal] + self.MIN_SCORE, spent[maximal]
+
+        placements = [(i, j) for i in range(n) for j in range(n) if i != j]
+        bonuses = np.zeros((len(placements), n), dtype=np.int64)
+        for row, (plus_two, plus_one) in enumerate(placements):
+            bonuses[row, plus_two] = 2
+            bonuses[row, plus_one] = 1
+
+        scores = (base[:, np.newaxis, :] + bonuses[np.newaxis, :, :]).reshape(-1, n)
+        mods = (scores - 10) // 2
+        base_rows = np.repeat(np.arange(len(base)), len(placements))
+        placement_rows = np.tile(np.arange(len(placements)), len(base))
+
+        # Encode each modifier vector as one integer; cheapest allocation first
+        low = mods.min()
+        codes = ((mods - low) * (mods.max() - low + 1) ** np.arange(n)).sum(axis=1)
+        order = np.argsort(spent[base_rows], kind='stable')
+        _, first = np.unique(codes[order], return_index=True)
+        keep = order[first]
+
+        self.mods = mods[keep]
+        self.scores = scores[keep]
+        self.base_scores = base[base_rows[keep]]
+        self.points_used = spent[base_rows[keep]]
+        placements = np.array(placements)
+        self.plus_two = placements[placement_rows[keep], 0]
+        self.plus_one = placements[placement_rows[keep], 1]
+
+    def __len__(self):
+        return len(self.mods)
+
+    def mod(self, ability):
+        """Modifier column of an ability across all allocations."""
+        return self.mods[:, self.ability_index[ability]]
+
+    # --- Objectives ---
+
+    def ac_objective(self, armor_ac, dex_cap=None, unarmoured=None):
+        """
+        AC of every allocation.
+
+        Args:
+            armor_ac: AC without DEX (base + bonuses, e.g. calculate_ac(0, ...)['final_ac'])
+            dex_cap: Max DEX bonus of the armour (None for no cap)
+            unarmoured: Extra ability for Unarmoured Defence ("Constitution" or "Wisdom")
+        """
+        dex = self.mod("Dexterity")
+        if dex_cap is not None:
+            dex = np.minimum(dex, dex_cap)
+        ac = armor_ac + dex
+        if unarmoured:
+            ac = ac + self.mod(unarmoured)
+        return ac.astype(float)
+
+    def attack_mod(self, finesse=False, ranged=False):
+        """Attack ability modifier: DEX for ranged, better of STR/DEX for finesse, else STR."""
+        if ranged:
+            return self.mod("Dexterity")
+        if finesse:
+            return np.maximum(self.mod("Strength"), self.mod("Dexterity"))
+        return self.mod("Strength")
+
+    def damage_objective(self, character_levels, character_subclasses, attack, finesse=False,
+                         ranged=False, offhand_attack=None, offhand_finesse=False,
+                         target_ac=15, unarmed=False):
+        """
+        Expected damage per turn of every allocation at the build's final level.
+
+        attack and offhand_attack are {"components", "to_hit"} built without an
+        ability modifier (ability_mod=0); the allocation's modifier is added here.
+        """
+        if not attack:
+            return np.zeros(len(self))
+
+        engine = self.turn_engine
+        progression = engine.get_progression_arrays(
+            engine.levels_to_sequence(character_levels), character_subclasses
+        )
+        proficiency = progression['proficiency'][-1]
+        ability = self.attack_mod(finesse, ranged)
+
+        main = engine.expected_attack_damage(attack, proficiency + ability, target_ac,
+                                             damage_bonus=ability)
+        if offhand_attack:
+            off_ability = self.attack_mod(offhand_finesse, ranged)
+            bonus = engine.expected_attack_damage(offhand_attack, proficiency + off_ability, target_ac,
+                                                  damage_bonus=np.minimum(off_ability, 0))
+        elif unarmed:
+            bonus = main * progression['bonus_unarmed'][-1]
+        else:
+            bonus = 0.0
+        return progression['attacks_per_action'][-1] * main + bonus
+
+    # --- Optimization ---
+
+    def pareto(self, objectives, limit=None):
+        """
+        Pareto-optimal allocations for a set of objectives (all maximized).
+
+        Allocations tied on every objective are collapsed into the one with
+        the highest total modifier, so leftover points land somewhere useful.
+
+        Args:
+            objectives: Dict of name -> array over allocations (see *_objective),
+                        or name -> ability to maximize that modifier
+            limit: Maximum number of results (None for all)
+
+        Returns:
+            List of dicts with base_scores, plus_two, plus_one, scores,
+            modifiers, points_used and objective values, best first by the
+            first objective
+        """
+        names = list(objectives)
+        values = np.column_stack([
+            self.mod(objectives[name]) if isinstance(objectives[name], str) else objectives[name]
+            for name in names
+        ]).astype(float)
+
+        rows = np.flatnonzero(pareto_mask(values))
+        # Highest total modifier first within each tie, then keep one per objective vector
+        rows = rows[np.argsort(-self.mods[rows].sum(axis=1), kind='stable')]
+        _, first = np.unique(values[rows], axis=0, return_index=True)
+        rows = rows[np.sort(first)]
+        rows = rows[np.lexsort(-values[rows].T[::-1])][:limit]
+
+        return [self.describe(row, {name: float(values[row, i]) for i, name in enumerate(names)})
+                for row in rows]
+
+    def describe(self, row, objective_values=None):
+        """Turn one allocation row into a dict keyed by ability name."""
+        return {
+            'base_scores': dict(zip(self.ABILITIES, self.base_scores[row].tolist())),
+            'plus_two': self.ABILITIES[self.plus_two[row]],
+            'plus_one': self.ABILITIES[self.plus_one[row]],
+            'scores': dict(zip(self.ABILITIES, self.scores[row].tolist())),
+            'modifiers': dict(zip(self.ABILITIES, self.mods[row].tolist())),
+            'points_used': int(self.points_used[row]),
+            'objectives': objective_values or {},
+        }
@@ -0,0 +1,225 @@
+"""Dynamic-programming allocation of spell slots across an adventuring day."""
+import numpy as np
+
+
+class SlotAllocator:
+    """
+    Plans which spell slots to spend in which encounter and round.
+
+    Each round the character either spends one slot (a spell or a smite-style
+    rider at that slot level) or falls back to a baseline action such as a
+    cantrip or weapon attack. The DP runs over encounters with the remaining
+    slot vector as state, encoded as a mixed-radix integer so every transition
+    is an index subtraction. Within an encounter the best casts go to the
+    highest-weighted rounds, which is optimal for any fixed round weights.
+
+    Plans are memoized on their inputs, so batch runs over many multiclass
+    splits only solve each distinct slot vector once.
+    """
+
+    SPELL_LEVELS = 6
+
+    def __init__(self):
+        """Initialize an allocator with an empty plan cache."""
+        self._cache = {}  # {(slots, values, encounters, round weights, encounter weights): plan}
+
+    # --- Damage table ---
+
+    def build_cast_values(self, spell_damage, spell_names, weapon_damage=0.0, aoe_targets=1, smite_dice=0,
+                          smite_weapon_damage=None):
+        """
+        Best damage per cast at each slot level for a set of known spells.
+
+        Spell damage is the average of a cast that lands (no attack roll or
+        saving throw), so weapon damage should be given on the same footing:
+        the average of the action's attacks if they all hit.
+
+        Args:
+            spell_damage: SpellDamageModel
+            spell_names: Names of the spells the character knows (cantrips included)
+            weapon_damage: Average damage of a weapon action, also added to weapon riders
+            aoe_targets: Number of targets hit by area spells
+            smite_dice: d8s of a smite-style rider with a 1st-level slot (+1d8 per level above)
+            smite_weapon_damage: Weapon action the smite rides on (melee only; defaults to weapon_damage)
+
+        Returns:
+            Float array of length SPELL_LEVELS + 1; index 0 is the baseline
+            action without a slot, index L the best use of a level L slot
+        """
+        table = spell_damage.get_cast_table(weapon_damage, aoe_targets)
+        rows = [spell_damage.get_spell_index(name) for name in spell_names]
+        rows = [row for row in rows if row is not None]
+
+        values = np.full(self.SPELL_LEVELS + 1, -np.inf)
+        if rows:
+            values = np.maximum(values, table[rows, :self.SPELL_LEVELS + 1].max(axis=0))
+
+        # Smites ride on the weapon action: 2d8 at 1st level, +1d8 per level above
+        if smite_dice:
+            if smite_weapon_damage is None:
+                smite_weapon_damage = weapon_damage
+            levels = np.arange(1, self.SPELL_LEVELS + 1)
+            smite = smite_weapon_damage + (smite_dice + levels - 1) * 4.5
+            values[1:] = np.maximum(values[1:], smite)
+
+        values[0] = max(values[0], weapon_damage, 0.0)
+        return np.where(np.isfinite(values), values, values[0])
+
+    # --- Planning ---
+
+    @staticmethod
+    def _round_weights(rounds, objective, decay):
+        """Per-round weights: uniform for 'total', geometric decay for 'front_loaded'."""
+        if objective == 'total':
+            return np.ones(rounds)
+        if objective == 'front_loaded':
+            return decay ** np.arange(rounds)
+        raise ValueError(f"Unknown objective '{objective}' (expected 'total' or 'front_loaded')")
+
+    def _allocations(self, slots, rounds):
+        """
+        Enumerate DP states and per-encounter allocations as mixed-radix codes.
+        Returns: (alloc_digits, alloc_codes, state_digits, state_codes) where states
+        are every vector <= slots and allocations the states using at most `rounds` slots
+        """
+        radix = np.array(slots) + 1
+        strides = np.concatenate(([1], np.cumprod(radix[:-1])))
+        codes = np.arange(int(np.prod(radix)))
+        digits = (codes[:, np.newaxis] // strides) % radix
+        keep = digits.sum(axis=1) <= rounds
+        return digits[keep], codes[keep], digits, codes
+
+    def _allocation_values(self, digits, gains, round_weights):
+        """
+        Weighted gain of spending each allocation within one encounter.
+        The largest gains are paired with the largest round weights.
+        """
+        order = np.argsort(-gains, kind='stable')  # slot levels by gain, best first
+        counts = digits[:, order]
+        ends = np.cumsum(counts, axis=1)
+        weights = np.sort(round_weights)[::-1]
+
+        values = np.zeros(len(digits))
+        for k, weight in enumerate(weights):
+            # Level index of the k-th best cast in each allocation
+            position = (ends <= k).sum(axis=1)
+            has_cast = position < counts.shape[1]
+            values += np.where(has_cast, weight * gains[order[np.minimum(position, len(order) - 1)]], 0.0)
+        return values
+
+    def plan(self, spell_slots, cast_values, encounters=4, rounds=3, objective='total',
+             decay=0.75, encounter_weights=None):
+        """
+        Allocate spell slots across an adventuring day.
+
+        Args:
+            spell_slots: Dict of spell level -> count (as from get_all_spell_slots) or
+                         a sequence of counts for levels 1-6
+            cast_values: Damage per cast by slot level, index 0 = baseline action
+                         (see build_cast_values)
+            encounters: Number of encounters in the day
+            rounds: Rounds per encounter (one slot spent per round at most)
+            objective: 'total' for total damage, 'front_loaded' to favour early rounds
+            decay: Per-round weight decay for 'front_loaded'
+            encounter_weights: Optional weight per encounter (e.g. 2.0 for a boss)
+
+        Returns:
+            Dict with total_damage (unweighted), objective_value, slots_used per
+            level and schedule: one list per encounter of
+            {'round', 'slot_level', 'damage'} (slot_level 0 = baseline action)
+        """
+        if isinstance(spell_slots, dict):
+            slots = [int(spell_slots.get(level, 0)) for level in range(1, self.SPELL_LEVELS + 1)]
+        else:
+            slots = [int(count) for count in spell_slots][:self.SPELL_LEVELS]
+            slots += [0] * (self.SPELL_LEVELS - len(slots))
+
+        values = np.asarray(cast_values, dtype=float)
+        round_weights = self._round_weights(rounds, objective, decay)
+        if encounter_weights is None:
+            encounter_weights = np.ones(encounters)
+        encounter_weights = np.asarray(encounter_weights, dtype=float)[:encounters]
+
+        key = (tuple(slots), tuple(np.round(values, 6)), encounters,
+               tuple(round_weights), tuple(encounter_weights))
+        plan = self._cache.get(key)
+        if plan is None:
+            plan = self._cache.setdefault(key, self._solve(slots, values, encounters, rounds,
+                                                           round_weights, encounter_weights))
+        return plan
+
+    def _solve(self, slots, values, encounters, rounds, round_weights, encounter_weights):
+        """Run the DP and rebuild the schedule."""
+        baseline = values[0]
+        gains = np.maximum(values[1:self.SPELL_LEVELS + 1] - baseline, 0.0)
+
+        alloc_digits, alloc_codes, state_digits, state_codes = self._allocations(slots, rounds)
+        alloc_values = self._allocation_values(alloc_digits, gains, round_weights)
+
+        # valid[s, a]: allocation a fits in the remaining slots of state s
+        valid = np.all(state_digits[:, np.newaxis, :] >= alloc_digits[np.newaxis, :, :], axis=2)
+        next_state = np.where(valid, state_codes[:, np.newaxis] - alloc_codes[np.newaxis, :], 0)
+
+        future = np.zeros(len(state_codes))
+        choices = []
+        for weight in encounter_weights[::-1]:
+            q = np.where(valid, weight * alloc_values[np.newaxis, :] + future[next_state], -np.inf)
+            # Among equal plans, spend slots in the earlier encounter
+            choices.append((q + 1e-9 * alloc_values[np.newaxis, :]).argmax(axis=1))
+            future = q.max(axis=1)
+        choices.reverse()
+
+        # Walk forward from the full slot vector
+        state = state_codes[-1]
+        baseline_value = baseline * round_weights.sum() * encounter_weights.sum()
+        objective_value = float(future[state] + baseline_value)
+
+        order = np.argsort(-round_weights, kind='stable')  # rounds by weight, best first
+        level_order = np.argsort(-gains, kind='stable')
+        schedule = []
+        total_damage = 0.0
+        slots_used = {level: 0 for level in range(1, self.SPELL_LEVELS + 1)}
+
+        for encounter in range(len(encounter_weights)):
+            alloc = choices[encounter][state]
+            casts = [
+                int(level) + 1
+                for level in level_order
+                for _ in range(int(alloc_digits[alloc, level]))
+                if gains[level] > 0
+            ]
+            round_levels = [0] * rounds
+            for cast, round_index in zip(casts, order):
+                round_levels[round_index] = cast
+
+            rows = []
+            for round_index, slot_level in enumerate(round_levels):
+                damage = float(values[slot_level]) if slot_level else float(baseline)
+                total_damage += damage
+                if slot_level:
+                    slots_used[slot_level] += 1
+                rows.append({'round': round_index + 1, 'slot_level': slot_level, 'damage': damage})
+            schedule.append(rows)
+            state = state - alloc_codes[alloc]
+
+        return {
+            'total_damage': total_damage,
+            'objective_value': objective_value,
+            'slots_used': slots_used,
+            'schedule': schedule,
+        }
+
+    def plan_batch(self, slot_rows, cast_values, **options):
+        """
+        Plan many slot vectors at once (e.g. BuildEnumerator.enumerate_array()['slots']).
+        Each distinct slot vector is solved once.
+
+        Returns:
+            Float array of total expected damage per row
+        """
+        slot_rows = np.asarray(slot_rows)
+        unique, inverse = np.unique(slot_rows, axis=0, return_inverse=True)
+        totals = np.array([
+            self.plan(row.tolist(), cast_values, **options)['total_damage'] for row in unique
+        ])
+        return totals[inverse.reshape(-1)]
@@ -23,134 +23,231 @@ Data structure:
 import json
 import os
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 
+import startup_trace
+
 
 class ClassFeaturesLoader:
     """Loads and manages class features, subclasses, feats, and spells."""
     
-    def __init__(self, data_path: str = "data"):
-        """Initialize loader with path to data directory."""
+    def __init__(self, data_path: str = "data", workers: Optional[int] = None):
+        """
+        Initialize loader with path to data directory.
+        
+        Args:
+            data_path: Directory holding classes/, feats.json and spells.json
+            workers: Threads reading the class files (None: one per CPU core, 1: serial)
+        """
         self.data_path = Path(data_path)
+        self.workers = workers
         self.classes = {}  # Loaded class data
         self.subclasses = {}  # Loaded subclass data
         self.feats = []
         self.spells = []
+        self.spell_map = {}  # {lowercase spell name: spell}
         self.class_subclass_levels = {}  # {class_name: level_number}
         
         self._load_all_data()
     
+    @classmethod
+    def from_records(cls, classes: Dict, subclasses: Dict, feats: List, spells: List) -> "ClassFeaturesLoader":
+        """Build a loader from already-loaded records (e.g. a DataBundle) instead of data files."""
+        loader = cls.__new__(cls)
+        loader.data_path = None
+        loader.workers = None
+        loader.classes = classes
+        loader.subclasses = subclasses
+        loader.feats = feats
+        loader.spells = spells
+        loader.spell_map = {spell.get("name", "").lower(): spell for spell in spells}
+        loader.class_subclass_levels = {
+            name: data["subclassLevel"] for name, data in classes.items() if "subclassLevel" in data
+        }
+        return loader
+    
     def _load_all_data(self) -> None:
         """Load all class, subclass, feat, and spell data."""
-        self._load_classes()
-        self._load_subclasses()
+        self._load_class_files()
         self._load_feats()
         self._load_spells()
     
-    def _load_classes(self) -> None:
-        """Load all class JSON files from subdirectories."""
+    def _discover_class_files(self) -> List[Tuple[str, Path, bool]]:
+        """
+        Walk data/classes once.
+        
+        Each class has its own directory (e.g., barbarian/) holding the main
+        class file (barbarian.json) and its subclass files.
+        
+        Returns:
+            Sorted (class name, file path, is main class file) entries
+        """
         classes_dir = self.data_path / "classes"
         
         if not classes_dir.exists():
             print(f"[!] Classes directory not found at {classes_dir}")
-            return
+            return []
         
-        # Each class has its own directory (e.g., barbarian/, bard/)
-        # Inside each directory is the main class file (e.g., barbarian.json)
+        files = []
         for class_dir in sorted(classes_dir.iterdir()):
-            if not class_dir.is_dir() or class_dir.name == "subclasses":
+            if not class_dir.is_dir():
                 continue
             
-            # Look for the main class file (matches directory name)
+            # A shared classes/subclasses/ directory holds subclass files only
+            has_class_file = class_dir.name != "subclasses"
             class_file = class_dir / f"{class_dir.name}.json"
-            
-            if not class_file.exists():
+            if has_class_file and not class_file.exists():
                 print(f"[!] Class file not found: {class_file}")
-                continue
             
+            for json_file in sorted(class_dir.glob("*.json")):
+                if json_file.stem == class_dir.name:
+                    if has_class_file:
+                        files.append((class_dir.name, json_file, True))
+                else:
+                    files.append((class_dir.name, json_file, False))
+        return files
+    
+    def _read_class_files(self, paths: List[Path]) -> List[Tuple[Optional[Dict], Optional[Exception]]]:
+        """
+        Read and parse files concurrently (a thread pool; parallel across
+        cores on free-threaded builds).
+        
+        Returns:
+            (data, error) per path, in the order of paths
+        """
+        def read(path):
             try:
-                with open(class_file, 'r', encoding='utf-8') as f:
-                    class_data = json.load(f)
-                
-                class_name = class_dir.name  # Use directory name as class name
-                self.classes[class_name] = class_data
-                
-                # Track subclass selection level
-                if "subclassLevel" in class_data:
-                    self.class_subclass_levels[class_name] = class_data["subclassLevel"]
-                
-                print(f"[OK] Loaded class: {class_name}")
+                return startup_trace.load_json(path, f"{path.parent.name}/{path.name}"), None
             except Exception as e:
-                print(f"[!] Error loading {class_file}: {e}")
-    
-    def _load_subclasses(self) -> None:
-        """Load all subclass JSON files from class subdirectories."""
-        classes_dir = self.data_path / "classes"
+                return None, e
         
-        if not classes_dir.exists():
-            print(f"[!] Classes directory not found at {classes_dir}")
-            return
+        workers = min(self.workers or os.cpu_count() or 1, len(paths))
+        if workers <= 1:
+            return [read(path) for path in paths]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="class-files") as pool:
+            return list(pool.map(read, paths))
+    
+    def _load_class_files(self) -> None:
+        """Load every class and subclass file in one pass; merged in sorted file order."""
+        files = self._discover_class_files()
+        results = self._read_class_files([path for _, path, _ in files])
         
         subclass_count = 0
-        
-        # Load subclasses from each class directory
-        for class_dir in sorted(classes_dir.iterdir()):
-            if not class_dir.is_dir():
+        for (class_dir_name, path, is_class_file), (data, error) in zip(files, results):
+            if error is not None:
+                print(f"[!] Error loading {path}: {error}")
                 continue
             
-            # Load all JSON files in the class directory except the main class file
-            for subclass_file in class_dir.glob("*.json"):
-                # Skip the main class file (it has the same name as the directory)
-                if subclass_file.stem == class_dir.name:
-                    continue
+            if is_class_file:
+                # Use directory name as class name
+                self.classes[class_dir_name] = data
+                
+                # Track subclass selection level
+                if "subclassLevel" in data:
+                    self.class_subclass_levels[class_dir_name] = data["subclassLevel"]
+                
+                print(f"[OK] Loaded class: {class_dir_name}")
+            else:
+                # Strip class prefix from subclass filename if present
+                # e.g., "wizard_abjuration_school" -> "abjuration_school"
+                subclass_name = path.stem
+                class_prefix = f"{class_dir_name}_"
+                if subclass_name.startswith(class_prefix):
+                    subclass_name = subclass_name[len(class_prefix):]
                 
-                try:
-                    with open(subclass_file, 'r', encoding='utf-8') as f:
-                        subclass_data = json.load(f)
-                    
-                    # Strip class prefix from subclass filename if present
-                    # e.g., "wizard_abjuration_school" -> "abjuration_school"
-                    subclass_name = subclass_file.stem
-                    class_prefix = f"{class_dir.name}_"
-                    if subclass_name.startswith(class_prefix):
-                        subclass_name = subclass_name[len(class_prefix):]
-                    
-                    self.subclasses[subclass_name] = subclass_data
-                    subclass_count += 1
-                except Exception as e:
-                    print(f"[!] Error loading {subclass_file}: {e}")
+                self.subclasses[subclass_name] = data
+                subclass_count += 1
         
         print(f"[OK] Loaded {subclass_count} subclasses")
     
-    def _load_feats(self) -> None:
-        """Load feats.json."""
+    def _load_feats(self) -> bool:
+        """Load feats.json; the current feats are kept if it can't be read. Returns True on success."""
         feats_file = self.data_path / "feats.json"
         
         if not feats_file.exists():
             print(f"[!] Feats file not found at {feats_file}")
-            return
+            return False
         
         try:
-            with open(feats_file, 'r', encoding='utf-8') as f:
-                self.feats = json.load(f)
-            print(f"[OK] Loaded {len(self.feats)} feats")
+            feats = startup_trace.load_json(feats_file)
         except Exception as e:
             print(f"[!] Error loading feats: {e}")
+            return False
+        self.feats = feats
+        print(f"[OK] Loaded {len(self.feats)} feats")
+        return True
     
-    def _load_spells(self) -> None:
-        """Load spells.json."""
+    def _load_spells(self) -> bool:
+        """Load spells.json; the current spells are kept if it can't be read. Returns True on success."""
         spells_file = self.data_path / "spells.json"
         
         if not spells_file.exists():
             print(f"[!] Spells file not found at {spells_file}")
-            return
+            return False
         
         try:
-            with open(spells_file, 'r', encoding='utf-8') as f:
-                self.spells = json.load(f)
-            print(f"[OK] Loaded {len(self.spells)} spells")
+            spells = startup_trace.load_json(spells_file)
+            with startup_trace.span("index spell names", "index", records=len(spells)):
+                spell_map = {spell.get("name", "").lower(): spell for spell in spells}
         except Exception as e:
             print(f"[!] Error loading spells: {e}")
+            return False
+        self.spells, self.spell_map = spells, spell_map
+        print(f"[OK] Loaded {len(self.spells)} spells")
+        return True
+    
+    def reload_file(self, rel_path: str) -> Optional[Tuple[str, str]]:
+        """
+        Re-read one changed file (path relative to data_path); a removed file drops its entry.
+        
+        Returns:
+            (kind, key): ("feats", ""), ("spells", ""), ("classes", class name)
+            or ("subclasses", subclass name); None for a file this loader doesn't
+            use or one that failed to parse (the loaded data is kept)
+        """
+        parts = Path(rel_path).parts
+        removed = not (self.data_path / rel_path).exists()
+        if rel_path == "feats.json":
+            if removed:
+                self.feats = []
+            elif not self._load_feats():
+                return None
+            return "feats", ""
+        if rel_path == "spells.json":
+            if removed:
+                self.spells, self.spell_map = [], {}
+            elif not self._load_spells():
+                return None
+            return "spells", ""
+        if len(parts) != 3 or parts[0] != "classes" or not parts[2].endswith(".json"):
+            return None
+        
+        class_name, stem = parts[1], Path(parts[2]).stem
+        path = self.data_path / rel_path
+        data = None
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"[!] Error loading {path}: {e}")
+                return None
+        
+        if stem == class_name:
+            self.classes.pop(class_name, None)
+            self.class_subclass_levels.pop(class_name, None)
+            if data is not None:
+                self.classes[class_name] = data
+                if "subclassLevel" in data:
+                    self.class_subclass_levels[class_name] = data["subclassLevel"]
+            return "classes", class_name
+        
+        subclass_name = stem[len(class_name) + 1:] if stem.startswith(f"{class_name}_") else stem
+        self.subclasses.pop(subclass_name, None)
+        if data is not None:
+            self.subclasses[subclass_name] = data
+        return "subclasses", subclass_name
     
     def get_class_data(self, class_name: str) -> Optional[Dict]:
         """Get full data for a class."""
@@ -286,10 +383,7 @@ class ClassFeaturesLoader:
     
     def get_spell_by_name(self, spell_name: str) -> Optional[Dict]:
         """Get a specific spell by name."""
-        for spell in self.spells:
-            if spell.get("name", "").lower() == spell_name.lower():
-                return spell
-        return None
+        return self.spell_map.get(spell_name.lower())
     
     def get_available_classes(self) -> List[str]:
         """Get list of all available classes."""
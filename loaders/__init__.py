@@ -1,5 +1,17 @@
 """Data loaders package."""
 
 from .data_loader import DataLoader
+from .data_bundle import DataBundle
+from .catalogue_store import CatalogueStore
+from .data_packs import LayeredCatalogue, DataLayer
+from .data_watcher import DataWatcher, apply_changes
 
-__all__ = ['DataLoader']
+__all__ = [
+    'DataLoader',
+    'DataBundle',
+    'CatalogueStore',
+    'LayeredCatalogue',
+    'DataLayer',
+    'DataWatcher',
+    'apply_changes',
+]
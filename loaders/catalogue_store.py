@@ -0,0 +1,234 @@
+"""
+SQLite-backed catalogue store: equipment and weapons with indexed queries.
+
+The loader's list queries filter the whole catalogue on every call; here
+the items live in SQLite with indexes on kind/type, rarity, slot,
+handedness and damage type, and an FTS5 table over the effects text, so a
+query costs about the size of its result:
+
+    store = CatalogueStore("catalogue.db")
+    store.ingest(equipment_data, weapon_data)
+    store.query("weapon", handedness="2h", damage_type="Slashing")
+    store.search_effects("resistance slashing")
+
+A file database remembers the signature of the data it was built from
+(see DataLoader), so reopening an up-to-date catalogue skips the ingest.
+"""
+import json
+import re
+import sqlite3
+
+from models.damage_calculator import DamageCalculator
+
+
+# Gear slot of each equipment type (weapons use "melee" / "ranged")
+EQUIPMENT_SLOTS = {
+    'Helmet': 'helmet',
+    'Light Armour': 'armor',
+    'Medium Armour': 'armor',
+    'Heavy Armour': 'armor',
+    'Clothing': 'armor',
+    'Cloak': 'cape',
+    'Cape': 'cape',
+    'Gloves': 'gloves',
+    'Boots': 'boots',
+    'Amulet': 'amulet',
+    'Ring': 'ring',
+    'Shield': 'shield',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    rarity TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS item_handedness (item_id INTEGER NOT NULL, handedness TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS item_damage_types (item_id INTEGER NOT NULL, damage_type TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS items_type ON items (kind, type, name);
+CREATE INDEX IF NOT EXISTS items_rarity ON items (kind, rarity, name);
+CREATE INDEX IF NOT EXISTS items_slot ON items (kind, slot, name);
+CREATE INDEX IF NOT EXISTS items_name ON items (name);
+CREATE INDEX IF NOT EXISTS handedness_items ON item_handedness (handedness, item_id);
+CREATE INDEX IF NOT EXISTS damage_type_items ON item_damage_types (damage_type, item_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS item_effects USING fts5 (name, effects);
+"""
+
+
+class CatalogueStore:
+    """
+    Equipment and weapons in SQLite, queried through indexes.
+
+    Rows hold the indexed columns plus the original record as JSON; every
+    query returns names sorted like the DataLoader lists. Column values
+    match the JSON fields exactly (type "Longsword", rarity "Rare");
+    damage types are lowercase ("slashing"), handedness is "1h" or "2h".
+    """
+
+    KINDS = ("equipment", "weapon")
+    FILTERS = ("type", "rarity", "slot", "handedness", "damage_type")
+
+    def __init__(self, db_path=":memory:"):
+        """
+        Args:
+            db_path: SQLite database file, or ":memory:" for a private in-memory store
+        """
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self._damage_calc = DamageCalculator([], [])
+
+    # --- Ingest ---
+
+    def _weapon_attributes(self, item):
+        """(handedness set, damage type set, range slot) of a weapon."""
+        effects = " ".join(item.get('effects') or [])
+        handedness, damage_types = set(), set()
+        for hand in ("1h", "2h"):
+            segment = self._damage_calc.extract_handedness_segment(effects, hand)
+            if segment:
+                handedness.add(hand)
+            damage_types.update(name.lower() for name in re.findall(r"([A-Za-z]+)\(", segment))
+
+        weapon_type = item.get('type', '').lower()
+        if 'hand crossbow' in weapon_type:
+            handedness.add("1h")
+        elif 'bow' in weapon_type:
+            handedness.add("2h")
+        return handedness, damage_types, "ranged" if 'bow' in weapon_type else "melee"
+
+    def ingest(self, equipment_data, weapon_data, signature=None):
+        """
+        Replace the catalogue with the given records (one transaction).
+
+        Args:
+            equipment_data: Equipment records (as in data/equipment.json)
+            weapon_data: Weapon records (as in data/weapons.json)
+            signature: Optional string identifying the source data, see signature()
+        """
+        items, handedness_rows, damage_rows, effect_rows = [], [], [], []
+        item_id = 0
+        for kind, records in (("equipment", equipment_data), ("weapon", weapon_data)):
+            for item in records:
+                item_id += 1
+                effects = " ".join(item.get('effects') or [])
+                if kind == "weapon":
+                    handedness, damage_types, slot = self._weapon_attributes(item)
+                else:
+                    handedness, damage_types = set(), set()
+                    slot = EQUIPMENT_SLOTS.get(item.get('type', ''), '')
+                damage_types.update(c["type"].lower() for c in
+                                    self._damage_calc.parse_additional_damage_components(effects, ""))
+
+                items.append((item_id, kind, item['name'], item.get('type') or '', item.get('rarity') or '',
+                              slot, json.dumps(item)))
+                handedness_rows.extend((item_id, hand) for hand in sorted(handedness))
+                damage_rows.extend((item_id, damage_type) for damage_type in sorted(damage_types))
+                effect_rows.append((item_id, item['name'], effects))
+
+        with self.connection:
+            for table in ("items", "item_handedness", "item_damage_types", "item_effects"):
+                self.connection.execute(f"DELETE FROM {table}")
+            self.connection.executemany("INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?)", items)
+            self.connection.executemany("INSERT INTO item_handedness VALUES (?, ?)", handedness_rows)
+            self.connection.executemany("INSERT INTO item_damage_types VALUES (?, ?)", damage_rows)
+            self.connection.executemany("INSERT INTO item_effects (rowid, name, effects) VALUES (?, ?, ?)",
+                                        effect_rows)
+            self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('signature', ?)", (signature or '',))
+        self.connection.execute("ANALYZE")
+
+    def signature(self):
+        """Signature stored by the last ingest, or None for an empty store."""
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+        return row[0] if row else None
+
+    # --- Queries ---
+
+    def query(self, kind=None, **filters):
+        """
+        Sorted names of items matching every given filter.
+
+        Args:
+            kind: "equipment", "weapon" or None for both
+            **filters: Any of FILTERS; a value may be one string or a list of alternatives
+
+        Returns:
+            Sorted list of item names
+        """
+        unknown = set(filters) - set(self.FILTERS)
+        if unknown:
+            raise ValueError(f"unknown catalogue filter: {', '.join(sorted(unknown))}")
+        if kind is not None and kind not in self.KINDS:
+            raise ValueError(f"kind must be one of {', '.join(self.KINDS)}")
+
+        clauses, params = [], []
+
+        def match(column, value):
+            values = [value] if isinstance(value, str) else list(value)
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+
+        if kind is not None:
+            match("items.kind", kind)
+        for column in ("type", "rarity", "slot"):
+            if column in filters:
+                match(f"items.{column}", filters[column])
+        for column, table in (("handedness", "item_handedness"), ("damage_type", "item_damage_types")):
+            if column in filters:
+                values = filters[column]
+                values = [values.lower()] if isinstance(values, str) else [v.lower() for v in values]
+                clauses.append(f"items.id IN (SELECT item_id FROM {table} "
+                               f"WHERE {column} IN ({', '.join('?' * len(values))}))")
+                params.extend(values)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.connection.execute(f"SELECT items.name FROM items {where} ORDER BY items.name", params)
+        return [name for name, in rows]
+
+    def search_effects(self, text, kind=None, limit=20):
+        """
+        Full-text search over item names and effects (FTS5 query syntax).
+
+        Returns:
+            List of (name, kind) by relevance
+        """
+        sql = ("SELECT items.name, items.kind FROM item_effects JOIN items ON items.id = item_effects.rowid "
+               "WHERE item_effects MATCH ?")
+        params = [text]
+        if kind is not None:
+            sql += " AND items.kind = ?"
+            params.append(kind)
+        sql += " ORDER BY item_effects.rank LIMIT ?"
+        params.append(limit if limit else -1)
+        try:
+            return self.connection.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"invalid search: {e}") from None
+
+    def record(self, name, kind=None):
+        """Original record of an item by name (the last one ingested), or None."""
+        sql, params = "SELECT record FROM items WHERE name = ?", [name]
+        if kind is not None:
+            sql += " AND kind = ?"
+            params.append(kind)
+        row = self.connection.execute(sql + " ORDER BY id DESC LIMIT 1", params).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def records(self, kind):
+        """Every record of one kind, in ingest order."""
+        rows = self.connection.execute("SELECT record FROM items WHERE kind = ? ORDER BY id", (kind,))
+        return [json.loads(record) for record, in rows]
+
+    def database_size(self):
+        """Bytes of SQLite pages in the database (in memory for ":memory:")."""
+        page_count, = self.connection.execute("PRAGMA page_count").fetchone()
+        page_size, = self.connection.execute("PRAGMA page_size").fetchone()
+        return page_count * page_size
+
+    def close(self):
+        self.connection.close()
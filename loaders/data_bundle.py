@@ -0,0 +1,358 @@
+"""
+Consolidated read-only data bundle: the whole catalogue in one memory-mapped file.
+
+Build once after editing data/, then open it in every process:
+
+    python -m loaders.data_bundle data data.bundle
+
+Arrays are stored at aligned offsets and read with np.frombuffer over a
+read-only mmap, so every process sees the same page-cache copy and opening
+the bundle costs a header parse.
+"""
+import json
+import mmap
+import os
+import sys
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+from class_features_loader import ClassFeaturesLoader
+
+
+MAGIC = b"BG3BNDL1"
+ALIGNMENT = 64
+
+# Catalogue tables: (JSON file, extra string columns besides name/type)
+TABLES = {
+    "equipment": ("equipment.json", ("rarity",)),
+    "weapons": ("weapons.json", ("rarity",)),
+    "spells": ("spells.json", ("school",)),
+    "enemies": ("enemies.json", ()),
+    "feats": ("feats.json", ()),
+}
+
+# Handedness codes of the damage component table
+HANDEDNESS = ("extra", "1h", "2h")
+
+
+class _StringTable:
+    """Interning builder for the bundle's string table."""
+
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def add(self, text):
+        text = "" if text is None else str(text)
+        if text not in self.ids:
+            self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return self.ids[text]
+
+    def arrays(self):
+        encoded = [s.encode("utf-8") for s in self.strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def _data_start(header_size):
+    """Offset of the first array: magic, header size, header, padded to ALIGNMENT."""
+    return -(-(len(MAGIC) + 8 + header_size) // ALIGNMENT) * ALIGNMENT
+
+
+def _damage_components(damage_calc, item):
+    """(handedness code, type, dice count, dice sides, flat) rows parsed from an item's effects."""
+    rows = []
+    for code, handedness in ((1, "1h"), (2, "2h")):
+        for c in damage_calc.parse_weapon_base_components(item, handedness, ""):
+            rows.append((code, c["type"], c["dice_count"], c["dice_sides"], c["flat"]))
+    effects = " ".join(item.get("effects", []))
+    for c in damage_calc.parse_additional_damage_components(effects, ""):
+        rows.append((0, c["type"], c["dice_count"], c["dice_sides"], c["flat"]))
+    return rows
+
+
+class DataBundle:
+    """
+    Memory-mapped, columnar view of the whole catalogue.
+
+    Every table (equipment, weapons, spells, enemies, feats) has int32
+    columns of string ids (name, type, rarity or school), a string id of the
+    full record as compact JSON, an effects index into one shared effect
+    column, and a name order for binary-search lookups. Damage components
+    parsed from weapon and equipment effects are a separate columnar table.
+    Class, subclass and compiled FeatureTables data come along too, so a
+    worker can build its ClassFeaturesLoader and TurnEngine without touching
+    data/.
+
+    Records are decoded from the shared string table only when accessed.
+    """
+
+    def __init__(self, bundle_path):
+        """Map a bundle file built with DataBundle.build."""
+        self.path = bundle_path
+        with open(bundle_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{bundle_path} is not a data bundle")
+        header_size = int(np.frombuffer(self._mmap, dtype=np.uint64, count=1, offset=len(MAGIC))[0])
+        start = len(MAGIC) + 8
+        self.header = json.loads(self._mmap[start:start + header_size].decode("utf-8"))
+        self.meta = self.header["meta"]
+
+        data_start = _data_start(header_size)
+        self.arrays = {
+            name: np.frombuffer(self._mmap, dtype=dtype, count=int(np.prod(shape)),
+                                offset=data_start + offset).reshape(shape)
+            for name, (dtype, shape, offset) in self.header["arrays"].items()
+        }
+        self._offsets = self.arrays["strings.offsets"]
+        self._blob = self.arrays["strings.blob"]
+        self._records = {}
+
+    # --- Building ---
+
+    @classmethod
+    def build(cls, data_path="data", bundle_path="data.bundle"):
+        """
+        Pack data/ into one bundle file.
+
+        Returns:
+            Size of the bundle in bytes
+        """
+        # Local imports: building needs the parsers, reading doesn't
+        from models import DamageCalculator, FeatureTables
+
+        strings = _StringTable()
+        arrays = {}
+        documents = {}
+
+        for table, (file_name, extra_columns) in TABLES.items():
+            with open(os.path.join(data_path, file_name), "r", encoding="utf-8") as f:
+                records = json.load(f)
+            documents[table] = records
+
+            columns = {"name": [], "type": [], "record": [], "effects_start": [0]}
+            columns.update({column: [] for column in extra_columns})
+            effects = []
+            for record in records:
+                columns["name"].append(strings.add(record.get("name")))
+                columns["type"].append(strings.add(record.get("type")))
+                for column in extra_columns:
+                    columns[column].append(strings.add(record.get(column)))
+                columns["record"].append(strings.add(json.dumps(record, ensure_ascii=False, separators=(",", ":"))))
+                effects.extend(strings.add(line) for line in record.get("effects", []))
+                columns["effects_start"].append(len(effects))
+
+            for column, values in columns.items():
+                arrays[f"{table}.{column}"] = np.array(values, dtype=np.int32)
+            arrays[f"{table}.effects"] = np.array(effects, dtype=np.int32)
+            names = [record.get("name", "") for record in records]
+            arrays[f"{table}.name_order"] = np.array(sorted(range(len(names)), key=names.__getitem__),
+                                                     dtype=np.int32)
+
+        # Damage components parsed once from weapon and equipment effects
+        damage_calc = DamageCalculator(documents["equipment"], documents["weapons"])
+        for table in ("weapons", "equipment"):
+            rows = [(row, *component) for row, item in enumerate(documents[table])
+                    for component in _damage_components(damage_calc, item)]
+            arrays[f"{table}.components.row"] = np.array([r[0] for r in rows], dtype=np.int32)
+            arrays[f"{table}.components.handedness"] = np.array([r[1] for r in rows], dtype=np.int8)
+            arrays[f"{table}.components.type"] = np.array([strings.add(r[2]) for r in rows], dtype=np.int32)
+            arrays[f"{table}.components.dice"] = np.array([r[3:6] for r in rows], dtype=np.int32).reshape(-1, 3)
+
+        # Class data and compiled feature tables
+        features_loader = ClassFeaturesLoader(data_path)
+        feature_tables = FeatureTables(features_loader)
+        arrays["feature_tables.values"] = feature_tables.values
+        meta = {
+            "classes": strings.add(json.dumps(features_loader.classes, separators=(",", ":"))),
+            "subclasses": strings.add(json.dumps(features_loader.subclasses, separators=(",", ":"))),
+            "feature_keys": [list(key) for key in feature_tables.keys],
+            "feature_columns": feature_tables.column_names,
+            "tables": {table: len(documents[table]) for table in TABLES},
+        }
+        arrays["strings.offsets"], arrays["strings.blob"] = strings.arrays()
+
+        # Header, then the arrays at aligned offsets relative to the end of the header
+        layout, offset = {}, 0
+        for name, array in arrays.items():
+            layout[name] = [array.dtype.str, list(array.shape), offset]
+            offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+        encoded = json.dumps({"arrays": layout, "meta": meta}).encode("utf-8")
+        data_start = _data_start(len(encoded))
+
+        tmp_path = f"{bundle_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(np.uint64(len(encoded)).tobytes())
+            f.write(encoded)
+            for name, array in arrays.items():
+                f.seek(data_start + layout[name][2])
+                f.write(np.ascontiguousarray(array).tobytes())
+        os.replace(tmp_path, bundle_path)
+        return os.path.getsize(bundle_path)
+
+    # --- Strings ---
+
+    def string(self, string_id):
+        """Decode one entry of the string table."""
+        start, end = self._offsets[string_id], self._offsets[string_id + 1]
+        return self._blob[start:end].tobytes().decode("utf-8")
+
+    def strings(self, string_ids):
+        """Decode many string ids."""
+        return [self.string(i) for i in string_ids]
+
+    # --- Tables ---
+
+    def __len__(self):
+        return len(self.arrays["strings.offsets"]) - 1
+
+    def table_size(self, table):
+        return self.meta["tables"][table]
+
+    def column(self, table, column):
+        """Zero-copy array of a table column (string ids for name/type/rarity/school)."""
+        return self.arrays[f"{table}.{column}"]
+
+    def find(self, table, name):
+        """
+        Row of a record by exact name (binary search on the name order), or -1.
+        Duplicate names resolve to the last row, like the DataLoader name maps.
+        """
+        order = self.column(table, "name_order")
+        names = self.column(table, "name")
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            if self.string(names[order[middle]]) <= name:
+                low = middle + 1
+            else:
+                high = middle
+        if low > 0 and self.string(names[order[low - 1]]) == name:
+            return int(order[low - 1])
+        return -1
+
+    def record(self, table, row):
+        """Decoded record dict (cached per process, shared by its threads)."""
+        key = (table, row)
+        record = self._records.get(key)
+        if record is None:
+            record = self._records.setdefault(key, json.loads(self.string(self.column(table, "record")[row])))
+        return record
+
+    def records(self, table):
+        """Lazily decoded sequence of a table's records."""
+        return BundleRecords(self, table)
+
+    def effects(self, table, row):
+        """Effect lines of one record."""
+        start, end = self.column(table, "effects_start")[row:row + 2]
+        return self.strings(self.column(table, "effects")[start:end])
+
+    def damage_components(self, table, row, handedness=None):
+        """
+        Damage components parsed from a weapon's or item's effects at build time.
+
+        Args:
+            handedness: "1h"/"2h" for weapon base damage, "extra" for riders, None for all
+
+        Returns:
+            List of {type, dice_count, dice_sides, flat, handedness}
+        """
+        rows = self.column(table, "components.row")
+        lo, hi = np.searchsorted(rows, row, "left"), np.searchsorted(rows, row, "right")
+        codes = self.column(table, "components.handedness")[lo:hi]
+        types = self.column(table, "components.type")[lo:hi]
+        dice = self.column(table, "components.dice")[lo:hi]
+        return [
+            {"type": self.string(t), "dice_count": int(d[0]), "dice_sides": int(d[1]), "flat": int(d[2]),
+             "handedness": HANDEDNESS[code]}
+            for code, t, d in zip(codes, types, dice)
+            if handedness is None or HANDEDNESS[code] == handedness
+        ]
+
+    def rows_of_type(self, table, type_names):
+        """Rows whose type is one of type_names, from one vectorized comparison."""
+        wanted = set(type_names)
+        type_ids = np.unique(self.column(table, "type"))
+        ids = [i for i in type_ids if self.string(i) in wanted]
+        return np.flatnonzero(np.isin(self.column(table, "type"), ids))
+
+    # --- Class data ---
+
+    def features_loader(self):
+        """A ClassFeaturesLoader filled from the bundle instead of data/."""
+        return ClassFeaturesLoader.from_records(
+            json.loads(self.string(self.meta["classes"])),
+            json.loads(self.string(self.meta["subclasses"])),
+            self.records("feats"),
+            self.records("spells"),
+        )
+
+    def feature_tables(self, features_loader):
+        """FeatureTables over the precompiled (zero-copy) values."""
+        from models import FeatureTables
+        keys = [tuple(key) for key in self.meta["feature_keys"]]
+        return FeatureTables(features_loader, compiled=(keys, self.arrays["feature_tables.values"]))
+
+    def mapped_bytes(self):
+        """Size of the memory-mapped file (shared between processes, paged in on access)."""
+        return len(self._mmap)
+
+    def close(self):
+        self.arrays = {}
+        self._mmap.close()
+
+
+class BundleRecords(Sequence):
+    """Read-only list of a bundle table's records, decoded on access."""
+
+    def __init__(self, bundle, table):
+        self.bundle = bundle
+        self.table = table
+
+    def __len__(self):
+        return self.bundle.table_size(self.table)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.bundle.record(self.table, index)
+
+
+class BundleMap(Mapping):
+    """Read-only {name: record} view of a bundle table using its name index."""
+
+    def __init__(self, bundle, table):
+        self.bundle = bundle
+        self.table = table
+
+    def __getitem__(self, name):
+        row = self.bundle.find(self.table, name) if isinstance(name, str) else -1
+        if row < 0:
+            raise KeyError(name)
+        return self.bundle.record(self.table, row)
+
+    def __iter__(self):
+        # String ids are interned, so unique ids are unique names
+        return (self.bundle.string(i) for i in dict.fromkeys(self.bundle.column(self.table, "name").tolist()))
+
+    def __len__(self):
+        return len(np.unique(self.bundle.column(self.table, "name")))
+
+
+if __name__ == "__main__":
+    data_path = sys.argv[1] if len(sys.argv) > 1 else "data"
+    bundle_path = sys.argv[2] if len(sys.argv) > 2 else "data.bundle"
+    print(f"[*] Packing {data_path} into {bundle_path}...")
+    size = DataBundle.build(data_path, bundle_path)
+    print(f"[OK] Wrote {size / 1024:.0f} KiB")
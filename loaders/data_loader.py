@@ -2,43 +2,139 @@
 
 import json
 import os
+import startup_trace
 from class_features_loader import ClassFeaturesLoader
 
 
+# {table: (file name, data attribute, map attribute)} of the item/enemy tables
+TABLES = {
+    'equipment': ('equipment.json', 'equipment_data', 'equipment_map'),
+    'weapons': ('weapons.json', 'weapon_data', 'weapon_map'),
+    'enemies': ('enemies.json', 'enemy_data', 'enemy_map'),
+}
+
+
 class DataLoader:
     """Centralized data loader for all game data."""
     
-    def __init__(self, data_path="data", resources_path="resources"):
+    def __init__(self, data_path="data", resources_path="resources", catalogue_db=None, deferred=False):
+        """
+        Args:
+            data_path: Directory of the game data JSON files
+            resources_path: Directory of the resource files (spell slots)
+            catalogue_db: Optional SQLite file (or ":memory:") backing the
+                equipment/weapon queries with a CatalogueStore
+            deferred: Start empty and let the caller run load_stages() (e.g. in a background thread)
+        """
         self.data_path = data_path
         self.resources_path = resources_path
+        self.catalogue_db = catalogue_db
+        self.layers = None
+        self._init_empty()
         
-        # Load all data
-        self.equipment_data = self._load_equipment()
-        self.weapon_data = self._load_weapons()
+        if not deferred:
+            for _, stage in self.load_stages():
+                stage()
+    
+    def _init_empty(self):
+        """Empty data lists and maps; the load stages fill them in place."""
+        self.catalogue = None
+        self.equipment_data, self.weapon_data, self.enemy_data = [], [], []
+        self.equipment_map, self.weapon_map, self.enemy_map = {}, {}, {}
+        self.spell_slot_data = {}
+        self.features_loader = None
+    
+    def load_stages(self):
+        """
+        Loading steps in order, as (name, callable) pairs.
+        Each callable fills its part of the loader and returns the
+        reload_files-style changes it made (empty for non-table data).
+        """
+        return [
+            ("Equipment and weapons", self.load_items),
+            ("Enemies", self.load_enemies),
+            ("Spell slots", self.load_spell_slots),
+            ("Class features", self.load_class_features),
+        ]
+    
+    def _read_table(self, table):
+        """Records of a table from the layers or its JSON file."""
+        if self.layers is not None:
+            return self.layers.records(table)
+        return startup_trace.load_json(os.path.join(self.data_path, TABLES[table][0]))
+    
+    def load_items(self):
+        """Load equipment and weapons (and open the catalogue store, if configured)."""
+        changes = {table: self._replace_table(table, self._read_table(table)) for table in ('equipment', 'weapons')}
+        if self.catalogue_db:
+            self.catalogue = self._open_catalogue(self.catalogue_db)
+        return changes
+    
+    def load_enemies(self):
+        """Load enemy profiles (AC, resistances, immunities, vulnerabilities)."""
+        return {'enemies': self._replace_table('enemies', self._read_table('enemies'))}
+    
+    def load_spell_slots(self):
+        """Load spell slot progression data."""
         self.spell_slot_data = self._load_spell_slots()
-        self.features_loader = self._load_class_features()
+        return {}
+    
+    def load_class_features(self):
+        """Load classes, subclasses, feats and spells."""
+        if self.layers is not None:
+            self.features_loader = self.layers.features_loader()
+        else:
+            self.features_loader = self._load_class_features()
+        return {}
+    
+    @classmethod
+    def from_bundle(cls, bundle, resources_path="resources"):
+        """
+        Create a loader backed by a DataBundle (memory-mapped, shared between processes).
+        Records are decoded on access; name maps use the bundle's name index.
+        """
+        from .data_bundle import BundleMap
+        
+        loader = cls.__new__(cls)
+        loader.data_path = None
+        loader.resources_path = resources_path
+        loader.bundle = bundle
+        loader.catalogue_db = None
+        loader.layers = None
+        loader.catalogue = None
         
-        # Create lookup maps
-        self.equipment_map = {item['name']: item for item in self.equipment_data}
-        self.weapon_map = {item['name']: item for item in self.weapon_data}
+        loader.equipment_data = bundle.records("equipment")
+        loader.weapon_data = bundle.records("weapons")
+        loader.enemy_data = bundle.records("enemies")
+        loader.spell_slot_data = loader._load_spell_slots()
+        loader.features_loader = bundle.features_loader()
         
-    def _load_equipment(self):
-        """Load equipment data from JSON."""
-        equip_path = os.path.join(self.data_path, 'equipment.json')
-        with open(equip_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    
-    def _load_weapons(self):
-        """Load weapon data from JSON."""
-        weapon_path = os.path.join(self.data_path, 'weapons.json')
-        with open(weapon_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        loader.equipment_map = BundleMap(bundle, "equipment")
+        loader.weapon_map = BundleMap(bundle, "weapons")
+        loader.enemy_map = BundleMap(bundle, "enemies")
+        return loader
+    
+    @classmethod
+    def from_layers(cls, catalogue, resources_path="resources", deferred=False):
+        """
+        Create a loader over a LayeredCatalogue (base data/ plus overlay packs).
+        Data lists hold the merged records (shared with the layers, not copied).
+        """
+        loader = cls.__new__(cls)
+        loader.data_path = None
+        loader.resources_path = resources_path
+        loader.catalogue_db = None
+        loader.layers = catalogue
+        loader._init_empty()
+        
+        if not deferred:
+            for _, stage in loader.load_stages():
+                stage()
+        return loader
     
     def _load_spell_slots(self):
         """Load spell slot progression data."""
-        spell_slot_path = os.path.join(self.resources_path, 'spell_slots.json')
-        with open(spell_slot_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return startup_trace.load_json(os.path.join(self.resources_path, 'spell_slots.json'))
     
     def _load_class_features(self):
         """Load class features using ClassFeaturesLoader."""
@@ -47,8 +143,99 @@ class DataLoader:
         print("[OK] Features loader initialized\n")
         return loader
     
+    def _data_signature(self):
+        """Modification times and sizes of the catalogue's source files."""
+        parts = []
+        for file_name in ('equipment.json', 'weapons.json'):
+            stat = os.stat(os.path.join(self.data_path, file_name))
+            parts.append(f"{file_name}:{stat.st_mtime_ns}:{stat.st_size}")
+        return ";".join(parts)
+    
+    def _open_catalogue(self, db_path):
+        """Open a CatalogueStore, ingesting the data unless the file is already up to date."""
+        from .catalogue_store import CatalogueStore
+        
+        store = CatalogueStore(db_path)
+        signature = self._data_signature() if self.data_path else None
+        if signature is None or store.signature() != signature:
+            with startup_trace.span("ingest catalogue store", "index"):
+                store.ingest(self.equipment_data, self.weapon_data, signature)
+        return store
+    
+    def _replace_table(self, table, records):
+        """Swap in a table's new records (lists updated in place); returns its name changes."""
+        _, data_attr, map_attr = TABLES[table]
+        old_map = getattr(self, map_attr)
+        with startup_trace.span(f"index {table} names", "index", records=len(records)):
+            new_map = {record['name']: record for record in records}
+        change = {
+            'added': new_map.keys() - old_map.keys(),
+            'removed': old_map.keys() - new_map.keys(),
+            'changed': {name for name in new_map.keys() & old_map.keys() if new_map[name] != old_map[name]},
+        }
+        getattr(self, data_attr)[:] = records
+        for name in change['removed']:
+            del old_map[name]
+        old_map.update(new_map)
+        return change
+    
+    def reload_files(self, paths):
+        """
+        Re-parse only the given changed files and update the loaded data in place.
+        
+        Args:
+            paths: Changed file paths (e.g. from DataWatcher.poll)
+        
+        Returns:
+            {table: {"added", "removed", "changed"} name sets} for equipment,
+            weapons and enemies, plus {"classes"/"subclasses": names,
+            "feats"/"spells": {""}} for the class feature files
+        """
+        changes = {}
+        if self.layers is not None:
+            changed = self.layers.refresh()
+            for table in TABLES:
+                if table in changed:
+                    changes[table] = self._replace_table(table, self.layers.records(table))
+            if changed & {"classes", "feats", "spells"}:
+                # Merged class data is re-resolved as a whole; report every class as changed
+                merged = self.layers.features_loader()
+                features = self.features_loader
+                for attr in ("classes", "subclasses", "feats", "spells", "spell_map", "class_subclass_levels"):
+                    setattr(features, attr, getattr(merged, attr))
+                changes.update({"classes": set(features.classes), "subclasses": set(features.subclasses)})
+                changes.update({kind: {""} for kind in ("feats", "spells") if kind in changed})
+        elif self.data_path is not None:
+            self._reload_data_files(paths, changes)
+        
+        if self.catalogue is not None and changes.keys() & {'equipment', 'weapons'}:
+            signature = self._data_signature() if self.data_path else None
+            self.catalogue.ingest(self.equipment_data, self.weapon_data, signature)
+        return changes
+    
+    def _reload_data_files(self, paths, changes):
+        """Re-parse changed files of data_path into changes (see reload_files)."""
+        table_files = {file_name: table for table, (file_name, _, _) in TABLES.items()}
+        for path in paths:
+            rel_path = os.path.relpath(path, self.data_path).replace(os.sep, "/")
+            if rel_path in table_files:
+                table = table_files[rel_path]
+                try:
+                    with open(os.path.join(self.data_path, rel_path), 'r', encoding='utf-8') as f:
+                        records = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"[!] Not reloading {rel_path}: {e}")
+                    continue
+                changes[table] = self._replace_table(table, records)
+            else:
+                reloaded = self.features_loader.reload_file(rel_path)
+                if reloaded:
+                    changes.setdefault(reloaded[0], set()).add(reloaded[1])
+    
     def get_equipment_by_type(self, equipment_type):
         """Get all equipment of a specific type."""
+        if self.catalogue is not None:
+            return self.catalogue.query("equipment", type=equipment_type)
         return sorted([
             item['name'] for item in self.equipment_data 
             if item['type'] == equipment_type
@@ -56,13 +243,23 @@ class DataLoader:
     
     def get_equipment_by_types(self, equipment_types):
         """Get all equipment matching any of the specified types."""
+        if self.catalogue is not None:
+            return self.catalogue.query("equipment", type=list(equipment_types))
         return sorted([
             item['name'] for item in self.equipment_data 
             if item['type'] in equipment_types
         ])
     
     def get_weapons_by_category(self, category_filter):
-        """Get weapons matching a filter function."""
+        """
+        Get weapons matching a filter function, or a dict of CatalogueStore
+        filters (type, rarity, slot, handedness, damage_type) answered from
+        the catalogue indexes, e.g. {"slot": "melee", "handedness": "2h"}.
+        """
+        if isinstance(category_filter, dict):
+            if self.catalogue is None:
+                self.catalogue = self._open_catalogue(":memory:")
+            return self.catalogue.query("weapon", **category_filter)
         return sorted([
             item['name'] for item in self.weapon_data 
             if category_filter(item)
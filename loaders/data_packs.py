@@ -0,0 +1,313 @@
+"""
+Layered data packs: the shipped data/ plus ordered overlay packs.
+
+A pack is a directory shaped like data/ holding only what it changes:
+
+    my_pack/
+        pack.json                       {"name": "My Pack"}        (optional)
+        weapons.json                    [entries...]
+        equipment.json, enemies.json, feats.json, spells.json
+        classes/fighter/fighter.json    whole file, or {"$patch": {...}}
+
+Entries of the list files are resolved by name against the layers below:
+
+    {"name": "Foo", ...}                        add, or override "Foo" entirely
+    {"name": "Foo", "$patch": {"rarity": "Rare", "armor_class": null}}
+                                                merge fields (dicts merge recursively, null deletes)
+    {"name": "Foo", "$append": {"effects": ["..."]}}
+                                                extend list fields
+    {"name": "Foo", "$remove": true}            drop the entry
+
+Merged records are copy-on-write: untouched entries are the base objects
+themselves, patched ones are shallow merges built on first access. Each
+layer parses its files once and caches a per-table name index, so
+enabling or disabling a pack only rebuilds the merged tables that pack
+touches.
+"""
+import json
+import os
+from collections.abc import Mapping
+
+import startup_trace
+from class_features_loader import ClassFeaturesLoader
+
+
+TABLE_FILES = {
+    "equipment": "equipment.json",
+    "weapons": "weapons.json",
+    "enemies": "enemies.json",
+    "feats": "feats.json",
+    "spells": "spells.json",
+}
+
+OPERATIONS = ("$patch", "$append", "$remove")
+
+
+def merge_patch(base, patch):
+    """New dict of base with patch applied (dicts merge recursively, None deletes); base is untouched."""
+    merged = dict(base)
+    for key, value in patch.items():
+        if value is None:
+            merged.pop(key, None)
+        elif isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_patch(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def apply_entry(record, entry):
+    """Resolve one layer entry over the record below it (None if absent); returns the new record or None."""
+    if entry.get("$remove"):
+        return None
+    if not any(op in entry for op in OPERATIONS):
+        return entry
+    if record is None:
+        return None
+    if "$patch" in entry:
+        record = merge_patch(record, entry["$patch"])
+    if "$append" in entry:
+        record = dict(record)
+        for key, values in entry["$append"].items():
+            record[key] = list(record.get(key) or []) + list(values)
+    return record
+
+
+class DataLayer:
+    """
+    One layer (the base data/ or a pack): parsed files and per-table name indexes.
+
+    Files are read on first use and re-read only when their modification
+    time or size changes.
+    """
+
+    def __init__(self, path, name=None):
+        self.path = path
+        self.name = name or self._read_name()
+        self._tables = {}  # {table: (file signature, entries, {name: entry})}
+        self._class_files = None  # (signature, {relative path: document})
+
+    def _read_name(self):
+        manifest = os.path.join(self.path, "pack.json")
+        if os.path.exists(manifest):
+            with open(manifest, "r", encoding="utf-8") as f:
+                return json.load(f).get("name") or os.path.basename(os.path.normpath(self.path))
+        return os.path.basename(os.path.normpath(self.path))
+
+    @staticmethod
+    def _signature(path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def has_table(self, table):
+        return os.path.exists(os.path.join(self.path, TABLE_FILES[table]))
+
+    def table(self, table):
+        """(entries in file order, {name: last entry}) of one table; empty if the layer lacks it."""
+        file_path = os.path.join(self.path, TABLE_FILES[table])
+        signature = self._signature(file_path)
+        cached = self._tables.get(table)
+        if cached is None or cached[0] != signature:
+            entries = []
+            if signature is not None:
+                entries = startup_trace.load_json(file_path, f"{self.name}/{TABLE_FILES[table]}")
+            cached = (signature, entries, {entry["name"]: entry for entry in entries})
+            self._tables[table] = cached
+        return cached[1], cached[2]
+
+    def changed_tables(self):
+        """Tables (and "classes") whose files changed on disk since this layer last read them."""
+        changed = {table for table, cached in self._tables.items()
+                   if cached[0] != self._signature(os.path.join(self.path, TABLE_FILES[table]))}
+        if self._class_files is not None and self._class_files[0] != self._class_signature()[1]:
+            changed.add("classes")
+        return changed
+
+    def _class_signature(self):
+        classes_dir = os.path.join(self.path, "classes")
+        paths = []
+        if os.path.isdir(classes_dir):
+            for class_name in sorted(os.listdir(classes_dir)):
+                class_dir = os.path.join(classes_dir, class_name)
+                if os.path.isdir(class_dir):
+                    paths += [f"{class_name}/{file_name}" for file_name in sorted(os.listdir(class_dir))
+                              if file_name.endswith(".json")]
+        return paths, tuple((rel, self._signature(os.path.join(classes_dir, rel))) for rel in paths)
+
+    def class_files(self):
+        """{"<class>/<file>.json": document} of the layer's classes/ directory."""
+        classes_dir = os.path.join(self.path, "classes")
+        paths, signature = self._class_signature()
+
+        if self._class_files is None or self._class_files[0] != signature:
+            documents = {}
+            for rel in paths:
+                documents[rel] = startup_trace.load_json(os.path.join(classes_dir, rel), f"{self.name}/{rel}")
+            self._class_files = (signature, documents)
+        return self._class_files[1]
+
+
+class MergedTable(Mapping):
+    """
+    Read-only {name: record} view of one table across layers (one record per name).
+
+    Names and their order are computed when the view is built (from the
+    cached layer indexes); records are resolved on first access.
+    """
+
+    def __init__(self, table, layers):
+        self.table = table
+        self.layers = layers
+        self._resolved = {}
+
+        tables = [layer.table(table) for layer in layers]
+        self._indexes = [index for _, index in tables]
+        order, present = {}, {}
+        for layer, (entries, _) in zip(layers, tables):
+            for entry in entries:
+                name = entry["name"]
+                order.setdefault(name, len(order))
+                if entry.get("$remove"):
+                    present[name] = False
+                elif any(op in entry for op in OPERATIONS):
+                    if not present.get(name):
+                        print(f"[!] {layer.name}: {table} patch for missing entry: {name}")
+                else:
+                    present[name] = True
+        self.names = [name for name in order if present.get(name)]
+
+    def __getitem__(self, name):
+        if name not in self._resolved:
+            record = None
+            for index in self._indexes:
+                entry = index.get(name)
+                if entry is not None:
+                    record = apply_entry(record, entry)
+            if record is None:
+                raise KeyError(name)
+            self._resolved[name] = record
+        return self._resolved[name]
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def records(self):
+        """Every merged record: base order first, then additions in layer order."""
+        return [self[name] for name in self.names]
+
+
+class LayeredCatalogue:
+    """
+    The base data/ with ordered overlay packs (later packs win).
+
+    Args:
+        base_path: The shipped data directory
+        packs: Pack directories, lowest priority first
+    """
+
+    def __init__(self, base_path="data", packs=()):
+        self.base = DataLayer(base_path, "base")
+        self.packs = []
+        self._layer_cache = {}  # {path: DataLayer}, kept when a pack is disabled
+        self._merged = {}
+        for pack_path in packs:
+            self.enable(pack_path)
+
+    @property
+    def layers(self):
+        return [self.base] + self.packs
+
+    def _invalidate(self, layer):
+        """Drop the merged tables a layer touches."""
+        for table in TABLE_FILES:
+            if layer.has_table(table):
+                self._merged.pop(table, None)
+        if os.path.isdir(os.path.join(layer.path, "classes")):
+            self._merged.pop("classes", None)
+
+    def enable(self, pack_path, position=None):
+        """Add a pack on top (or at a position among the packs); returns its DataLayer."""
+        key = os.path.abspath(pack_path)
+        if any(os.path.abspath(pack.path) == key for pack in self.packs):
+            raise ValueError(f"pack already enabled: {pack_path}")
+        layer = self._layer_cache.get(key) or DataLayer(pack_path)
+        self._layer_cache[key] = layer
+        self.packs.insert(len(self.packs) if position is None else position, layer)
+        self._invalidate(layer)
+        return layer
+
+    def disable(self, pack):
+        """Remove a pack by path or name (its parsed files stay cached for re-enabling)."""
+        for layer in self.packs:
+            if layer.name == pack or os.path.abspath(layer.path) == os.path.abspath(pack):
+                self.packs.remove(layer)
+                self._invalidate(layer)
+                return layer
+        raise ValueError(f"no such pack: {pack}")
+
+    def refresh(self):
+        """
+        Drop merged tables whose layer files changed on disk since they were read.
+
+        Returns:
+            Set of changed table names ("classes" for class files)
+        """
+        changed = set()
+        for layer in self.layers:
+            changed |= layer.changed_tables()
+        for table in changed:
+            self._merged.pop(table, None)
+        return changed
+
+    def table(self, table):
+        """Merged {name: record} view of one table."""
+        if table not in self._merged:
+            self._merged[table] = MergedTable(table, self.layers)
+        return self._merged[table]
+
+    def records(self, table):
+        return self.table(table).records()
+
+    def class_documents(self):
+        """Merged {"<class>/<file>.json": document} of every layer's class files."""
+        if "classes" not in self._merged:
+            documents = {}
+            for layer in self.layers:
+                for rel, document in layer.class_files().items():
+                    if isinstance(document, dict) and "$patch" in document:
+                        if rel not in documents:
+                            raise KeyError(f"{layer.name} patches missing class file: {rel}")
+                        documents[rel] = merge_patch(documents[rel], document["$patch"])
+                    else:
+                        documents[rel] = document
+            self._merged["classes"] = documents
+        return self._merged["classes"]
+
+    def features_loader(self):
+        """A ClassFeaturesLoader over the merged classes, subclasses, feats and spells."""
+        classes, subclasses = {}, {}
+        for rel, document in self.class_documents().items():
+            class_name, file_name = rel.split("/", 1)
+            stem = file_name[:-len(".json")]
+            if stem == class_name:
+                classes[class_name] = document
+            else:
+                prefix = f"{class_name}_"
+                subclasses[stem[len(prefix):] if stem.startswith(prefix) else stem] = document
+        return ClassFeaturesLoader.from_records(classes, subclasses, self.records("feats"), self.records("spells"))
+
+    def paths(self):
+        """Directories of every layer, base first."""
+        return [layer.path for layer in self.layers]
+
+    def describe(self):
+        """[(layer name, path, {table: entry count})] from the base up."""
+        return [(layer.name, layer.path, {table: len(layer.table(table)[0]) for table in TABLE_FILES
+                                          if layer.has_table(table)})
+                for layer in self.layers]
@@ -0,0 +1,69 @@
+"""
+Polling file watcher for the data directories (no external service).
+
+    watcher = DataWatcher(["data"])
+    changed = watcher.poll()   # ["data/weapons.json", ...] since the last poll
+
+Only JSON files are watched; a file counts as changed when its
+modification time or size changes, or when it appears or disappears.
+"""
+import os
+import time
+
+
+class DataWatcher:
+    """Detects which data files changed between polls."""
+
+    def __init__(self, paths=("data",), interval=1.0):
+        """
+        Args:
+            paths: Directories to watch (recursively)
+            interval: Minimum seconds between scans for due()
+        """
+        self.paths = [paths] if isinstance(paths, str) else list(paths)
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._last_poll = time.monotonic()
+
+    def _scan(self):
+        """{file path: (mtime, size)} of every JSON file under the watched directories."""
+        snapshot = {}
+        for root_path in self.paths:
+            for root, _, files in os.walk(root_path):
+                for file_name in files:
+                    if file_name.endswith(".json"):
+                        path = os.path.join(root, file_name)
+                        try:
+                            stat = os.stat(path)
+                        except FileNotFoundError:
+                            continue
+                        snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def due(self):
+        """True when at least `interval` seconds passed since the last poll."""
+        return time.monotonic() - self._last_poll >= self.interval
+
+    def poll(self):
+        """Sorted paths added, modified or removed since the last poll."""
+        self._last_poll = time.monotonic()
+        snapshot = self._scan()
+        changed = {path for path, signature in snapshot.items() if self._snapshot.get(path) != signature}
+        changed |= self._snapshot.keys() - snapshot.keys()
+        self._snapshot = snapshot
+        return sorted(changed)
+
+
+def apply_changes(target, source, change):
+    """
+    Bring a derived {name: record} map in line with a reloaded one.
+
+    Args:
+        target: Map to update in place (e.g. DamageCalculator.weap_map)
+        source: Reloaded map the records come from
+        change: {"added", "removed", "changed"} name sets from DataLoader.reload_files
+    """
+    for name in change["removed"]:
+        target.pop(name, None)
+    for name in change["added"] | change["changed"]:
+        target[name] = source[name]
@@ -1,28 +1,65 @@
 
+import sys
+import startup_trace
+
+# --trace-startup is checked before the other imports so they are timed too
+startup_trace.enable_from_argv(sys.argv)
+startup_trace.trace_imports(("dearpygui", "class_features_loader", "loaders", "models", "analysis", "utils", "ui"))
+
 import dearpygui.dearpygui as dpg
+import argparse
+import os
 import re
+import threading
+import traceback
 from class_features_loader import ClassFeaturesLoader
-from loaders import DataLoader
-from models import SpellSlotCalculator, DamageCalculator, ArmorCalculator
-from utils import AbilityScoreCalculator, EquipmentCategorizer
+from loaders import DataLoader, LayeredCatalogue, DataWatcher, apply_changes
+from models import SpellSlotCalculator, DamageCalculator, ArmorCalculator, TurnEngine, SpellIndex, SpellDamageModel, Bestiary
+from analysis import SlotAllocator, PointBuyOptimizer, GearFrontier, BuildSearch, GearDeltaEvaluator
+from utils import AbilityScoreCalculator, EquipmentCategorizer, StartupPipeline, MemoryReport, free_threaded
 from ui import load_damage_type_textures, render_damage_breakdown
+startup_trace.TRACER.stop_import_tracing()
+
+# --- Command Line ---
+ARG_PARSER = argparse.ArgumentParser(description="BG3 Damage Viewer")
+ARG_PARSER.add_argument("--pack", action="append", default=[],
+                        help="overlay data pack directory (repeatable, later packs win)")
+ARG_PARSER.add_argument("--watch", action="store_true",
+                        help="reload changed data files while running")
+ARG_PARSER.add_argument("--trace-startup", nargs="?", const=startup_trace.DEFAULT_TRACE_PATH, metavar="PATH",
+                        help="write a Chrome trace of startup (imports, file parsing, index builds, "
+                             f"widgets) to PATH (default {startup_trace.DEFAULT_TRACE_PATH}) and print a summary")
+ARG_PARSER.add_argument("--memory-report", nargs="?", type=int, const=20, metavar="CALLS",
+                        help="after startup, print retained memory per subsystem and the allocation "
+                             "growth over CALLS recalculations (default 20)")
+ARGS, _ = ARG_PARSER.parse_known_args()
+
+# tracemalloc runs from here on when the memory report is requested
+MEMORY_REPORT = MemoryReport() if ARGS.memory_report else None
 
 # --- Data Loading ---
-print("[*] Loading data...")
-DATA_LOADER = DataLoader()
+# The loader starts empty; the startup pipeline (see "Startup Pipeline")
+# fills its lists in place in a background thread once the window is up.
+if ARGS.pack:
+    DATA_LAYERS = LayeredCatalogue("data", ARGS.pack)
+    DATA_LOADER = DataLoader.from_layers(DATA_LAYERS, deferred=True)
+else:
+    DATA_LAYERS = None
+    DATA_LOADER = DataLoader(deferred=True)
 EQUIP_DATA = DATA_LOADER.equipment_data
 WEAP_DATA = DATA_LOADER.weapon_data
-SPELL_SLOT_DATA = DATA_LOADER.spell_slot_data
-print("[OK] Data loaded\n")
+ENEMY_DATA = DATA_LOADER.enemy_data
 
-# --- Load Class Features ---
-FEATURES_LOADER = DATA_LOADER.features_loader
+# Set by the startup pipeline once spell slots and class features are loaded
+FEATURES_LOADER = None
+SPELL_SLOT_CALC = None
+SPELL_INDEX = None
+SPELL_DAMAGE = None
 
 # --- Initialize Calculators ---
-print("[*] Initializing calculators...")
 EQUIPMENT_CATEGORIZER = EquipmentCategorizer(EQUIP_DATA, WEAP_DATA)
-SPELL_SLOT_CALC = SpellSlotCalculator(SPELL_SLOT_DATA)
-print("[OK] Calculators initialized\n")
+SPELL_SCHOOLS = []
+SLOT_ALLOCATOR = SlotAllocator()
 
 # --- Spell Slot Calculation Wrappers ---
 def calculate_effective_spell_level():
@@ -49,6 +86,36 @@ MELEE_2H = CATEGORIES['melee_2h']
 RANGED_1H = CATEGORIES['ranged_1h']
 RANGED_2H = CATEGORIES['ranged_2h']
 
+# Gear combo tag -> categories its items come from
+SLOT_COMBO_CATEGORIES = {
+    "slot_helmet": ("helmets",),
+    "slot_cape": ("capes",),
+    "slot_armor": ("armor_clothing",),
+    "slot_gloves": ("gloves",),
+    "slot_boots": ("boots",),
+    "slot_amulet": ("amulets",),
+    "slot_ring1": ("rings",),
+    "slot_ring2": ("rings",),
+    "melee_main": ("melee_1h", "melee_2h"),
+    "melee_off": ("shields", "melee_1h"),
+    "ranged_main": ("ranged_1h", "ranged_2h"),
+    "ranged_off": ("ranged_1h",),
+}
+
+def get_slot_combo_items(tag):
+    """Items of a gear combo: "None" plus the slot's categorized items."""
+    if tag == "melee_main":
+        all_melee = sorted(set(MELEE_1H + MELEE_2H))
+        if "Unarmed" not in all_melee:
+            all_melee = ["Unarmed"] + all_melee
+        return ["None"] + all_melee
+    if tag == "ranged_off":
+        return ["None"] + RANGED_1H
+    categories = SLOT_COMBO_CATEGORIES[tag]
+    if len(categories) == 1:
+        return ["None"] + CATEGORIES[categories[0]]
+    return ["None"] + sorted(set(item for key in categories for item in CATEGORIES[key]))
+
 # --- UI Logic ---
 
 def update_melee_slots(sender, app_data, user_data):
@@ -97,10 +164,18 @@ BASE_COSTS = AbilityScoreCalculator.BASE_COSTS
 TOTAL_POINTS = AbilityScoreCalculator.TOTAL_POINTS
 
 # --- Class and Level System ---
-# Dynamically load classes from features loader
-CLASSES = [name.capitalize() for name in FEATURES_LOADER.get_available_classes()]
+# Filled from the features loader during startup
+CLASSES = []
 MAX_CHARACTER_LEVEL = 12
 
+# Adventuring day used by the slot plan
+SLOT_PLAN_ENCOUNTERS = 4
+SLOT_PLAN_ROUNDS = 3
+
+# Equipped main-hand attacks {"melee": attack, "ranged": attack}, set by
+# recalculate_stats; the slot plan compares casts against their action
+weapon_attacks = {}
+
 # Character state: tracks levels in each class
 # Format: {"Barbarian": 3, "Fighter": 2, ...}
 character_levels = {}
@@ -164,6 +239,26 @@ def get_subclass_choices(class_name):
 # --- Initialize Damage and Armor Calculators ---
 DAMAGE_CALC = DamageCalculator(EQUIP_DATA, WEAP_DATA)
 ARMOR_CALC = ArmorCalculator(EQUIP_DATA, WEAP_DATA, SHIELDS)
+BESTIARY = Bestiary(ENEMY_DATA)
+
+# Need class features: built by the startup pipeline
+TURN_ENGINE = None
+POINT_BUY_OPTIMIZER = None
+GEAR_FRONTIER = None
+BUILD_SEARCH = None
+GEAR_DELTAS = None
+
+# Last point-buy optimizer results, in listbox order
+point_buy_results = []
+
+# Gear sets currently listed in the frontier listbox
+gear_frontier_results = []
+
+# Best build of the last whole-build search (BuildSearch report)
+build_search_result = None
+
+# Without the GIL, BuildSearch batches run on threads sharing the evaluators above
+BUILD_SEARCH_WORKERS = (os.cpu_count() or 1) if free_threaded() else 1
 
 # Wrapper function for equipment damage components
 def get_equipment_damage_components(is_unarmed=False):
@@ -173,7 +268,7 @@ def get_equipment_damage_components(is_unarmed=False):
     return DAMAGE_CALC.get_equipment_damage_components(equipped_items, is_unarmed)
 
 # Load damage type textures
-with dpg.texture_registry():
+with startup_trace.span("load damage type textures", "texture"), dpg.texture_registry():
     load_damage_type_textures()
 
 # --- Level Management Functions ---
@@ -369,6 +464,8 @@ def update_total_level_display():
 
 def update_spell_slots_display():
     """Update spell slot display based on current character levels and caster types."""
+    if SPELL_SLOT_CALC is None:
+        return
     esl = calculate_effective_spell_level()
     
     # Update ESL display
@@ -396,6 +493,70 @@ def update_spell_slots_display():
             dpg.set_value("spell_slots_text", f"Spell Slots: {slots_summary}")
         else:
             dpg.set_value("spell_slots_text", f"ESL {esl}: No spell slots available at this level")
+    
+    update_available_spells_display()
+    update_slot_plan_display()
+
+def get_weapon_action_damage():
+    """
+    Average damage of the melee and ranged weapon actions (no bonus action) at
+    the current level if every attack hits, matching SpellDamageModel's per-cast averages.
+    Returns: {"melee": damage, "ranged": damage}
+    """
+    class_sequence = TURN_ENGINE.levels_to_sequence(character_levels)
+    attacks = int(TURN_ENGINE.get_progression_arrays(class_sequence, character_subclasses)['attacks_per_action'][-1])
+    return {kind: attacks * TURN_ENGINE.average_hit_damage(weapon_attacks.get(kind))
+            for kind in ("melee", "ranged")}
+
+def update_slot_plan_display():
+    """Re-plan slot usage over an adventuring day for the current build."""
+    if SPELL_SLOT_CALC is None or TURN_ENGINE is None or SPELL_INDEX is None:
+        return
+    spell_slots = get_all_spell_slots()
+    smite_dice = TURN_ENGINE.feature_tables.resolve(character_levels, character_subclasses)['smite_dice']
+    
+    known_spells = SPELL_INDEX.get_names(SPELL_INDEX.get_available_bits(character_levels, character_subclasses))
+    # Smites only ride on melee attacks
+    weapon_damage = get_weapon_action_damage()
+    cast_values = SLOT_ALLOCATOR.build_cast_values(
+        SPELL_DAMAGE, known_spells, weapon_damage=max(weapon_damage.values()), smite_dice=smite_dice,
+        smite_weapon_damage=weapon_damage["melee"]
+    )
+    if not any(spell_slots.values()) or cast_values.max() <= cast_values[0]:
+        dpg.set_value("slot_plan_text", "No damaging slot uses for this build.")
+        return
+    
+    encounters = SLOT_PLAN_ENCOUNTERS
+    rounds = SLOT_PLAN_ROUNDS
+    plan = SLOT_ALLOCATOR.plan(spell_slots, cast_values, encounters=encounters, rounds=rounds)
+    
+    lines = [f"{encounters} encounters x {rounds} rounds: {plan['total_damage']:.1f} damage if every cast and attack lands"]
+    for index, rounds_plan in enumerate(plan['schedule'], 1):
+        casts = ", ".join(f"L{r['slot_level']}" if r['slot_level'] else "Cantrip" for r in rounds_plan)
+        lines.append(f"  Encounter {index}: {casts}")
+    dpg.set_value("slot_plan_text", "\n".join(lines))
+
+def update_available_spells_display(sender=None, app_data=None, user_data=None):
+    """List the spells the current build can cast, using the active filters."""
+    if SPELL_INDEX is None:
+        return
+    school = dpg.get_value("spell_school_filter")
+    filters = {}
+    if school and school != "All Schools":
+        filters["schools"] = [school]
+    if dpg.get_value("spell_hide_concentration"):
+        filters["concentration"] = False
+    
+    bits = SPELL_INDEX.query(SPELL_INDEX.get_available_bits(character_levels, character_subclasses), **filters)
+    if not bits:
+        dpg.set_value("available_spells_text", "No spells available for this build.")
+        return
+    
+    lines = []
+    for level, names in SPELL_INDEX.group_by_level(bits).items():
+        label = "Cantrips" if level == 0 else f"Level {level}"
+        lines.append(f"{label}: {', '.join(names)}")
+    dpg.set_value("available_spells_text", "\n".join(lines))
 
 def reset_levels(sender, app_data, user_data):
     """Reset all character levels and subclasses."""
@@ -425,6 +586,307 @@ def get_global_damage_bonuses():
     flat_total, _ = get_equipment_damage_components(is_unarmed=False)
     return flat_total
 
+def get_offhand_attack(offhand_name, ability_mod):
+    """Build the bonus-action attack for an off-hand weapon (shields don't attack)."""
+    if not offhand_name or offhand_name == "None" or offhand_name not in WEAP_MAP:
+        return None
+    _, equipment_components = get_equipment_damage_components(is_unarmed=False)
+    return DAMAGE_CALC.build_weapon_attack(
+        WEAP_MAP[offhand_name], '1h', ability_mod, equipment_components,
+        offhand_name, add_ability_damage=False
+    )
+
+def format_turn_damage(label, main_attack, offhand_attack, unarmed=False):
+    """Format expected damage per turn for a main hand / off hand pair."""
+    if not main_attack:
+        return f"{label}: --"
+    
+    class_sequence = TURN_ENGINE.levels_to_sequence(character_levels)
+    result = TURN_ENGINE.evaluate(
+        class_sequence, character_subclasses, main_attack, offhand_attack,
+        target_ac=dpg.get_value("target_ac"), n_turns=3, unarmed=unarmed
+    )
+    attacks = TURN_ENGINE.get_attack_sequence(
+        class_sequence, character_subclasses, has_offhand=bool(offhand_attack), unarmed=unarmed
+    )
+    return (f"{label}: {result['sustained_per_turn'][-1]:.1f} / turn "
+            f"(Burst {result['burst_turn'][-1]:.1f}, 3 turns {result['total_over_turns'][-1]:.1f})\n"
+            f"  " + ", ".join(attacks))
+
+def update_bestiary_damage(main_attack, offhand_attack, ranged_attack, ranged_offhand_attack, unarmed=False):
+    """Fill the bestiary table with melee and ranged damage per turn against every enemy."""
+    turn_stats = GEAR_FRONTIER.get_turn_stats(character_levels, character_subclasses)
+    builds = [
+        BESTIARY.turn_attacks(main_attack, offhand_attack, turn_stats, unarmed=unarmed),
+        BESTIARY.turn_attacks(ranged_attack, ranged_offhand_attack, turn_stats),
+    ]
+    damage = BESTIARY.evaluate(builds)
+    for row in range(len(BESTIARY)):
+        for col, tag in enumerate(("melee", "ranged")):
+            dpg.set_value(f"bestiary_{tag}_{row}", f"{damage[col, row]:.1f}" if builds[col] else "--")
+
+def add_bestiary_rows():
+    """Add one bestiary table row per enemy (inside the bestiary table)."""
+    for row, enemy in enumerate(ENEMY_DATA):
+        with dpg.table_row(parent="bestiary_table"):
+            dpg.add_text(enemy['name'])
+            dpg.add_text(str(enemy['ac']))
+            dpg.add_text(" / ".join(
+                ", ".join(enemy.get(key, [])) or "-"
+                for key in ("resistances", "immunities", "vulnerabilities")
+            ), wrap=250)
+            dpg.add_text("--", tag=f"bestiary_melee_{row}")
+            dpg.add_text("--", tag=f"bestiary_ranged_{row}")
+
+def get_equipped_items():
+    """Get the equipped item name of every gear slot that affects AC and damage."""
+    return {
+        "slot_helmet": dpg.get_value("slot_helmet"),
+        "slot_cape": dpg.get_value("slot_cape"),
+        "slot_armor": dpg.get_value("slot_armor"),
+        "slot_gloves": dpg.get_value("slot_gloves"),
+        "slot_boots": dpg.get_value("slot_boots"),
+        "slot_amulet": dpg.get_value("slot_amulet"),
+        "slot_ring1": dpg.get_value("slot_ring1"),
+        "slot_ring2": dpg.get_value("slot_ring2"),
+        "melee_main": dpg.get_value("melee_main"),
+        "melee_off": dpg.get_value("melee_off"),
+    }
+
+def get_melee_handedness(mh_name, offhand):
+    """Versatile weapons are wielded two-handed when the off hand is empty."""
+    w_item = WEAP_MAP[mh_name]
+    effects = " ".join(w_item.get('effects', []))
+    is_versatile = "2h" in effects and "1h" in effects
+    
+    if (not offhand or offhand == "None") and is_versatile:
+        return '2h'
+    if mh_name in MELEE_2H and mh_name not in MELEE_1H:
+        return '2h'
+    return '1h'
+
+def is_finesse(item):
+    return DAMAGE_CALC.is_finesse(item)
+
+# --- Point Buy Optimization ---
+
+def optimize_point_buy(sender, app_data, user_data):
+    """List Pareto-optimal point-buy allocations for the current gear and levels."""
+    global point_buy_results
+    
+    equipped_items = get_equipped_items()
+    armor_name = dpg.get_value("slot_armor")
+    offhand_name = dpg.get_value("melee_off")
+    armor_ac = ARMOR_CALC.calculate_ac(0, equipped_items, armor_name, offhand_name)['final_ac']
+    dex_cap = ARMOR_CALC.calculate_ac(99, equipped_items, armor_name, offhand_name)['effective_dex']
+    target_ac = dpg.get_value("target_ac")
+    
+    objectives = {"AC": POINT_BUY_OPTIMIZER.ac_objective(armor_ac, dex_cap if dex_cap < 99 else None)}
+    
+    # Attacks are built without an ability modifier; the optimizer adds each allocation's
+    mh_name = dpg.get_value("melee_main")
+    if mh_name == "Unarmed":
+        _, equipment_components = get_equipment_damage_components(is_unarmed=True)
+        attack = {"components": [{"type": "Bludgeoning", "dice_count": 0, "dice_sides": 0, "flat": 1,
+                                  "source": "Unarmed base"}] + equipment_components, "to_hit": 0}
+        objectives["Melee"] = POINT_BUY_OPTIMIZER.damage_objective(
+            character_levels, character_subclasses, attack, target_ac=target_ac, unarmed=True
+        )
+    elif mh_name in WEAP_MAP:
+        _, equipment_components = get_equipment_damage_components(is_unarmed=False)
+        attack = DAMAGE_CALC.build_weapon_attack(
+            WEAP_MAP[mh_name], get_melee_handedness(mh_name, offhand_name), 0, equipment_components, mh_name
+        )
+        offhand_item = WEAP_MAP.get(offhand_name, {})
+        objectives["Melee"] = POINT_BUY_OPTIMIZER.damage_objective(
+            character_levels, character_subclasses, attack, finesse=is_finesse(WEAP_MAP[mh_name]),
+            offhand_attack=get_offhand_attack(offhand_name, 0), offhand_finesse=is_finesse(offhand_item),
+            target_ac=target_ac
+        )
+    
+    rh_name = dpg.get_value("ranged_main")
+    if rh_name in WEAP_MAP:
+        _, equipment_components = get_equipment_damage_components(is_unarmed=False)
+        w_item = WEAP_MAP[rh_name]
+        handedness = '1h' if parse_weapon_damage(w_item, '2h')[0] == "0d0" else '2h'
+        attack = DAMAGE_CALC.build_weapon_attack(w_item, handedness, 0, equipment_components, rh_name)
+        objectives["Ranged"] = POINT_BUY_OPTIMIZER.damage_objective(
+            character_levels, character_subclasses, attack, ranged=True,
+            offhand_attack=get_offhand_attack(dpg.get_value("ranged_off"), 0), target_ac=target_ac
+        )
+    
+    point_buy_results = POINT_BUY_OPTIMIZER.pareto(objectives, limit=20)
+    items = []
+    for result in point_buy_results:
+        scores = " ".join(f"{ab[:3].upper()} {score}" for ab, score in result['scores'].items())
+        values = ", ".join(f"{name} {value:.1f}" for name, value in result['objectives'].items())
+        items.append(f"{scores} | {values}")
+    dpg.configure_item("point_buy_results", items=items, num_items=min(max(len(items), 1), 6))
+    dpg.set_value("point_buy_status", f"{len(items)} Pareto-optimal allocation(s). Select one to apply.")
+
+def apply_point_buy_result(sender, app_data, user_data):
+    """Apply the selected optimizer allocation to the ability table."""
+    items = dpg.get_item_configuration("point_buy_results")["items"]
+    if app_data not in items:
+        return
+    apply_point_buy(point_buy_results[items.index(app_data)])
+
+def apply_point_buy(result):
+    """Set the ability table to a point-buy allocation (PointBuyOptimizer.describe)."""
+    for ab in ABILITIES:
+        dpg.set_value(f"base_val_{ab}", str(result['base_scores'][ab]))
+        dpg.set_value(f"p2_{ab}", ab == result['plus_two'])
+        dpg.set_value(f"p1_{ab}", ab == result['plus_one'])
+    update_abilities_wrapper(None, None, None)
+
+# --- Gear Frontier ---
+
+GEAR_SHIELD_OPTIONS = {"Any": None, "Shield": True, "No Shield": False}
+
+def compute_gear_frontier(sender, app_data, user_data):
+    """Rebuild the AC vs. damage candidate pool for the current character."""
+    if not character_levels:
+        dpg.set_value("gear_frontier_status", "Add class levels first.")
+        return
+    
+    pool_size = GEAR_FRONTIER.build(
+        character_levels, character_subclasses, get_ability_mods(), dpg.get_value("target_ac")
+    )
+    dpg.set_value("gear_frontier_status", f"{pool_size} candidate gear sets.")
+    update_gear_frontier()
+
+def update_gear_frontier(sender=None, app_data=None, user_data=None):
+    """Apply the frontier constraints (incremental update) and refresh the list."""
+    global gear_frontier_results
+    
+    if GEAR_FRONTIER is None or GEAR_FRONTIER.pool is None:
+        return
+    
+    GEAR_FRONTIER.set_constraints(
+        min_ac=dpg.get_value("gear_min_ac") or None,
+        min_melee=dpg.get_value("gear_min_melee") or None,
+        min_ranged=dpg.get_value("gear_min_ranged") or None,
+        shield=GEAR_SHIELD_OPTIONS[dpg.get_value("gear_shield")],
+    )
+    gear_frontier_results = GEAR_FRONTIER.frontier(limit=50)
+    
+    items = []
+    for result in gear_frontier_results:
+        gear, values = result['gear'], result['objectives']
+        weapons = gear["melee_main"] + (f" + {gear['melee_off']}" if gear["melee_off"] != "None" else "")
+        items.append(f"AC {values['AC']:.0f} | Melee {values['Melee']:.1f} | Ranged {values['Ranged']:.1f}"
+                     f" | {gear['slot_armor']}, {weapons}")
+    dpg.configure_item("gear_frontier_results", items=items, num_items=min(max(len(items), 1), 8))
+
+def apply_gear_frontier_result(sender, app_data, user_data):
+    """Equip the selected frontier gear set."""
+    items = dpg.get_item_configuration("gear_frontier_results")["items"]
+    if app_data not in items:
+        return
+    equip_gear(gear_frontier_results[items.index(app_data)]['gear'])
+
+def equip_gear(gear):
+    """Equip a {slot tag: item name} gear set, main hands first so off-hand rules apply."""
+    for tag in ("melee_main", "ranged_main"):
+        dpg.set_value(tag, gear[tag])
+        on_selection_change(tag, gear[tag], f"desc_{tag}")
+    for tag, item_name in gear.items():
+        if tag not in ("melee_main", "ranged_main"):
+            dpg.set_value(tag, item_name)
+            on_selection_change(tag, item_name, f"desc_{tag[5:]}" if tag.startswith("slot_") else f"desc_{tag}")
+
+# --- Item Contributions ---
+
+def format_objective_deltas(deltas):
+    """Format non-zero objective deltas like '+2 AC, +4.5 Melee'."""
+    parts = [
+        f"{value:+.0f} AC" if name == "AC" else f"{value:+.1f} {name}"
+        for name, value in deltas.items() if abs(value) > 1e-9
+    ]
+    return ", ".join(parts) or "no effect"
+
+def update_gear_deltas():
+    """Show each equipped item's contribution and the best swaps next to its slot."""
+    analysis = GEAR_DELTAS.analyze(
+        get_equipped_items() | {"ranged_main": dpg.get_value("ranged_main"), "ranged_off": dpg.get_value("ranged_off")},
+        character_levels, character_subclasses, get_ability_mods(), dpg.get_value("target_ac"), top_k=3
+    )
+    for tag, result in analysis['slots'].items():
+        lines = []
+        if result['item'] != "None":
+            lines.append(f"Contributes: {format_objective_deltas(result['contribution'])}")
+        for swap in result['swaps']:
+            lines.append(f"-> {swap['item']}: {format_objective_deltas(swap['delta'])}")
+        dpg.set_value(f"delta_{tag}", "\n".join(lines))
+
+# --- Whole-Build Search ---
+
+def start_build_search(sender, app_data, user_data):
+    """Run BuildSearch in a background thread, reporting the best build so far."""
+    weights = {
+        "Melee": dpg.get_value("search_weight_melee"),
+        "Ranged": dpg.get_value("search_weight_ranged"),
+        "AC": dpg.get_value("search_weight_ac"),
+    }
+    budget = dpg.get_value("search_budget")
+    target_ac = dpg.get_value("target_ac")
+    dpg.configure_item("build_search_button", enabled=False)
+    dpg.configure_item("build_search_apply", enabled=False)
+    
+    def run():
+        global build_search_result
+        try:
+            build_search_result = BUILD_SEARCH.search(
+                time_budget=budget, weights=weights, target_ac=target_ac, progress=show_build_search_progress,
+                workers=BUILD_SEARCH_WORKERS, backend="thread"
+            )
+        except Exception as e:
+            print(f"[!] Build search failed: {e}\n{traceback.format_exc()}")
+            dpg.set_value("build_search_status", f"Build search failed: {e}")
+        finally:
+            dpg.configure_item("build_search_button", enabled=True)
+            dpg.configure_item("build_search_apply", enabled=True)
+    
+    threading.Thread(target=run, daemon=True).start()
+
+def show_build_search_progress(report):
+    """Show a BuildSearch progress report."""
+    best = report['best']
+    levels = ", ".join(
+        f"{c.capitalize()} {level}" + (f" ({best['subclasses'][c].replace('_', ' ').title()})" if c in best['subclasses'] else "")
+        for c, level in best['levels'].items()
+    )
+    scores = " ".join(f"{ab[:3].upper()} {score}" for ab, score in best['point_buy']['scores'].items())
+    gear = ", ".join(item for item in best['gear'].values() if item != "None")
+    values = best['objectives']
+    dpg.set_value("build_search_status",
+                  f"{report['elapsed']:.0f}s, {report['evaluations']} builds evaluated "
+                  f"({report['cache_hits']} cached) | Score {report['score']:.1f}\n"
+                  f"AC {values['AC']:.0f} | Melee {values['Melee']:.1f} | Ranged {values['Ranged']:.1f}\n"
+                  f"{levels}\n{scores}\n{gear}")
+
+def apply_build_search_result(sender, app_data, user_data):
+    """Apply the best build of the last search: levels, subclasses, point buy and gear."""
+    global pending_subclass_level
+    if not build_search_result:
+        return
+    best = build_search_result['best']
+    
+    character_levels.clear()
+    character_subclasses.clear()
+    pending_subclass_level = ("", 0)
+    for class_name, level in best['levels'].items():
+        character_levels[class_name.capitalize()] = level
+    for class_name, subclass in best['subclasses'].items():
+        character_subclasses[class_name.capitalize()] = subclass
+    dpg.configure_item("subclass_selector_group", show=False)
+    update_features_display()
+    update_total_level_display()
+    update_spell_slots_display()
+    
+    apply_point_buy(best['point_buy'])
+    equip_gear(best['gear'])
+
 # --- Calculation ---
 
 # Use AbilityScoreCalculator for modifier calculation
@@ -489,9 +951,8 @@ def update_abilities(sender, app_data, user_data):
     else:
         dpg.configure_item("points_display", color=[255, 255, 255])
 
-def recalculate_stats():
-    # --- Ability Calculation (Redundant but safe for robust updates) ---
-    scores = {}
+def get_ability_mods():
+    """Read the ability table and return {ability: modifier}."""
     mods = {}
     for ab in ABILITIES:
         base_val_str = dpg.get_value(f"base_val_{ab}")
@@ -502,26 +963,20 @@ def recalculate_stats():
         p1 = dpg.get_value(f"p1_{ab}")
         
         bonus = (2 if p2 else 0) + (1 if p1 else 0)
-        total = base_val + bonus
-        scores[ab] = total
-        mods[ab] = calculate_mod(total)
+        mods[ab] = calculate_mod(base_val + bonus)
+    return mods
+
+def recalculate_stats():
+    if not STARTUP.ready.is_set():
+        return
+    # --- Ability Calculation (Redundant but safe for robust updates) ---
+    mods = get_ability_mods()
 
     # --- AC Calculation ---
     dex_mod = mods.get("Dexterity", 0)
     
     # Get equipped items
-    equipped_items = {
-        "slot_helmet": dpg.get_value("slot_helmet"),
-        "slot_cape": dpg.get_value("slot_cape"),
-        "slot_armor": dpg.get_value("slot_armor"),
-        "slot_gloves": dpg.get_value("slot_gloves"),
-        "slot_boots": dpg.get_value("slot_boots"),
-        "slot_amulet": dpg.get_value("slot_amulet"),
-        "slot_ring1": dpg.get_value("slot_ring1"),
-        "slot_ring2": dpg.get_value("slot_ring2"),
-        "melee_main": dpg.get_value("melee_main"),
-        "melee_off": dpg.get_value("melee_off"),
-    }
+    equipped_items = get_equipped_items()
     
     armor_name = dpg.get_value("slot_armor")
     offhand_name = dpg.get_value("melee_off")
@@ -541,6 +996,8 @@ def recalculate_stats():
     mh_name = dpg.get_value("melee_main")
     mh_stats = "None"
     mh_breakdown_components = []
+    mh_attack = None
+    oh_attack = None
     
     if mh_name == "Unarmed":
         dice = "1d1"
@@ -570,6 +1027,7 @@ def recalculate_stats():
             })
 
         mh_breakdown_components = breakdown_components
+        mh_attack = {"components": breakdown_components, "to_hit": ability_mod}
 
         mh_stats = (f"{dice} + {total_mod}\n"
                     f"Damage: {v_min}-{v_max} (Avg {v_avg:.1f})\n"
@@ -577,22 +1035,14 @@ def recalculate_stats():
 
     elif mh_name and mh_name in WEAP_MAP and mh_name != "None":
         w_item = WEAP_MAP[mh_name]
-        offhand = dpg.get_value("melee_off")
-        is_versatile = "2h" in " ".join(w_item.get('effects', [])) and "1h" in " ".join(w_item.get('effects', []))
-        
-        # Determine strict handedness
-        main_hand_dice_mode = '1h'
-        if (not offhand or offhand == "None") and is_versatile:
-            main_hand_dice_mode = '2h'
-        elif mh_name in MELEE_2H and mh_name not in MELEE_1H:
-            main_hand_dice_mode = '2h'
+        main_hand_dice_mode = get_melee_handedness(mh_name, dpg.get_value("melee_off"))
             
         dice, enchant = parse_weapon_damage(w_item, main_hand_dice_mode)
         
         # Ability Mod (Finesse check could be added here, assuming STR for now for melee)
         types = w_item.get('type', '').lower()
         use_dex = False
-        if 'finesse' in " ".join(w_item.get('effects', [])).lower():
+        if is_finesse(w_item):
             if dex_mod > str_mod: use_dex = True
             
         ability_mod = dex_mod if use_dex else str_mod
@@ -621,6 +1071,15 @@ def recalculate_stats():
             })
 
         mh_breakdown_components = breakdown_components
+        mh_attack = {"components": breakdown_components, "to_hit": ability_mod + enchant,
+                     "ignores_resistance": DAMAGE_CALC.get_ignored_resistances(w_item)}
+        
+        oh_name = dpg.get_value("melee_off")
+        oh_item = WEAP_MAP.get(oh_name, {})
+        oh_mod = str_mod
+        if is_finesse(oh_item) and dex_mod > str_mod:
+            oh_mod = dex_mod
+        oh_attack = get_offhand_attack(oh_name, oh_mod)
 
         mh_stats = (f"{dice} + {total_mod}\n"
                     f"Damage: {v_min}-{v_max} (Avg {v_avg:.1f})\n"
@@ -633,6 +1092,8 @@ def recalculate_stats():
     rh_name = dpg.get_value("ranged_main")
     rh_stats = "None"
     rh_breakdown_components = []
+    rh_attack = None
+    roh_attack = None
     
     if rh_name and rh_name in WEAP_MAP and rh_name != "None":
         w_item = WEAP_MAP[rh_name] 
@@ -678,6 +1139,9 @@ def recalculate_stats():
             })
 
         rh_breakdown_components = breakdown_components
+        rh_attack = {"components": breakdown_components, "to_hit": ability_mod + enchant,
+                     "ignores_resistance": DAMAGE_CALC.get_ignored_resistances(w_item)}
+        roh_attack = get_offhand_attack(dpg.get_value("ranged_off"), dex_mod)
 
         rh_stats = (f"{dice} + {total_mod}\n"
                     f"Damage: {v_min}-{v_max} (Avg {v_avg:.1f})\n"
@@ -686,6 +1150,20 @@ def recalculate_stats():
     dpg.set_value("stat_rh_dmg", f"{rh_stats}")
     render_damage_breakdown("rh_breakdown", rh_breakdown_components)
     
+    # --- Damage per Turn ---
+    dpg.set_value("stat_turn_dmg", "\n".join([
+        format_turn_damage("Melee", mh_attack, oh_attack, unarmed=(mh_name == "Unarmed")),
+        format_turn_damage("Ranged", rh_attack, roh_attack),
+    ]))
+    update_bestiary_damage(mh_attack, oh_attack, rh_attack, roh_attack, unarmed=(mh_name == "Unarmed"))
+    
+    # Casting a spell gives up the weapon action
+    weapon_attacks.update(melee=mh_attack, ranged=rh_attack)
+    update_slot_plan_display()
+    
+    # Per-slot item contributions and best swaps
+    update_gear_deltas()
+    
     # Update class features display
     update_features_display()
     
@@ -724,11 +1202,237 @@ def update_abilities_wrapper(sender, app_data, user_data):
     update_abilities(sender, app_data, user_data)
     recalculate_stats()
 
+# --- Data Refresh (startup and --watch) ---
+
+def sync_item_maps(changes):
+    """Apply equipment/weapon name changes to the item maps of the UI and calculators."""
+    for table, source, targets in (
+        ('equipment', DATA_LOADER.equipment_map, (EQUIP_MAP, DAMAGE_CALC.equip_map, ARMOR_CALC.equip_map)),
+        ('weapons', DATA_LOADER.weapon_map, (WEAP_MAP, DAMAGE_CALC.weap_map, ARMOR_CALC.weap_map)),
+    ):
+        if changes.get(table):
+            for target in targets:
+                apply_changes(target, source, changes[table])
+
+def refresh_gear_combos(changed_categories):
+    """Reset the items of every gear combo fed by a changed category."""
+    for tag, categories in SLOT_COMBO_CATEGORIES.items():
+        if changed_categories & set(categories):
+            items = get_slot_combo_items(tag)
+            dpg.configure_item(tag, items=items)
+            if dpg.get_value(tag) not in items:
+                dpg.set_value(tag, "None")
+
+def rebuild_bestiary():
+    """Rebuild the Bestiary and its table rows from ENEMY_DATA."""
+    global BESTIARY
+    with startup_trace.span("Bestiary", "index"):
+        BESTIARY = Bestiary(ENEMY_DATA)
+    dpg.delete_item("bestiary_table", children_only=True, slot=1)
+    add_bestiary_rows()
+
+def refresh_class_widgets():
+    """Class list of the class combo and the features panel."""
+    CLASSES[:] = [name.capitalize() for name in FEATURES_LOADER.get_available_classes()]
+    dpg.configure_item("class_selector", items=CLASSES)
+    update_features_display()
+
+def refresh_spell_widgets():
+    """Spell indexes, the school filter and the spell panels."""
+    global SPELL_INDEX, SPELL_DAMAGE
+    with startup_trace.span("SpellIndex", "index"):
+        SPELL_INDEX = SpellIndex(FEATURES_LOADER, SPELL_SLOT_CALC)
+    with startup_trace.span("SpellDamageModel", "index"):
+        SPELL_DAMAGE = SpellDamageModel(FEATURES_LOADER)
+    SPELL_SCHOOLS[:] = sorted(SPELL_INDEX.by_school)
+    dpg.configure_item("spell_school_filter", items=["All Schools"] + SPELL_SCHOOLS)
+    update_available_spells_display()
+    update_spell_slots_display()
+
+def apply_data_reload(paths):
+    """
+    Reload changed data files and refresh only what depends on them:
+    item maps, categories and gear caches, enemy table, spell indexes,
+    class feature tables, and the combos whose item lists changed.
+    """
+    global BUILD_SEARCH
+    changes = DATA_LOADER.reload_files(paths)
+    if not changes:
+        return
+    print(f"[*] Reloaded {', '.join(sorted(changes))}")
+    
+    item_changes = [changes[table] for table in ('equipment', 'weapons') if changes.get(table)]
+    if item_changes:
+        sync_item_maps(changes)
+        changed_categories = EQUIPMENT_CATEGORIZER.refresh(equipment=bool(changes.get('equipment')),
+                                                           weapons=bool(changes.get('weapons')))
+        GEAR_FRONTIER.refresh_items(set().union(*(
+            change['added'] | change['removed'] | change['changed'] for change in item_changes)))
+        GEAR_DELTAS.refresh()
+        refresh_gear_combos(changed_categories)
+        dpg.configure_item("gear_frontier_results", items=[])
+    
+    if 'enemies' in changes:
+        rebuild_bestiary()
+    
+    class_change = changes.keys() & {'classes', 'subclasses'}
+    if class_change:
+        TURN_ENGINE.refresh()
+        GEAR_FRONTIER.refresh_turns()
+        refresh_class_widgets()
+    
+    if class_change or 'spells' in changes:
+        refresh_spell_widgets()
+    
+    if changes.keys() - {'enemies'}:
+        BUILD_SEARCH = BuildSearch(FEATURES_LOADER, GEAR_FRONTIER, POINT_BUY_OPTIMIZER)
+    
+    recalculate_stats()
+
+# --- Startup Pipeline ---
+
+# Controls that need every dataset; enabled when startup finishes
+STARTUP_GATED_CONTROLS = ("point_buy_button", "gear_frontier_button", "build_search_button", "reset_levels_button")
+
+def on_items_loaded(changes):
+    sync_item_maps(changes)
+    with startup_trace.span("EquipmentCategorizer", "index"):
+        changed_categories = EQUIPMENT_CATEGORIZER.refresh(equipment=True, weapons=True)
+    refresh_gear_combos(changed_categories)
+
+def on_enemies_loaded(changes):
+    rebuild_bestiary()
+
+def on_spell_slots_loaded(changes):
+    global SPELL_SLOT_CALC
+    SPELL_SLOT_CALC = SpellSlotCalculator(DATA_LOADER.spell_slot_data)
+
+def on_class_features_loaded(changes):
+    global FEATURES_LOADER, TURN_ENGINE, POINT_BUY_OPTIMIZER
+    FEATURES_LOADER = DATA_LOADER.features_loader
+    with startup_trace.span("TurnEngine", "index"):
+        TURN_ENGINE = TurnEngine(FEATURES_LOADER)
+    with startup_trace.span("PointBuyOptimizer", "index"):
+        POINT_BUY_OPTIMIZER = PointBuyOptimizer(TURN_ENGINE)
+    refresh_class_widgets()
+    refresh_spell_widgets()
+
+def build_gear_analysis():
+    global GEAR_FRONTIER, BUILD_SEARCH, GEAR_DELTAS
+    with startup_trace.span("GearFrontier", "index"):
+        GEAR_FRONTIER = GearFrontier(EQUIPMENT_CATEGORIZER, DAMAGE_CALC, ARMOR_CALC, TURN_ENGINE)
+    with startup_trace.span("BuildSearch", "index"):
+        BUILD_SEARCH = BuildSearch(FEATURES_LOADER, GEAR_FRONTIER, POINT_BUY_OPTIMIZER)
+    with startup_trace.span("GearDeltaEvaluator", "index"):
+        GEAR_DELTAS = GearDeltaEvaluator(GEAR_FRONTIER)
+
+STARTUP_READY_HANDLERS = {
+    "Equipment and weapons": on_items_loaded,
+    "Enemies": on_enemies_loaded,
+    "Spell slots": on_spell_slots_loaded,
+    "Class features": on_class_features_loaded,
+}
+
+def get_startup_stages():
+    """(name, load, ready) stages: the DataLoader stages, then the gear analysis."""
+    stages = [(name, load, STARTUP_READY_HANDLERS[name]) for name, load in DATA_LOADER.load_stages()]
+    stages.append(("Gear analysis", build_gear_analysis, None))
+    return stages
+
+def show_startup_progress(completed, total, name, finished):
+    """Progress bar and status line of the startup pipeline."""
+    dpg.set_value("startup_progress", completed / total)
+    dpg.configure_item("startup_progress", overlay=f"{completed}/{total}")
+    dpg.set_value("startup_status", f"{name}..." if not finished else f"{name} ready")
+    print(f"[OK] {name} ready" if finished else f"[*] Loading {name.lower()}...")
+    if finished and MEMORY_REPORT is not None:
+        MEMORY_REPORT.mark(name)
+
+def write_startup_trace():
+    """Write the --trace-startup Chrome trace and print its summary table."""
+    if not ARGS.trace_startup:
+        return
+    startup_trace.instant("startup finished")
+    path = startup_trace.write(ARGS.trace_startup)
+    print(f"[->] Startup trace written to {path} (open in chrome://tracing or ui.perfetto.dev)\n")
+    print(startup_trace.summary())
+    print()
+
+def on_startup_error(name, error, trace):
+    print(f"[!] Startup failed while loading {name.lower()}: {error}\n{trace}")
+    dpg.set_value("startup_status", f"Loading {name.lower()} failed: {error}")
+    dpg.configure_item("startup_status", color=[255, 100, 100])
+    write_startup_trace()
+
+def on_startup_done(timings):
+    print(f"[OK] Startup finished in {sum(seconds for _, seconds in timings) * 1000:.0f} ms\n")
+    for tag in STARTUP_GATED_CONTROLS:
+        dpg.configure_item(tag, enabled=True)
+    dpg.configure_item("startup_group", show=False)
+    with startup_trace.span("recalculate stats", "ui"):
+        recalculate_stats()
+    write_startup_trace()
+    print_memory_report()
+
+def get_widget_data():
+    """Python copies of every widget's value and configuration (as dpg hands them out)."""
+    return {item: (dpg.get_value(item), dpg.get_item_configuration(item)) for item in dpg.get_all_items()}
+
+def print_memory_report():
+    """
+    --memory-report: retained memory of the loaded data, derived indexes,
+    caches and widgets, then allocation growth over repeated recalculations.
+    Raw data comes first, so each later row is what it adds on top.
+    """
+    if MEMORY_REPORT is None:
+        return
+    report = MEMORY_REPORT
+    report.add("DataLoader data lists", EQUIP_DATA, WEAP_DATA, ENEMY_DATA)
+    report.add("DataLoader name maps", DATA_LOADER.equipment_map, DATA_LOADER.weapon_map, DATA_LOADER.enemy_map)
+    report.add("EQUIP_MAP / WEAP_MAP", EQUIP_MAP, WEAP_MAP)
+    report.add("DamageCalculator name maps", DAMAGE_CALC.equip_map, DAMAGE_CALC.weap_map)
+    report.add("ArmorCalculator name maps", ARMOR_CALC.equip_map, ARMOR_CALC.weap_map)
+    for attr in ("classes", "subclasses", "spells", "feats", "spell_map"):
+        report.add(f"ClassFeaturesLoader.{attr}", getattr(FEATURES_LOADER, attr))
+    report.add("EquipmentCategorizer lists", EQUIPMENT_CATEGORIZER)
+    report.add("SpellSlotCalculator", SPELL_SLOT_CALC)
+    report.add("SpellIndex", SPELL_INDEX)
+    report.add("SpellDamageModel", SPELL_DAMAGE)
+    report.add("TurnEngine / FeatureTables", TURN_ENGINE)
+    report.add("Bestiary", BESTIARY)
+    report.add("PointBuyOptimizer", POINT_BUY_OPTIMIZER)
+    report.add("GearFrontier caches", *GEAR_FRONTIER.caches().values())
+    report.add("GearFrontier", GEAR_FRONTIER)
+    report.add("BuildSearch caches", *BUILD_SEARCH.caches().values())
+    report.add("BuildSearch", BUILD_SEARCH)
+    report.add("GearDeltaEvaluator", GEAR_DELTAS)
+    if DATA_LAYERS is not None:
+        report.add("Data pack layers", DATA_LAYERS)
+    if DATA_LOADER.catalogue is not None:
+        report.add("CatalogueStore", DATA_LOADER.catalogue, external_bytes=DATA_LOADER.catalogue.database_size())
+    bundle = getattr(DATA_LOADER, "bundle", None)
+    if bundle is not None:
+        report.add("DataBundle", bundle, external_bytes=bundle.mapped_bytes())
+    report.add("dpg widget data", get_widget_data())
+    
+    growth = report.measure_growth(recalculate_stats, calls=ARGS.memory_report)
+    print("[->] Memory report\n")
+    print(report.format(growth))
+    print()
+
+STARTUP = StartupPipeline(get_startup_stages(), show_startup_progress, on_startup_error, on_startup_done)
+
 # Re-construction of Window for Split View
 # dpg.delete_item("Primary Window") # Clear old
 
+WIDGETS_TRACE = startup_trace.begin("build widgets", "ui")
 with dpg.window(tag="Primary Window", label="BG3 Damage Analyzer"):
     
+    # Startup progress (hidden once every dataset is loaded)
+    with dpg.group(horizontal=True, tag="startup_group"):
+        dpg.add_progress_bar(tag="startup_progress", default_value=0.0, overlay="Starting", width=250)
+        dpg.add_text("Starting...", tag="startup_status", color=[180, 180, 180])
+    
     with dpg.table(header_row=False, resizable=True, policy=dpg.mvTable_SizingStretchProp, borders_innerV=True):
         dpg.add_table_column(label="Controls", width_stretch=True, init_width_or_weight=0.6)
         dpg.add_table_column(label="Stats", width_stretch=True, init_width_or_weight=0.4)
@@ -785,6 +1489,13 @@ with dpg.window(tag="Primary Window", label="BG3 Damage Analyzer"):
                                 dpg.add_checkbox(tag=f"p1_{ab}", callback=update_abilities_wrapper)
                                 dpg.add_text("8", tag=f"total_{ab}")
                                 dpg.add_text("-1", tag=f"mod_{ab}")
+                    
+                    # Pareto-optimal allocations for the current build and gear
+                    dpg.add_spacer(height=5)
+                    with dpg.group(horizontal=True):
+                        dpg.add_button(label="Optimize Point Buy", tag="point_buy_button", callback=optimize_point_buy, enabled=False)
+                        dpg.add_text("AC vs. damage for the current gear", tag="point_buy_status", color=[150, 150, 150])
+                    dpg.add_listbox(items=[], tag="point_buy_results", callback=apply_point_buy_result, num_items=1, width=-1)
 
                 # --- CLASS & LEVEL SYSTEM ---
                 dpg.add_text("Class & Level System", color=[255, 215, 0])
@@ -806,7 +1517,7 @@ with dpg.window(tag="Primary Window", label="BG3 Damage Analyzer"):
                     # Level progression (linear)
                     with dpg.group(horizontal=True):
                         dpg.add_button(label="Add Level", tag="add_level_button", callback=add_level_to_class, enabled=False, width=120)
-                        dpg.add_button(label="Reset All", callback=reset_levels, width=100)
+                        dpg.add_button(label="Reset All", tag="reset_levels_button", callback=reset_levels, enabled=False, width=100)
                     
                     dpg.add_spacer(height=5)
                     
@@ -838,6 +1549,19 @@ with dpg.window(tag="Primary Window", label="BG3 Damage Analyzer"):
                         with dpg.group():
                             for slot_level in range(1, 7):
                                 dpg.add_text(f"Level {slot_level}: 0", tag=f"spell_slot_level{slot_level}", color=[180, 180, 180])
+                    
+                    # Spells the build can cast (always live, filtered via SpellIndex bitsets)
+                    dpg.add_spacer(height=5)
+                    dpg.add_text("Available Spells:", color=[200, 200, 100])
+                    with dpg.group(horizontal=True):
+                        dpg.add_combo(items=["All Schools"] + SPELL_SCHOOLS, tag="spell_school_filter", default_value="All Schools", callback=update_available_spells_display, width=150)
+                        dpg.add_checkbox(label="Hide Concentration", tag="spell_hide_concentration", callback=update_available_spells_display)
+                    dpg.add_text("No spells available for this build.", tag="available_spells_text", color=[180, 180, 180], wrap=400)
+                    
+                    # Slot plan for an adventuring day (SlotAllocator DP)
+                    dpg.add_spacer(height=5)
+                    dpg.add_text("Slot Plan (Adventuring Day):", color=[200, 200, 100])
+                    dpg.add_text("No damaging slot uses for this build.", tag="slot_plan_text", color=[180, 180, 180], wrap=400)
                 
                 dpg.add_separator()
                 
@@ -850,6 +1574,7 @@ with dpg.window(tag="Primary Window", label="BG3 Damage Analyzer"):
                     # Add None option
                     item_list = ["None"] + items
                     dpg.add_combo(items=item_list, tag=tag, callback=on_selection_change, user_data=desc_tag, width=width)
+                    dpg.add_text("", tag=f"delta_{tag}", color=[120, 200, 120], wrap=250)
                     dpg.add_text("", tag=desc_tag, color=[150, 150, 150], wrap=250)
                     dpg.add_spacer(height=5)
 
@@ -875,21 +1600,17 @@ with dpg.window(tag="Primary Window", label="BG3 Damage Analyzer"):
                 # --- WEAPONS ---
                 dpg.add_text("Weapons", color=[255, 215, 0])
                 
-                all_melee = sorted(list(set(MELEE_1H + MELEE_2H)))
-                if "Unarmed" not in all_melee:
-                    all_melee = ["Unarmed"] + all_melee
-                offhand_options = sorted(list(set(SHIELDS + MELEE_1H)))
-                all_ranged = sorted(list(set(RANGED_1H + RANGED_2H)))
-
                 with dpg.group(horizontal=True):
                     # MELEE (Left)
                     with dpg.group():
                         dpg.add_text("Melee Main Hand")
-                        dpg.add_combo(items=["None"] + all_melee, tag="melee_main", callback=on_selection_change, user_data="desc_melee_main", width=250)
+                        dpg.add_combo(items=get_slot_combo_items("melee_main"), tag="melee_main", callback=on_selection_change, user_data="desc_melee_main", width=250)
+                        dpg.add_text("", tag="delta_melee_main", color=[120, 200, 120], wrap=250)
                         dpg.add_text("", tag="desc_melee_main", color=[150, 150, 150], wrap=250)
                         
                         dpg.add_text("Melee Off Hand")
-                        dpg.add_combo(items=["None"] + offhand_options, tag="melee_off", callback=on_selection_change, user_data="desc_melee_off", width=250)
+                        dpg.add_combo(items=get_slot_combo_items("melee_off"), tag="melee_off", callback=on_selection_change, user_data="desc_melee_off", width=250)
+                        dpg.add_text("", tag="delta_melee_off", color=[120, 200, 120], wrap=250)
                         dpg.add_text("", tag="desc_melee_off", color=[150, 150, 150], wrap=250)
                     
                     dpg.add_spacer(width=20)
@@ -897,11 +1618,13 @@ with dpg.window(tag="Primary Window", label="BG3 Damage Analyzer"):
                     # RANGED (Right)
                     with dpg.group():
                         dpg.add_text("Ranged Main Hand")
-                        dpg.add_combo(items=["None"] + all_ranged, tag="ranged_main", callback=on_selection_change, user_data="desc_ranged_main", width=250)
+                        dpg.add_combo(items=get_slot_combo_items("ranged_main"), tag="ranged_main", callback=on_selection_change, user_data="desc_ranged_main", width=250)
+                        dpg.add_text("", tag="delta_ranged_main", color=[120, 200, 120], wrap=250)
                         dpg.add_text("", tag="desc_ranged_main", color=[150, 150, 150], wrap=250)
                         
                         dpg.add_text("Ranged Off Hand")
-                        dpg.add_combo(items=["None"] + RANGED_1H, tag="ranged_off", callback=on_selection_change, user_data="desc_ranged_off", width=250)
+                        dpg.add_combo(items=get_slot_combo_items("ranged_off"), tag="ranged_off", callback=on_selection_change, user_data="desc_ranged_off", width=250)
+                        dpg.add_text("", tag="delta_ranged_off", color=[120, 200, 120], wrap=250)
                         dpg.add_text("", tag="desc_ranged_off", color=[150, 150, 150], wrap=250)
 
             # --- RIGHT COLUMN: STATS ---
@@ -927,6 +1650,48 @@ with dpg.window(tag="Primary Window", label="BG3 Damage Analyzer"):
                         dpg.add_text("Ranged Breakdown", color=[200, 200, 200])
                         dpg.add_group(tag="rh_breakdown")
                         
+                        dpg.add_spacer(height=10)
+                        dpg.add_text("Damage per Turn", color=[255, 100, 100])
+                        dpg.add_input_int(label="Target AC", tag="target_ac", default_value=15, min_value=1, min_clamped=True, width=100, callback=lambda: recalculate_stats())
+                        dpg.add_text("Melee: --\nRanged: --", tag="stat_turn_dmg")
+                        
+                        # Damage per turn against every enemy profile (Bestiary)
+                        dpg.add_spacer(height=10)
+                        dpg.add_text("Damage per Turn vs. Bestiary", color=[255, 100, 100])
+                        with dpg.table(tag="bestiary_table", header_row=True, borders_innerH=True, borders_outerH=True, borders_innerV=True):
+                            dpg.add_table_column(label="Enemy")
+                            dpg.add_table_column(label="AC", width_fixed=True)
+                            dpg.add_table_column(label="Resists / Immune / Vulnerable")
+                            dpg.add_table_column(label="Melee", width_fixed=True)
+                            dpg.add_table_column(label="Ranged", width_fixed=True)
+                            add_bestiary_rows()
+                        
+                        # Pareto frontier of gear sets (GearFrontier)
+                        dpg.add_spacer(height=10)
+                        dpg.add_text("Gear Frontier (AC vs. Damage)", color=[255, 100, 100])
+                        with dpg.group(horizontal=True):
+                            dpg.add_button(label="Compute Frontier", tag="gear_frontier_button", callback=compute_gear_frontier, enabled=False)
+                            dpg.add_text("", tag="gear_frontier_status", color=[150, 150, 150])
+                        with dpg.group(horizontal=True):
+                            dpg.add_input_int(label="Min AC", tag="gear_min_ac", default_value=0, min_value=0, min_clamped=True, width=80, callback=update_gear_frontier)
+                            dpg.add_input_float(label="Min Melee", tag="gear_min_melee", default_value=0, min_value=0, min_clamped=True, step=5, format="%.0f", width=80, callback=update_gear_frontier)
+                            dpg.add_input_float(label="Min Ranged", tag="gear_min_ranged", default_value=0, min_value=0, min_clamped=True, step=5, format="%.0f", width=80, callback=update_gear_frontier)
+                            dpg.add_combo(items=list(GEAR_SHIELD_OPTIONS), tag="gear_shield", default_value="Any", width=100, callback=update_gear_frontier)
+                        dpg.add_listbox(items=[], tag="gear_frontier_results", callback=apply_gear_frontier_result, num_items=1, width=700)
+                        
+                        # Simulated annealing over class split, point buy and gear (BuildSearch)
+                        dpg.add_spacer(height=10)
+                        dpg.add_text("Build Search", color=[255, 100, 100])
+                        with dpg.group(horizontal=True):
+                            dpg.add_input_int(label="Seconds", tag="search_budget", default_value=30, min_value=1, min_clamped=True, width=80)
+                            dpg.add_input_float(label="Melee", tag="search_weight_melee", default_value=1.0, step=0.5, format="%.1f", width=80)
+                            dpg.add_input_float(label="Ranged", tag="search_weight_ranged", default_value=0.0, step=0.5, format="%.1f", width=80)
+                            dpg.add_input_float(label="AC", tag="search_weight_ac", default_value=2.0, step=0.5, format="%.1f", width=80)
+                        with dpg.group(horizontal=True):
+                            dpg.add_button(label="Search Builds", tag="build_search_button", callback=start_build_search, enabled=False)
+                            dpg.add_button(label="Apply Best Build", tag="build_search_apply", callback=apply_build_search_result, enabled=False)
+                        dpg.add_text("", tag="build_search_status", color=[180, 180, 180], wrap=700)
+                        
                         dpg.add_spacer(height=20)
                         dpg.add_text("Class Features", color=[150, 255, 150])
                         with dpg.group():
@@ -937,10 +1702,27 @@ with dpg.window(tag="Primary Window", label="BG3 Damage Analyzer"):
                         # Placeholder for future thorough log
                         dpg.add_text("(Calculations include attribute modifiers,\nweapon enchantments, and flat bonuses\nfrom equipped items.)", color=[180,180,180])
 
-dpg.create_viewport(title='BG3 Damage Analyzer', width=1280, height=800)
+startup_trace.end(WIDGETS_TRACE)
 
-dpg.setup_dearpygui()
-dpg.show_viewport()
-dpg.set_primary_window("Primary Window", True)
-dpg.start_dearpygui()
+with startup_trace.span("create viewport", "ui"):
+    dpg.create_viewport(title='BG3 Damage Analyzer', width=1280, height=800)
+    
+    dpg.setup_dearpygui()
+    dpg.show_viewport()
+    dpg.set_primary_window("Primary Window", True)
+if ARGS.trace_startup:
+    dpg.set_frame_callback(1, lambda: startup_trace.instant("first frame", "ui"))
+if ARGS.watch:
+    DATA_WATCHER = DataWatcher(DATA_LAYERS.paths() if DATA_LAYERS else [DATA_LOADER.data_path])
+    print("[OK] Watching data files for changes")
+STARTUP.start()
+if ARGS.watch:
+    while dpg.is_dearpygui_running():
+        if STARTUP.ready.is_set() and DATA_WATCHER.due():
+            changed_paths = DATA_WATCHER.poll()
+            if changed_paths:
+                apply_data_reload(changed_paths)
+        dpg.render_dearpygui_frame()
+else:
+    dpg.start_dearpygui()
 dpg.destroy_context()
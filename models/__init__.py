@@ -4,10 +4,20 @@ from .character import Character
 from .spell_slots import SpellSlotCalculator
 from .damage_calculator import DamageCalculator
 from .armor_calculator import ArmorCalculator
+from .feature_tables import FeatureTables
+from .turn_engine import TurnEngine
+from .spell_damage import SpellDamageModel
+from .spell_index import SpellIndex
+from .bestiary import Bestiary
 
 __all__ = [
     'Character',
     'SpellSlotCalculator',
     'DamageCalculator',
     'ArmorCalculator',
+    'FeatureTables',
+    'TurnEngine',
+    'SpellDamageModel',
+    'SpellIndex',
+    'Bestiary',
 ]
\ No newline at end of file
@@ -24,69 +24,14 @@ class ArmorCalculator:
         Returns:
             Dict with keys: base_ac, effective_dex, bonus_ac, final_ac
         """
-        base_ac = 10
-        max_dex_bonus = 99  # Uncapped by default
-        active_ac_bonus = 0
-        
-        # --- Process Armor ---
-        armor_item = self.equip_map.get(armor_name)
-        is_unarmored = (not armor_name or armor_name == "None")
-        
-        if armor_item and armor_name != "None":
-            item_type = armor_item.get('type', '')
-            effects = " ".join(armor_item.get('effects', []))
-            
-            # Check if it's clothing (counts as unarmored)
-            if armor_item.get('type') == 'Clothing':
-                is_unarmored = True
-            else:
-                is_unarmored = False
-            
-            # Parse base AC from effects: "Shield X AC"
-            match = re.search(r"Shield (\d+) AC", effects)
-            if match:
-                base_ac = int(match.group(1))
-            elif armor_item.get('armor_class'):
-                base_ac = armor_item['armor_class']
-            
-            # Set dex bonus cap based on armor type
-            if 'Medium' in item_type:
-                max_dex_bonus = 2
-            elif 'Heavy' in item_type:
-                max_dex_bonus = 0
-        
-        # --- Process Shield ---
+        base_ac, max_dex_bonus, is_unarmored = self.get_armor_base(armor_name)
         has_shield = (offhand_name in self.shields and offhand_name != "None")
-        
-        if has_shield:
-            shield_item = self.equip_map.get(offhand_name) or self.weap_map.get(offhand_name)
-            if shield_item:
-                if shield_item.get('armor_class'):
-                    active_ac_bonus += shield_item['armor_class']
-                else:
-                    active_ac_bonus += 2  # Default shield bonus
+        active_ac_bonus = self.get_shield_bonus(offhand_name)
         
         # --- Process Misc AC Bonuses ---
         # Check all equipment slots for AC bonuses
         for item_name in equipped_items.values():
-            if not item_name or item_name == "None":
-                continue
-            
-            item = self.equip_map.get(item_name) or self.weap_map.get(item_name)
-            if not item:
-                continue
-            
-            effects = " ".join(item.get('effects', []))
-            
-            # Look for "Shield + X AC" bonuses
-            matches = re.findall(r"Shield \+ (\d+) AC", effects)
-            for m in matches:
-                # Special case: Bracers of Defence only work when unarmored and no shield
-                if item['name'] == "Bracers of Defence":
-                    if is_unarmored and not has_shield:
-                        active_ac_bonus += int(m)
-                else:
-                    active_ac_bonus += int(m)
+            active_ac_bonus += self.get_item_ac_bonus(item_name, is_unarmored, has_shield)
         
         # --- Calculate Final AC ---
         effective_dex = min(dex_mod, max_dex_bonus)
@@ -99,6 +44,70 @@ class ArmorCalculator:
             'final_ac': final_ac
         }
     
+    def get_armor_base(self, armor_name):
+        """
+        Get the base AC of a body armour.
+        
+        Returns:
+            Tuple (base_ac, max_dex_bonus, is_unarmored); clothing counts as unarmored
+        """
+        base_ac = 10
+        max_dex_bonus = 99  # Uncapped by default
+        armor_item = self.equip_map.get(armor_name)
+        
+        if not armor_item or armor_name == "None":
+            return base_ac, max_dex_bonus, (not armor_name or armor_name == "None")
+        
+        item_type = armor_item.get('type', '')
+        effects = " ".join(armor_item.get('effects', []))
+        
+        # Parse base AC from effects: "Shield X AC"
+        match = re.search(r"Shield (\d+) AC", effects)
+        if match:
+            base_ac = int(match.group(1))
+        elif armor_item.get('armor_class'):
+            base_ac = armor_item['armor_class']
+        
+        # Set dex bonus cap based on armor type
+        if 'Medium' in item_type:
+            max_dex_bonus = 2
+        elif 'Heavy' in item_type:
+            max_dex_bonus = 0
+        
+        return base_ac, max_dex_bonus, item_type == 'Clothing'
+    
+    def get_shield_bonus(self, offhand_name):
+        """Get the AC bonus of an off-hand item (0 unless it's a shield)."""
+        if offhand_name not in self.shields or offhand_name == "None":
+            return 0
+        
+        shield_item = self.equip_map.get(offhand_name) or self.weap_map.get(offhand_name)
+        if not shield_item:
+            return 0
+        return shield_item.get('armor_class') or 2  # Default shield bonus
+    
+    def get_item_ac_bonus(self, item_name, is_unarmored, has_shield):
+        """Get the "Shield + X AC" bonuses of one equipped item."""
+        if not item_name or item_name == "None":
+            return 0
+        
+        item = self.equip_map.get(item_name) or self.weap_map.get(item_name)
+        if not item:
+            return 0
+        
+        effects = " ".join(item.get('effects', []))
+        bonus = 0
+        
+        # Look for "Shield + X AC" bonuses
+        for m in re.findall(r"Shield \+ (\d+) AC", effects):
+            # Special case: Bracers of Defence only work when unarmored and no shield
+            if item['name'] == "Bracers of Defence":
+                if is_unarmored and not has_shield:
+                    bonus += int(m)
+            else:
+                bonus += int(m)
+        return bonus
+    
     def get_ac_breakdown(self, ac_data):
         """
         Format AC calculation breakdown as a string.
@@ -0,0 +1,195 @@
+"""Expected damage of batches of builds against a bestiary of enemy profiles."""
+import numpy as np
+
+from .spell_damage import DAMAGE_TYPES
+
+
+class Bestiary:
+    """
+    Enemy profiles as per-damage-type multiplier vectors.
+
+    Every attack is reduced to three vectors over DAMAGE_TYPES plus one
+    untyped column: average damage on a hit, extra average damage on a crit
+    and the types whose resistance it ignores. With the enemy multipliers as
+    an (enemies, types) matrix, the damage of every attack against every
+    enemy is a pair of matrix products, and hit chances are one broadcast of
+    attack bonuses against enemy AC. Multipliers apply to expected damage, so
+    per-hit rounding of halved damage is not modelled.
+    """
+
+    RESISTANT = 0.5
+    IMMUNE = 0.0
+    VULNERABLE = 2.0
+
+    def __init__(self, enemy_data):
+        """
+        Args:
+            enemy_data: List of {name, ac, resistances, immunities, vulnerabilities}
+                        with damage type names (any case)
+        """
+        self.damage_types = DAMAGE_TYPES
+        self.type_index = {name.lower(): i for i, name in enumerate(DAMAGE_TYPES)}
+        self.untyped = len(DAMAGE_TYPES)
+
+        self.names = [enemy['name'] for enemy in enemy_data]
+        self.enemy_index = {name: i for i, name in enumerate(self.names)}
+        self.ac = np.array([enemy.get('ac', 10) for enemy in enemy_data], dtype=float)
+
+        n_types = self.untyped + 1
+        self.multipliers = np.ones((len(self.names), n_types))
+        for row, enemy in enumerate(enemy_data):
+            vulnerable = self._type_mask(enemy.get('vulnerabilities', []))
+            resistant = self._type_mask(enemy.get('resistances', []))
+            # Resistance and vulnerability to the same type cancel out
+            self.multipliers[row, vulnerable & ~resistant] = self.VULNERABLE
+            self.multipliers[row, resistant & ~vulnerable] = self.RESISTANT
+            self.multipliers[row, self._type_mask(enemy.get('immunities', []))] = self.IMMUNE
+
+        # What ignoring resistance adds back to a resisted type
+        self.resistance_gap = np.where(self.multipliers == self.RESISTANT, 1 - self.RESISTANT, 0.0)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _type_mask(self, type_names):
+        """Bool vector over damage type columns."""
+        mask = np.zeros(self.untyped + 1, dtype=bool)
+        for name in type_names:
+            if name.lower() in self.type_index:
+                mask[self.type_index[name.lower()]] = True
+        return mask
+
+    def attack_vectors(self, attack):
+        """
+        Per-type damage vectors of one attack ("Weapon"/unknown types go to the untyped column).
+        Returns: (hit_damage, crit_extra, ignores_resistance) arrays over type columns
+        """
+        hit = np.zeros(self.untyped + 1)
+        crit = np.zeros(self.untyped + 1)
+        for component in attack["components"]:
+            column = self.type_index.get(component["type"].lower(), self.untyped)
+            dice_avg = component["dice_count"] * (component["dice_sides"] + 1) / 2
+            hit[column] += dice_avg + component["flat"]
+            crit[column] += dice_avg
+        return hit, crit, self._type_mask(attack.get("ignores_resistance", []))
+
+    @staticmethod
+    def turn_attacks(main_attack, offhand_attack, turn_stats, unarmed=False):
+        """
+        The attacks of one sustained turn as a build for evaluate().
+
+        Args:
+            main_attack: {"components", "to_hit"} without proficiency
+            offhand_attack: Same for the off hand, or None
+            turn_stats: (proficiency, attacks_per_action, bonus_unarmed) at the build's level
+            unarmed: Main hand is an unarmed strike (Bonus Unarmed Attack)
+
+        Returns:
+            List of attacks with proficiency added to to_hit and a count
+        """
+        if not main_attack:
+            return []
+        proficiency, attacks, bonus_unarmed = turn_stats
+        build = [dict(main_attack, to_hit=main_attack["to_hit"] + proficiency, count=attacks)]
+        if offhand_attack:
+            build.append(dict(offhand_attack, to_hit=offhand_attack["to_hit"] + proficiency, count=1))
+        elif unarmed and bonus_unarmed:
+            build.append(dict(build[0], count=bonus_unarmed))
+        return build
+
+    def encode(self, builds):
+        """
+        Stack the attacks of many builds into arrays.
+
+        Args:
+            builds: List of builds, each a list of attacks
+                    {"components", "to_hit", optional "count", optional "ignores_resistance"}
+                    with to_hit the full attack bonus (see turn_attacks)
+
+        Returns:
+            Dict of arrays over all attacks: hit, crit, ignored (attacks, types),
+            to_hit, count and build (row of the owning build); n_builds
+        """
+        rows = [
+            (b, attack) for b, build in enumerate(builds) for attack in build
+            if attack.get("count", 1)
+        ]
+        vectors = [self.attack_vectors(attack) for _, attack in rows]
+        n_types = self.untyped + 1
+        hit, crit, ignored = (
+            np.array([vector[i] for vector in vectors], dtype=float).reshape(-1, n_types)
+            for i in range(3)
+        )
+
+        return {
+            'hit': hit,
+            'crit': crit,
+            'ignored': ignored,
+            'to_hit': np.array([attack["to_hit"] for _, attack in rows], dtype=float),
+            'count': np.array([attack.get("count", 1) for _, attack in rows], dtype=float),
+            'build': np.array([b for b, _ in rows], dtype=int),
+            'n_builds': len(builds),
+        }
+
+    def evaluate_encoded(self, encoded, enemies=None, advantage=0, crit_threshold=20, per_type=False):
+        """
+        Expected damage of encoded builds against enemies.
+
+        Args:
+            encoded: Output of encode()
+            enemies: Enemy names or rows to evaluate (None for all)
+            advantage: 1 = advantage, -1 = disadvantage, 0 = straight roll
+            crit_threshold: Lowest natural roll that counts as a critical hit
+            per_type: Also return the (builds, enemies, types) breakdown
+
+        Returns:
+            Array (builds, enemies), or (matrix, breakdown) with per_type
+        """
+        rows = self._enemy_rows(enemies)
+        multipliers, gap, ac = self.multipliers[rows], self.resistance_gap[rows], self.ac[rows]
+
+        # Same hit model as TurnEngine.expected_attack_damage, for every attack/enemy pair
+        crit_threshold = min(max(crit_threshold, 2), 21)
+        lowest_hit = np.clip(ac[np.newaxis, :] - encoded['to_hit'][:, np.newaxis], 2, crit_threshold)
+        hit_chance = (21 - lowest_hit) / 20
+        crit_chance = (21 - crit_threshold) / 20
+        if advantage > 0:
+            hit_chance = 1 - (1 - hit_chance) ** 2
+            crit_chance = 1 - (1 - crit_chance) ** 2
+        elif advantage < 0:
+            hit_chance = hit_chance ** 2
+            crit_chance = crit_chance ** 2
+
+        hit, crit, ignored, count = encoded['hit'], encoded['crit'], encoded['ignored'], encoded['count']
+        n_builds = encoded['n_builds']
+
+        if not per_type:
+            # (attacks, types) @ (types, enemies); ignored resistances add their gap back
+            hit_damage = hit @ multipliers.T + (hit * ignored) @ gap.T
+            crit_damage = crit @ multipliers.T + (crit * ignored) @ gap.T
+            per_attack = count[:, np.newaxis] * (hit_chance * hit_damage + crit_chance * crit_damage)
+            matrix = np.zeros((n_builds, len(rows)))
+            np.add.at(matrix, encoded['build'], per_attack)
+            return matrix
+
+        effective = multipliers[np.newaxis, :, :] + ignored[:, np.newaxis, :] * gap[np.newaxis, :, :]
+        per_attack = count[:, np.newaxis, np.newaxis] * effective * (
+            hit_chance[:, :, np.newaxis] * hit[:, np.newaxis, :] + crit_chance * crit[:, np.newaxis, :]
+        )
+        breakdown = np.zeros((n_builds, len(rows), self.untyped + 1))
+        np.add.at(breakdown, encoded['build'], per_attack)
+        return breakdown.sum(axis=2), breakdown
+
+    def evaluate(self, builds, enemies=None, advantage=0, crit_threshold=20, per_type=False):
+        """
+        Expected damage per turn of every build against every enemy.
+        Builds are lists of attacks (see encode and turn_attacks).
+        Returns: Array (builds, enemies), see evaluate_encoded
+        """
+        return self.evaluate_encoded(self.encode(builds), enemies, advantage, crit_threshold, per_type)
+
+    def _enemy_rows(self, enemies):
+        """Enemy rows for names, indices or None (all)."""
+        if enemies is None:
+            return np.arange(len(self.names))
+        return np.array([self.enemy_index[e] if isinstance(e, str) else e for e in enemies], dtype=int)
@@ -181,7 +181,95 @@ class DamageCalculator:
         
         return "0d0", 0
     
+    def build_weapon_attack(self, item, handedness, ability_mod, equipment_components,
+                            source_name, add_ability_damage=True):
+        """
+        Build the damage components of one weapon attack.
+        Set add_ability_damage=False for off-hand attacks, which only keep a
+        negative ability modifier.
+        Returns: {"components": [...], "to_hit": ability_mod + enchantment}
+        """
+        _, enchant = self.parse_weapon_damage(item, handedness)
+        base_components = self.parse_weapon_base_components(
+            item, handedness, f"{source_name} (weapon)"
+        )
+        
+        components = list(base_components)
+        components.extend(self.parse_additional_damage_components(
+            " ".join(item.get("effects", [])), f"{source_name} (weapon effect)"
+        ))
+        components.extend(equipment_components)
+        
+        damage_mod = ability_mod if add_ability_damage else min(ability_mod, 0)
+        if damage_mod:
+            components.append({
+                "type": base_components[0]["type"] if base_components else "Weapon",
+                "dice_count": 0,
+                "dice_sides": 0,
+                "flat": damage_mod,
+                "source": "Ability modifier",
+            })
+        
+        return {"components": components, "to_hit": ability_mod + enchant,
+                "ignores_resistance": self.get_ignored_resistances(item)}
+    
+    def get_ignored_resistances(self, item):
+        """
+        Damage types whose resistance a weapon ignores, e.g. Adamantine weapons:
+        "ignores Resistance to Slashing damage" / "ignores Bludgeoning Resistance".
+        Returns: list of damage type names
+        """
+        effects_str = " ".join(item.get("effects", []))
+        pattern = r"ignores\s+(?:Resistance\s+to\s+([A-Za-z]+)|([A-Za-z]+)\s+Resistance)"
+        return [
+            (match.group(1) or match.group(2)).capitalize()
+            for match in re.finditer(pattern, effects_str, re.IGNORECASE)
+        ]
+    
+    def is_finesse(self, item):
+        """Check whether a weapon has the Finesse property (attacks with STR or DEX)."""
+        return 'finesse' in " ".join(item.get("effects", [])).lower()
+    
     def get_mean_damage(self, dice_str, flat_bonus=0, modifier=0):
         """Calculate average damage for a dice string."""
         count, sides = self._parse_dice_string(dice_str)
         return (count * (sides + 1) / 2) + flat_bonus + modifier
+    
+    def get_hit_chances(self, attack_bonus, target_ac, advantage=0, crit_threshold=20):
+        """
+        Calculate the chance for an attack roll to hit and to crit on a d20.
+        A natural 1 always misses and a roll at or above crit_threshold always
+        hits as a critical. advantage: 1 = advantage, -1 = disadvantage, 0 = none.
+        Returns: (hit_chance, crit_chance) where hit_chance includes crits
+        """
+        hit_faces = sum(
+            1 for roll in range(2, 21)
+            if roll >= crit_threshold or roll + attack_bonus >= target_ac
+        )
+        crit_faces = 21 - max(2, min(crit_threshold, 21))
+        
+        hit_chance = hit_faces / 20
+        crit_chance = crit_faces / 20
+        
+        # Hitting and critting are both "roll at least X", so the best/worst of
+        # two dice follows directly from the single-die chance
+        if advantage > 0:
+            hit_chance = 1 - (1 - hit_chance) ** 2
+            crit_chance = 1 - (1 - crit_chance) ** 2
+        elif advantage < 0:
+            hit_chance = hit_chance ** 2
+            crit_chance = crit_chance ** 2
+        
+        return hit_chance, crit_chance
+    
+    def get_expected_damage(self, components, attack_bonus, target_ac, advantage=0, crit_threshold=20):
+        """
+        Calculate expected damage of one attack from its damage components.
+        Crits double the dice and keep flat bonuses, as in calculate_damage_range.
+        """
+        hit_chance, crit_chance = self.get_hit_chances(
+            attack_bonus, target_ac, advantage, crit_threshold
+        )
+        dice_avg = sum(c["dice_count"] * (c["dice_sides"] + 1) / 2 for c in components)
+        flat = sum(c["flat"] for c in components)
+        return hit_chance * (dice_avg + flat) + crit_chance * dice_avg
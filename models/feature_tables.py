@@ -0,0 +1,191 @@
+"""Precompiled numeric class-feature modifiers per (class, subclass, level)."""
+import numpy as np
+
+from .character import Character
+
+
+def _scale(*values):
+    """Per-class-level values for levels 1..MAX_LEVEL, padded with level 0."""
+    return (0,) + values
+
+
+class FeatureTables:
+    """
+    Compiles class and subclass features into cumulative numeric modifiers.
+
+    Every (class, subclass) pair gets a prefix array of shape
+    (MAX_LEVEL + 1, column count) whose row L holds the modifiers a character
+    has with L levels in that class. Resolving any multiclass split is then one
+    lookup per class followed by a per-column reduction.
+    """
+
+    # (column, reduction across classes, value with no features)
+    COLUMNS = [
+        ('attacks_per_action', 'max', 1),
+        ('action_surges', 'sum', 0),
+        ('bonus_unarmed', 'max', 0),
+        ('sneak_attack_dice', 'sum', 0),       # d6 once per turn
+        ('smite_dice', 'max', 0),              # d8 per smite with a 1st-level slot
+        ('melee_rider_dice', 'sum', 0),        # d8 Radiant on every melee hit
+        ('crit_threshold', 'min', 20),
+        ('brutal_critical_dice', 'sum', 0),    # extra weapon dice on a crit
+        ('rage_charges', 'sum', 0),
+        ('rage_damage', 'max', 0),
+        ('ki_points', 'sum', 0),
+        ('sorcery_points', 'sum', 0),
+        ('channel_divinity', 'sum', 0),
+        ('superiority_dice', 'sum', 0),
+        ('unarmoured_con', 'max', 0),          # AC 10 + DEX + CON
+        ('unarmoured_wis', 'max', 0),          # AC 10 + DEX + WIS
+    ]
+
+    # Feature name -> {column: constant, or per-class-level scale}
+    # Scales follow the class tables, so they apply from the level the feature is gained.
+    # The Champion and Battle Master files have no level features yet, so nothing
+    # feeds crit_threshold (Improved/Superior Critical) or superiority_dice
+    # (Combat Superiority) until they are added to the data.
+    FEATURE_EFFECTS = {
+        "Extra Attack": {'attacks_per_action': 2},
+        "Improved Extra Attack": {'attacks_per_action': 3},
+        "Action Surge": {'action_surges': 1},
+        "Bonus Unarmed Attack": {'bonus_unarmed': 1},
+        "Sneak Attack": {'sneak_attack_dice': _scale(1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6)},
+        "Divine Smite": {'smite_dice': 2},
+        "Improved Divine Smite": {'melee_rider_dice': 1},
+        "Brutal Critical": {'brutal_critical_dice': 1},
+        "Rage": {
+            'rage_charges': _scale(2, 2, 3, 3, 3, 4, 4, 4, 4, 4, 4, 5),
+            'rage_damage': _scale(2, 2, 2, 2, 2, 2, 2, 2, 3, 3, 3, 3),
+        },
+        "Flurry of Blows": {'ki_points': _scale(2, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12)},
+        "Create Sorcery Points": {'sorcery_points': _scale(0, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12)},
+        "Turn Undead": {'channel_divinity': _scale(0, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2)},
+        "Unarmoured Defence (Barbarian)": {'unarmoured_con': 1},
+        "Unarmoured Defence (Monk)": {'unarmoured_wis': 1},
+    }
+
+    def __init__(self, features_loader, compiled=None):
+        """
+        Compile tables for every class and subclass known to a ClassFeaturesLoader.
+        compiled: (keys, values) of an earlier compile (e.g. from a DataBundle) to reuse
+        """
+        self.features_loader = features_loader
+
+        self.column_names = [name for name, _, _ in self.COLUMNS]
+        self.column_index = {name: i for i, name in enumerate(self.column_names)}
+        self.defaults = np.array([default for _, _, default in self.COLUMNS], dtype=np.int64)
+        self._sum_cols = [i for i, (_, rule, _) in enumerate(self.COLUMNS) if rule == 'sum']
+        self._max_cols = [i for i, (_, rule, _) in enumerate(self.COLUMNS) if rule == 'max']
+        self._min_cols = [i for i, (_, rule, _) in enumerate(self.COLUMNS) if rule == 'min']
+
+        if compiled is not None:
+            keys, self.values = compiled
+            self.keys = list(keys)
+            self.key_index = {key: i for i, key in enumerate(self.keys)}
+            return
+
+        # Key 0 is the empty slot: defaults at every level
+        self.keys = [("", "")]
+        self.key_index = {("", ""): 0}
+        tables = [np.tile(self.defaults, (Character.MAX_LEVEL + 1, 1))]
+
+        for class_name in features_loader.get_available_classes():
+            for subclass_name in [""] + features_loader.get_subclass_options(class_name):
+                self.key_index[(class_name, subclass_name)] = len(self.keys)
+                self.keys.append((class_name, subclass_name))
+                tables.append(self._compile(class_name, subclass_name))
+
+        self.values = np.stack(tables)  # (keys, MAX_LEVEL + 1, columns)
+
+    def _compile(self, class_name, subclass_name):
+        """Build the prefix array for one class/subclass pair."""
+        table = np.tile(self.defaults, (Character.MAX_LEVEL + 1, 1))
+
+        features_by_level = self.features_loader.get_all_features_for_level_range(
+            class_name, 1, Character.MAX_LEVEL, subclass_name or None
+        )
+        for level, features in sorted(features_by_level.items()):
+            for feature in features:
+                effects = self.FEATURE_EFFECTS.get(feature.get("name"), {})
+                for column, value in effects.items():
+                    col = self.column_index[column]
+                    if isinstance(value, tuple):
+                        value = np.array(value[level:], dtype=np.int64)
+                    self._apply(table[level:, col], value, col)
+
+        return table
+
+    def _apply(self, target, value, col):
+        """Combine a feature value into a column slice in place."""
+        if col in self._min_cols:
+            np.minimum(target, value, out=target)
+        elif col in self._max_cols:
+            np.maximum(target, value, out=target)
+        else:
+            target += value
+
+    def get_key(self, class_name, subclass_name=None):
+        """Get the table key for a class/subclass, falling back to the base class."""
+        class_key = class_name.lower()
+        subclass_key = (subclass_name or "").lower()
+        index = self.key_index.get((class_key, subclass_key))
+        if index is None:
+            index = self.key_index.get((class_key, ""), 0)
+        return index
+
+    def combine(self, rows):
+        """
+        Reduce gathered per-class rows into per-build modifiers.
+        rows: array shaped (..., classes, columns); returns (..., columns)
+        """
+        result = np.empty(rows.shape[:-2] + rows.shape[-1:], dtype=np.int64)
+        result[..., self._sum_cols] = rows[..., self._sum_cols].sum(axis=-2)
+        result[..., self._max_cols] = rows[..., self._max_cols].max(axis=-2)
+        result[..., self._min_cols] = rows[..., self._min_cols].min(axis=-2)
+        return result
+
+    def resolve_batch(self, keys, levels):
+        """
+        Resolve many builds at once.
+
+        Args:
+            keys: Int array (builds, classes) of table keys (0 for empty slots)
+            levels: Int array (builds, classes) of levels in each class
+
+        Returns:
+            Int array (builds, columns) of combined modifiers
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        levels = np.clip(np.asarray(levels, dtype=np.int64), 0, Character.MAX_LEVEL)
+        return self.combine(self.values[keys, levels])
+
+    def resolve(self, character_levels, character_subclasses=None):
+        """
+        Resolve the modifiers of one multiclass split.
+        Returns: dict of column -> value
+        """
+        character_subclasses = character_subclasses or {}
+        keys = [self.get_key(c, character_subclasses.get(c)) for c in character_levels] or [0]
+        levels = list(character_levels.values()) or [0]
+        row = self.resolve_batch([keys], [levels])[0]
+        return dict(zip(self.column_names, row.tolist()))
+
+    def resolve_progression(self, class_sequence, subclasses=None):
+        """
+        Resolve modifiers at every character level of a level-up order.
+        Returns: int array (len(class_sequence), columns)
+        """
+        subclasses = {name.lower(): sub for name, sub in (subclasses or {}).items()}
+        sequence = [c.lower() for c in class_sequence]
+        classes = sorted(set(sequence))
+        if not classes:
+            return self.defaults[np.newaxis, :].copy()
+
+        keys = np.array([self.get_key(c, subclasses.get(c)) for c in classes])
+        # Class level reached in each class at each character level
+        levels = np.cumsum(np.array(sequence)[:, np.newaxis] == np.array(classes), axis=0)
+        return self.resolve_batch(np.broadcast_to(keys, levels.shape), levels)
+
+    def column(self, resolved, name):
+        """Get one named column from a resolved array."""
+        return resolved[..., self.column_index[name]]
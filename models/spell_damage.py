@@ -0,0 +1,352 @@
+"""Structured spell damage compiled from spell prose into per-slot-level tables."""
+import re
+
+import numpy as np
+
+
+DAMAGE_TYPES = (
+    'Acid', 'Bludgeoning', 'Cold', 'Fire', 'Force', 'Lightning', 'Necrotic',
+    'Piercing', 'Poison', 'Psychic', 'Radiant', 'Slashing', 'Thunder',
+)
+
+_TYPE = r"(?:\s+(" + "|".join(DAMAGE_TYPES) + r")\b)?"
+# "2d6 Fire", "1d8+2 Bludgeoning", "10d6+40 Force"
+_DICE = re.compile(r"(\d+)d(\d+)(?:\s*\+\s*(\d+)(?!\s*d))?" + _TYPE)
+# "3 x (2d4+1) Force", "3 x 2d6 Fire"
+_MULTI = re.compile(r"(\d+)\s*x\s*\(?\s*(\d+)d(\d+)(?:\s*\+\s*(\d+))?\s*\)?" + _TYPE)
+# "+1 dart (2d4+1 Force)", "+1 ray (2d6 Fire)"
+_REPEAT = re.compile(r"\+(\d+)\s+\w+\s*\(\s*(\d+)d(\d+)(?:\s*\+\s*(\d+))?" + _TYPE + r"\s*\)")
+# Flat damage without dice: "5 Cold", "20 Radiant", "+1 damage"
+_FLAT = re.compile(r"\+?\b(\d+)\s+(?:(" + "|".join(DAMAGE_TYPES) + r")\b|damage\b)")
+_STEP = re.compile(r"per\s+(\d+)\s+levels")
+_CLAUSE = re.compile(r"\.\s|[,;]")
+
+_VARIES = re.compile(r"\bvar(?:y|ies)\b", re.IGNORECASE)
+_WEAPON_RIDER = re.compile(r"\bweapon\s+(?:damage|attacks?|deals)\b", re.IGNORECASE)
+# "Initial: 4d4 Acid. Delayed: 2d4 Acid": damage that lands later without another action
+_DELAYED = re.compile(r"\bDelayed:\s*([^.;]*)", re.IGNORECASE)
+_BOTH = re.compile(r"\bboth initial and delayed\b", re.IGNORECASE)
+
+# Damaging spells that hit every creature in an area (or several targets per
+# cast). The prose can't tell these apart reliably: "any creature that hits
+# you" is not an area, and Cone of Cold never says "area". Spell records can
+# override with an "aoe" field.
+AOE_SPELLS = frozenset({
+    'Acid Splash', 'Arms of Hadar', 'Blade Barrier', 'Burning Hands', 'Call Lightning',
+    'Chain Lightning', 'Circle of Death', 'Cloud of Daggers', 'Cloudkill', 'Cone of Cold',
+    'Conjure Barrage', "Crusader's Mantle", 'Destructive Wave', 'Fireball', 'Flame Strike',
+    'Flaming Sphere', 'Glyph of Warding', 'Guardian of Faith', 'Hail of Thorns',
+    'Hunger of Hadar', 'Ice Knife', 'Ice Storm', 'Insect Plague', 'Lightning Arrow',
+    'Lightning Bolt', 'Moonbeam', "Otiluke's Freezing Sphere", 'Shatter', 'Spike Growth',
+    'Spirit Guardians', 'Sunbeam', 'Thunderwave', 'Wall of Fire', 'Wall of Ice',
+    'Wall of Thorns',
+})
+
+
+def _component(dmg_type, dice_count, dice_sides, flat, source):
+    """Build a damage component dict in the shared format."""
+    return {
+        "type": dmg_type,
+        "dice_count": dice_count,
+        "dice_sides": dice_sides,
+        "flat": flat,
+        "source": source,
+    }
+
+
+class SpellDamageModel:
+    """
+    Compiles the damage prose of every spell into structured components.
+
+    Each spell is parsed once into base components and per-upcast components.
+    Average, minimum and maximum damage at every slot level are then stored
+    in (spells, MAX_SLOT_LEVEL + 1) arrays, so ranking all spells for a set
+    of spell slots is a single masked reduction. Column 0 holds cantrips,
+    which are cast without a slot.
+
+    Damage that lands later from the same cast ("Delayed: 2d4 Acid") counts
+    toward it; follow-ups that take further turns or actions ("Subsequent:",
+    "per turn") count only their first hit.
+    """
+
+    MAX_SLOT_LEVEL = 6
+
+    def __init__(self, features_loader):
+        """Parse the spells of a ClassFeaturesLoader and build the damage tables."""
+        self.features_loader = features_loader
+        self.spells = features_loader.spells
+
+        self.names = [spell.get("name", "") for spell in self.spells]
+        self.index = {name.lower(): i for i, name in enumerate(self.names)}
+        self.levels = np.array([spell.get("level", 0) for spell in self.spells], dtype=np.int64)
+
+        self.base_components = []
+        self.upcast_components = []
+        upcast_steps = []
+        for spell in self.spells:
+            base = self._parse_base(spell)
+            upcast, step = self._parse_upcast(spell, base)
+            self.base_components.append(base)
+            self.upcast_components.append(upcast)
+            upcast_steps.append(step)
+        self.upcast_steps = np.array(upcast_steps, dtype=np.int64)
+
+        self.damaging = np.array([bool(base) for base in self.base_components])
+        self.aoe = np.array([self._is_aoe(spell) for spell in self.spells], dtype=bool)
+        self.concentration = np.array(
+            [bool(spell.get("need_concentration")) for spell in self.spells], dtype=bool
+        )
+        self.weapon_rider = np.array(
+            [self._is_weapon_rider(spell) for spell in self.spells], dtype=bool
+        )
+        self.summon = np.array([bool(spell.get("summon")) for spell in self.spells], dtype=bool)
+
+        self._build_tables()
+
+    # --- Parsing ---
+
+    @staticmethod
+    def _fallback_type(spell):
+        """Damage type for dice the prose leaves untyped."""
+        if spell.get("damage-type", "").strip() == "Weapon" or "same type as weapon" in spell.get("damage", ""):
+            return "Weapon"
+        for dmg_type in re.split(r"[/,]", spell.get("damage-type", "")):
+            if dmg_type.strip() in DAMAGE_TYPES:
+                return dmg_type.strip()
+        return "Unspecified"
+
+    def _parse_base(self, spell):
+        """
+        Parse the damage of a spell cast at its own level.
+        Returns: list of damage components (empty when the prose has no fixed damage)
+        """
+        text = spell.get("damage", "") or ""
+        # "Varies by summon" has no fixed damage; "1d8+2 Force (varies by weapon type)" does
+        if not text or _VARIES.search(re.sub(r"\([^)]*\)", "", text)):
+            return []
+
+        name = spell.get("name", "")
+        fallback = self._fallback_type(spell)
+        components = []
+
+        delayed = _DELAYED.search(text)
+        if delayed:
+            text = text[:delayed.start()]
+        text = re.sub(r"^\s*Initial:\s*", "", text, flags=re.IGNORECASE)
+
+        # Repeated projectiles first, since they sit inside parentheses
+        for count, dice, sides, flat, dmg_type in _MULTI.findall(text):
+            count = int(count)
+            components.append(_component(
+                dmg_type or fallback, count * int(dice), int(sides), count * int(flat or 0), name
+            ))
+        text = _MULTI.sub("", text)
+
+        # Asides like "(Dex Save for half)" or "(10-60)"; the first clause is the hit itself
+        text = re.sub(r"\([^)]*\)", "", text)
+        text = _CLAUSE.split(text)[0]
+
+        for dice, sides, flat, dmg_type in _DICE.findall(text):
+            components.append(_component(dmg_type or fallback, int(dice), int(sides), int(flat or 0), name))
+        text = _DICE.sub("", text)
+
+        for flat, dmg_type in _FLAT.findall(text):
+            components.append(_component(dmg_type or fallback, 0, 0, int(flat), name))
+
+        if delayed:
+            for dice, sides, flat, dmg_type in _DICE.findall(delayed.group(1)):
+                components.append(_component(
+                    dmg_type or fallback, int(dice), int(sides), int(flat or 0), f"{name} (delayed)"
+                ))
+
+        return components
+
+    def _parse_upcast(self, spell, base):
+        """
+        Parse the damage added per upcast step.
+        Returns: (components, step) where step is the slot levels per increase
+        """
+        text = spell.get("upcast-damage", "") or ""
+        if not base or not text:
+            return [], 1
+
+        step = _STEP.search(text)
+        step = int(step.group(1)) if step else 1
+        source = f"{spell.get('name', '')} (upcast)"
+        fallback = base[0]["type"]
+        components = []
+
+        for count, dice, sides, flat, dmg_type in _REPEAT.findall(text):
+            count = int(count)
+            components.append(_component(
+                dmg_type or fallback, count * int(dice), int(sides), count * int(flat or 0), source
+            ))
+        text = re.sub(r"\([^)]*\)", "", _REPEAT.sub("", text))
+
+        for dice, sides, flat, dmg_type in _DICE.findall(text):
+            components.append(_component(dmg_type or fallback, int(dice), int(sides), int(flat or 0), source))
+
+        # "+1d4 Acid per level (both initial and delayed)" adds the dice twice
+        if _BOTH.search(spell.get("upcast-damage", "")):
+            components += [dict(c, source=f"{c['source'][:-1]}, delayed)") for c in components]
+
+        return components, step
+
+    @staticmethod
+    def _is_aoe(spell):
+        """Check whether a spell hits an area rather than one target."""
+        if "aoe" in spell:
+            return bool(spell["aoe"])
+        return spell.get("name", "") in AOE_SPELLS
+
+    @staticmethod
+    def _is_weapon_rider(spell):
+        """Check whether a spell adds its damage to a weapon attack."""
+        return bool(
+            _WEAPON_RIDER.search(spell.get("damage", "") or "")
+            or spell.get("damage-type", "").strip() == "Weapon"
+        )
+
+    # --- Tables ---
+
+    @staticmethod
+    def _totals(components):
+        """Average, minimum and maximum of a list of components."""
+        average = sum(c["dice_count"] * (c["dice_sides"] + 1) / 2 + c["flat"] for c in components)
+        minimum = sum(c["dice_count"] + c["flat"] for c in components)
+        maximum = sum(c["dice_count"] * c["dice_sides"] + c["flat"] for c in components)
+        return average, minimum, maximum
+
+    def _build_tables(self):
+        """Build the (spells, slot level) castable mask and damage tables."""
+        base = np.array([self._totals(c) for c in self.base_components], dtype=float).reshape(-1, 3)
+        upcast = np.array([self._totals(c) for c in self.upcast_components], dtype=float).reshape(-1, 3)
+
+        slot_levels = np.arange(self.MAX_SLOT_LEVEL + 1)
+        levels = self.levels[:, np.newaxis]
+
+        # Cantrips use column 0 only; leveled spells every slot from their level up
+        self.castable = np.where(levels == 0, slot_levels == 0, (slot_levels >= levels) & (slot_levels > 0))
+        self.castable &= self.damaging[:, np.newaxis]
+
+        steps = np.maximum(slot_levels - levels, 0) // self.upcast_steps[:, np.newaxis]
+        self.average = np.where(self.castable, base[:, [0]] + steps * upcast[:, [0]], 0.0)
+        self.minimum = np.where(self.castable, base[:, [1]] + steps * upcast[:, [1]], 0).astype(np.int64)
+        self.maximum = np.where(self.castable, base[:, [2]] + steps * upcast[:, [2]], 0).astype(np.int64)
+
+        for table in (self.castable, self.average, self.minimum, self.maximum):
+            table.flags.writeable = False
+
+    # --- Queries ---
+
+    def get_spell_index(self, spell_name):
+        """Get the table row of a spell by name, or None."""
+        return self.index.get(spell_name.lower())
+
+    def get_components(self, spell_name, slot_level=None):
+        """
+        Get the damage components of a spell cast at a slot level.
+
+        Args:
+            spell_name: Name of the spell
+            slot_level: Slot level of the cast (defaults to the spell's own level)
+
+        Returns:
+            List of damage components, empty if the spell deals no fixed damage
+            or can't be cast at that level
+        """
+        row = self.get_spell_index(spell_name)
+        if row is None:
+            return []
+
+        level = int(self.levels[row])
+        slot_level = level if slot_level is None else slot_level
+        if not 0 <= slot_level <= self.MAX_SLOT_LEVEL or not self.castable[row, slot_level]:
+            return []
+
+        components = [dict(c) for c in self.base_components[row]]
+        steps = (slot_level - level) // int(self.upcast_steps[row]) if level else 0
+        for comp in self.upcast_components[row]:
+            if steps > 0:
+                components.append(_component(
+                    comp["type"], comp["dice_count"] * steps, comp["dice_sides"],
+                    comp["flat"] * steps, comp["source"]
+                ))
+        return components
+
+    def get_cast_table(self, weapon_damage=0.0, aoe_targets=1):
+        """
+        Expected damage per cast of every spell at every slot level.
+
+        Args:
+            weapon_damage: Average weapon hit added to weapon-rider spells
+            aoe_targets: Number of targets hit by area spells
+
+        Returns:
+            Float array (spells, MAX_SLOT_LEVEL + 1), -inf where a spell can't be cast
+        """
+        per_cast = self.average + np.where(self.weapon_rider, weapon_damage, 0.0)[:, np.newaxis]
+        per_cast = per_cast * np.where(self.aoe, max(aoe_targets, 1), 1)[:, np.newaxis]
+        return np.where(self.castable, per_cast, -np.inf)
+
+    def get_expected_damage(self, spell_slots, weapon_damage=0.0, aoe_targets=1):
+        """
+        Best expected damage per cast of every spell for a set of spell slots.
+
+        Args:
+            spell_slots: Dict of spell level -> slot count (as from get_all_spell_slots)
+            weapon_damage: Average weapon hit added to weapon-rider spells
+            aoe_targets: Number of targets hit by area spells
+
+        Returns:
+            (damage, slot_level) arrays over all spells; damage is -inf for
+            spells that can't be cast with these slots
+        """
+        available = np.zeros(self.MAX_SLOT_LEVEL + 1, dtype=bool)
+        available[0] = True
+        for level, count in spell_slots.items():
+            if count > 0 and 1 <= int(level) <= self.MAX_SLOT_LEVEL:
+                available[int(level)] = True
+
+        per_cast = np.where(available, self.get_cast_table(weapon_damage, aoe_targets), -np.inf)
+
+        # Slot levels hold non-decreasing damage, so the last max is the highest useful slot
+        slot_level = self.MAX_SLOT_LEVEL - np.argmax(per_cast[:, ::-1], axis=1)
+        return per_cast.max(axis=1), slot_level
+
+    def rank_spells(self, spell_slots, weapon_damage=0.0, aoe_targets=1,
+                    include_concentration=True, limit=None):
+        """
+        Rank castable damaging spells by expected damage per cast.
+
+        Args:
+            spell_slots: Dict of spell level -> slot count
+            weapon_damage: Average weapon hit added to weapon-rider spells
+            aoe_targets: Number of targets hit by area spells
+            include_concentration: Include spells that need concentration
+            limit: Maximum number of results (None for all)
+
+        Returns:
+            List of dicts with name, level, slot_level, expected_damage, aoe,
+            concentration and weapon_rider, best first
+        """
+        damage, slot_level = self.get_expected_damage(spell_slots, weapon_damage, aoe_targets)
+        keep = np.isfinite(damage)
+        if not include_concentration:
+            keep &= ~self.concentration
+
+        rows = np.flatnonzero(keep)
+        rows = rows[np.argsort(-damage[rows], kind="stable")][:limit]
+
+        return [
+            {
+                'name': self.names[row],
+                'level': int(self.levels[row]),
+                'slot_level': int(slot_level[row]),
+                'expected_damage': float(damage[row]),
+                'aoe': bool(self.aoe[row]),
+                'concentration': bool(self.concentration[row]),
+                'weapon_rider': bool(self.weapon_rider[row]),
+            }
+            for row in rows
+        ]
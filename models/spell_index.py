@@ -0,0 +1,219 @@
+"""Bitset indexes for filtering spells and finding the spells a build can cast."""
+import re
+
+from .character import Character
+from .spell_damage import DAMAGE_TYPES
+
+
+class SpellIndex:
+    """
+    Indexes spells as integer bitsets for fast filtering.
+
+    Every spell gets one bit, assigned in (level, name) order, so decoding a
+    bitset yields an already sorted list and "level L or lower" is a single
+    prefix mask. Each filter (school, level, concentration, summon, upcastable,
+    damage type) and each class's spell list per class level is precomputed
+    as a bitset, so a query is a handful of integer ANDs and ORs.
+    """
+
+    def __init__(self, features_loader, spell_slot_calc=None):
+        """
+        Build indexes from a ClassFeaturesLoader.
+
+        Args:
+            features_loader: ClassFeaturesLoader with spells and class data
+            spell_slot_calc: SpellSlotCalculator used to limit builds to castable
+                             spell levels (no slot limit when None)
+        """
+        self.features_loader = features_loader
+        self.spell_slot_calc = spell_slot_calc
+
+        self.spells = sorted(
+            features_loader.spells, key=lambda s: (s.get("level", 0), s.get("name", ""))
+        )
+        self.names = [spell.get("name", "") for spell in self.spells]
+        self.bit_index = {name.lower(): i for i, name in enumerate(self.names)}
+        self.all_bits = (1 << len(self.spells)) - 1
+
+        self.by_school = {}
+        self.by_level = {}
+        self.by_damage_type = {}
+        self.concentration_bits = 0
+        self.summon_bits = 0
+        self.upcastable_bits = 0
+
+        for i, spell in enumerate(self.spells):
+            bit = 1 << i
+            school = spell.get("school", "")
+            level = spell.get("level", 0)
+            self.by_school[school] = self.by_school.get(school, 0) | bit
+            self.by_level[level] = self.by_level.get(level, 0) | bit
+            for dmg_type in self._damage_types(spell):
+                self.by_damage_type[dmg_type] = self.by_damage_type.get(dmg_type, 0) | bit
+            if spell.get("need_concentration"):
+                self.concentration_bits |= bit
+            if spell.get("summon"):
+                self.summon_bits |= bit
+            if spell.get("upcastable"):
+                self.upcastable_bits |= bit
+
+        # Spells of level L or lower: bits are level-ordered, so a prefix mask
+        self.max_spell_level = max(self.by_level, default=0)
+        self.up_to_level = []
+        count = 0
+        for level in range(self.max_spell_level + 1):
+            count += bin(self.by_level.get(level, 0)).count("1")
+            self.up_to_level.append((1 << count) - 1)
+
+        # {class or subclass: [bits unlocked by class level 0..MAX_LEVEL]}
+        self.class_unlocks = {
+            name: self._compile_unlocks(data) for name, data in features_loader.classes.items()
+        }
+        self.subclass_unlocks = {
+            name: self._compile_unlocks(data) for name, data in features_loader.subclasses.items()
+        }
+
+        # Highest castable spell level per ESL
+        self.max_level_by_esl = None
+        if spell_slot_calc is not None:
+            self.max_level_by_esl = [
+                max([0] + [level for level, count in enumerate(row.tolist()) if level and count])
+                for row in spell_slot_calc.slot_table
+            ]
+
+        self._available_cache = {}
+
+    @staticmethod
+    def _damage_types(spell):
+        """Damage types named in a spell's damage-type field."""
+        words = re.findall(r"[A-Za-z]+", spell.get("damage-type", "") or "")
+        return {word for word in words if word in DAMAGE_TYPES or word == "Weapon"}
+
+    def _compile_unlocks(self, data):
+        """Build cumulative spell list bitsets per class level for one class or subclass."""
+        unlocks = [0] * (Character.MAX_LEVEL + 1)
+        for level_key, entries in (data.get("levels") or {}).items():
+            level = int(level_key)
+            if not 1 <= level <= Character.MAX_LEVEL:
+                continue
+            for entry in entries:
+                for name in entry.get("available_spells", []) + entry.get("available_cantrips", []):
+                    index = self.bit_index.get(name.lower())
+                    if index is not None:
+                        unlocks[level] |= 1 << index
+
+        for level in range(1, Character.MAX_LEVEL + 1):
+            unlocks[level] |= unlocks[level - 1]
+        return unlocks
+
+    # --- Filtering ---
+
+    def _union(self, index, keys):
+        """OR together the bitsets of several keys of one index."""
+        bits = 0
+        for key in keys:
+            bits |= index.get(key, 0)
+        return bits
+
+    def _flag(self, bits, flag_bits, wanted):
+        """Keep spells with (True) or without (False) a flag; None keeps all."""
+        if wanted is None:
+            return bits
+        return bits & flag_bits if wanted else bits & ~flag_bits
+
+    def query(self, bits=None, schools=None, levels=None, max_level=None, concentration=None,
+              summon=None, upcastable=None, damage_types=None):
+        """
+        Filter spells into a bitset.
+
+        Args:
+            bits: Bitset to filter (all spells when None)
+            schools: Schools to keep, e.g. ["Evocation"]
+            levels: Spell levels to keep, e.g. [0, 3]
+            max_level: Highest spell level to keep
+            concentration: True/False to keep only spells with/without concentration
+            summon: True/False to keep only summons / non-summons
+            upcastable: True/False to keep only upcastable / fixed-level spells
+            damage_types: Damage types to keep, e.g. ["Fire", "Cold"]
+
+        Returns:
+            Bitset of the matching spells
+        """
+        bits = self.all_bits if bits is None else bits
+        if schools is not None:
+            bits &= self._union(self.by_school, schools)
+        if levels is not None:
+            bits &= self._union(self.by_level, levels)
+        if max_level is not None:
+            bits &= self.up_to_level[min(max_level, self.max_spell_level)] if max_level >= 0 else 0
+        if damage_types is not None:
+            bits &= self._union(self.by_damage_type, damage_types)
+        bits = self._flag(bits, self.concentration_bits, concentration)
+        bits = self._flag(bits, self.summon_bits, summon)
+        bits = self._flag(bits, self.upcastable_bits, upcastable)
+        return bits
+
+    def get_available_bits(self, character_levels, character_subclasses=None):
+        """
+        Bitset of spells a multiclass build can learn and cast, memoized per build.
+
+        Class spell lists are unlocked by class level, then limited to spell
+        levels the build has slots for (cantrips are always kept).
+        """
+        character_subclasses = character_subclasses or {}
+        key = (
+            tuple(sorted((c.lower(), level) for c, level in character_levels.items() if level)),
+            tuple(sorted((c.lower(), s.lower()) for c, s in character_subclasses.items() if s)),
+        )
+        cached = self._available_cache.get(key)
+        if cached is not None:
+            return cached
+
+        bits = 0
+        subclasses = dict(key[1])
+        for class_name, level in key[0]:
+            level = min(level, Character.MAX_LEVEL)
+            bits |= self.class_unlocks.get(class_name, [0] * (level + 1))[level]
+            subclass = subclasses.get(class_name)
+            if subclass in self.subclass_unlocks:
+                bits |= self.subclass_unlocks[subclass][level]
+
+        if self.max_level_by_esl is not None:
+            esl = self.spell_slot_calc.calculate_effective_spell_level(character_levels, character_subclasses)
+            bits &= self.up_to_level[min(self.max_level_by_esl[esl], self.max_spell_level)]
+
+        return self._available_cache.setdefault(key, bits)
+
+    def get_available_spells(self, character_levels, character_subclasses=None, **filters):
+        """Names of spells a build can cast, filtered with query() arguments, sorted by level."""
+        bits = self.get_available_bits(character_levels, character_subclasses)
+        return self.get_names(self.query(bits, **filters))
+
+    # --- Decoding ---
+
+    def get_names(self, bits):
+        """Decode a bitset into spell names, sorted by level then name."""
+        names = []
+        while bits:
+            low = bits & -bits
+            names.append(self.names[low.bit_length() - 1])
+            bits ^= low
+        return names
+
+    def group_by_level(self, bits):
+        """Decode a bitset into {spell level: [names]}."""
+        grouped = {}
+        for level, level_bits in sorted(self.by_level.items()):
+            names = self.get_names(bits & level_bits)
+            if names:
+                grouped[level] = names
+        return grouped
+
+    def get_spell(self, spell_name):
+        """Get a spell dict by name, or None."""
+        index = self.bit_index.get(spell_name.lower())
+        return self.spells[index] if index is not None else None
+
+    def count(self, bits):
+        """Number of spells in a bitset."""
+        return bin(bits).count("1")
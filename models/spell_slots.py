@@ -1,4 +1,5 @@
 """Spell slot calculation and management."""
+import numpy as np
 
 
 class SpellSlotCalculator:
@@ -9,41 +10,95 @@ class SpellSlotCalculator:
     HALF_CASTERS = {'paladin', 'ranger'}
     ONE_THIRD_CASTERS = {'eldritch knight', 'arcane trickster'}
     
+    # ESL contribution per level, in sixths so the sum stays exact
+    CASTER_SIXTHS = {'full': 6, 'half': 3, 'one_third': 2}
+    
+    MAX_ESL = 20
+    MAX_CLASS_LEVEL = 12
+    
     def __init__(self, spell_slot_data):
         """Initialize with spell slot progression data."""
         self.spell_slot_data = spell_slot_data
         self.progression_table = spell_slot_data['progression_tables']['full_casters']
+        
+        # Caster type lookups: lowercase name -> type (missing = not a caster),
+        # plus a cache of raw names as they are passed in
+        self.caster_type_map = {}
+        for names, caster_type in ((self.FULL_CASTERS, 'full'),
+                                   (self.HALF_CASTERS, 'half'),
+                                   (self.ONE_THIRD_CASTERS, 'one_third')):
+            for name in names:
+                self.caster_type_map[name] = caster_type
+        self._class_type_cache = {}
+        self._subclass_type_cache = {}
+        
+        self.max_spell_level = max(
+            [6] + [int(level) for entry in self.progression_table for level in entry['slots']]
+        )
+        self.slot_table = self._build_slot_table()
+        self.slot_lattice = self._build_slot_lattice()
+    
+    def _build_slot_table(self):
+        """
+        Build a dense (ESL, spell level) table of slot counts for ESL 0..MAX_ESL.
+        Column 0 is unused so spell levels index directly.
+        """
+        table = np.zeros((self.MAX_ESL + 1, self.max_spell_level + 1), dtype=np.int64)
+        by_level = {entry['level']: entry['slots'] for entry in self.progression_table}
+        
+        for esl in range(1, self.MAX_ESL + 1):
+            slots = by_level.get(esl)
+            # ESL past the table uses its last entry
+            if slots is None and esl > 12:
+                slots = self.progression_table[-1]['slots']
+            for spell_level, count in (slots or {}).items():
+                table[esl, int(spell_level)] = count
+        
+        table.flags.writeable = False
+        return table
+    
+    def _build_slot_lattice(self):
+        """
+        Build slot vectors for every (full, half, one-third) caster level triple.
+        Returns: array shaped (13, 13, 13, max_spell_level + 1); only triples
+        summing to at most MAX_CLASS_LEVEL are reachable.
+        """
+        levels = np.arange(self.MAX_CLASS_LEVEL + 1)
+        full, half, third = np.meshgrid(levels, levels, levels, indexing='ij')
+        esl = self._esl_from_sixths(
+            full * self.CASTER_SIXTHS['full']
+            + half * self.CASTER_SIXTHS['half']
+            + third * self.CASTER_SIXTHS['one_third']
+        )
+        lattice = self.slot_table[esl]
+        lattice.flags.writeable = False
+        return lattice
+    
+    def _esl_from_sixths(self, sixths):
+        """Convert summed caster sixths into ESL (works on arrays)."""
+        return np.minimum(sixths // 6, self.MAX_ESL)
     
     def get_caster_type(self, class_name):
         """Returns 'full', 'half', 'one_third', or None if not a caster."""
-        class_lower = class_name.lower()
-        if class_lower in self.FULL_CASTERS:
-            return 'full'
-        elif class_lower in self.HALF_CASTERS:
-            return 'half'
-        elif class_lower in self.ONE_THIRD_CASTERS:
-            return 'one_third'
-        return None
+        try:
+            return self._class_type_cache[class_name]
+        except KeyError:
+            return self._class_type_cache.setdefault(class_name, self.caster_type_map.get(class_name.lower()))
     
     def get_subclass_caster_type(self, subclass_name):
         """Returns caster type for subclasses like 'eldritch_knight' or 'arcane_trickster'."""
-        subclass_lower = subclass_name.lower().replace('_', ' ')
-        if subclass_lower in self.FULL_CASTERS:
-            return 'full'
-        elif subclass_lower in self.HALF_CASTERS:
-            return 'half'
-        elif subclass_lower in self.ONE_THIRD_CASTERS:
-            return 'one_third'
-        return None
+        try:
+            return self._subclass_type_cache[subclass_name]
+        except KeyError:
+            subclass_lower = subclass_name.lower().replace('_', ' ')
+            return self._subclass_type_cache.setdefault(subclass_name, self.caster_type_map.get(subclass_lower))
     
-    def calculate_effective_spell_level(self, character_levels, character_subclasses):
+    def get_caster_levels(self, character_levels, character_subclasses):
         """
-        Calculate total Effective Spell Level (ESL) from multiclass levels.
-        Formula: ESL = floor(full_levels/1 + half_levels/2 + one_third_levels/3)
-        
-        Returns the ESL capped at 20 (max D&D level).
+        Sum class levels by caster type.
+        Returns: (full_levels, half_levels, one_third_levels)
         """
-        esl = 0.0
+        totals = {'full': 0, 'half': 0, 'one_third': 0}
         
         for class_name, level in character_levels.items():
             caster_type = self.get_caster_type(class_name)
@@ -52,63 +107,48 @@ class SpellSlotCalculator:
             if caster_type:
                 subclass_name = character_subclasses.get(class_name)
                 if subclass_name:
-                    subclass_type = self.get_subclass_caster_type(subclass_name)
-                    if subclass_type:
-                        caster_type = subclass_type
-            
-            if caster_type == 'full':
-                esl += level / 1
-            elif caster_type == 'half':
-                esl += level / 2
-            elif caster_type == 'one_third':
-                esl += level / 3
+                    caster_type = self.get_subclass_caster_type(subclass_name) or caster_type
+                totals[caster_type] += level
         
-        return min(int(esl), 20)
+        return totals['full'], totals['half'], totals['one_third']
+    
+    def calculate_effective_spell_level(self, character_levels, character_subclasses):
+        """
+        Calculate total Effective Spell Level (ESL) from multiclass levels.
+        Formula: ESL = floor(full_levels/1 + half_levels/2 + one_third_levels/3)
+        
+        Returns the ESL capped at 20 (max D&D level).
+        """
+        full, half, one_third = self.get_caster_levels(character_levels, character_subclasses)
+        sixths = (full * self.CASTER_SIXTHS['full']
+                  + half * self.CASTER_SIXTHS['half']
+                  + one_third * self.CASTER_SIXTHS['one_third'])
+        return int(self._esl_from_sixths(sixths))
     
     def get_spell_slots_for_level(self, esl, spell_level):
         """
         Get the number of spell slots for a given spell level (1-6+).
         Returns the slot count based on ESL, or 0 if ESL is not high enough.
         """
-        if esl == 0:
+        if esl <= 0 or not 1 <= spell_level <= self.max_spell_level:
             return 0
-        
-        # Find the entry in progression table
-        for entry in self.progression_table:
-            if entry['level'] == esl:
-                return entry['slots'].get(str(spell_level), 0)
-        
-        # If exact level not found, use highest available
-        if esl > 12:
-            return self.progression_table[-1]['slots'].get(str(spell_level), 0)
-        
-        return 0
+        return int(self.slot_table[min(esl, self.MAX_ESL), spell_level])
+    
+    def get_slot_vector(self, esl):
+        """
+        Get the read-only slot row for an ESL, indexed by spell level (column 0 unused).
+        Preferred over get_all_spell_slots in bulk sweeps.
+        """
+        return self.slot_table[min(max(esl, 0), self.MAX_ESL)]
     
     def get_all_spell_slots(self, esl):
         """
         Calculate all spell slots (levels 1-6) for the given ESL.
         Returns a dict: {1: count, 2: count, ..., 6: count}
         """
-        result = {}
-        
-        if esl == 0:
-            return {i: 0 for i in range(1, 7)}
-        
-        # Find the entry for current ESL
-        spell_slots = None
-        for entry in self.progression_table:
-            if entry['level'] == esl:
-                spell_slots = entry['slots']
-                break
-        
-        # If not found and ESL > 12, use level 12 slots
-        if not spell_slots and esl > 12:
-            spell_slots = self.progression_table[-1]['slots']
-        
-        if spell_slots:
-            for i in range(1, 7):
-                result[i] = spell_slots.get(str(i), 0)
-        else:
-            result = {i: 0 for i in range(1, 7)}
-        
-        return result
+        row = self.get_slot_vector(esl).tolist()
+        return {i: row[i] for i in range(1, 7)}
+    
+    def get_slots_for_caster_levels(self, full_levels, half_levels, one_third_levels):
+        """Get the slot row for a (full, half, one-third) caster level triple from the lattice."""
+        return self.slot_lattice[full_levels, half_levels, one_third_levels]
@@ -0,0 +1,166 @@
+"""Per-turn attack sequence and expected damage across character levels."""
+import numpy as np
+
+from .feature_tables import FeatureTables
+
+
+class TurnEngine:
+    """Derives attacks per turn from class features and evaluates expected damage."""
+
+    def __init__(self, features_loader, feature_tables=None):
+        """Initialize with a ClassFeaturesLoader and optionally prebuilt FeatureTables."""
+        self.features_loader = features_loader
+        self.feature_tables = feature_tables or FeatureTables(features_loader)
+
+    def refresh(self):
+        """Recompile the feature tables after class or subclass data changed."""
+        self.feature_tables = FeatureTables(self.features_loader)
+
+    @staticmethod
+    def get_proficiency_bonus(total_level):
+        """Proficiency bonus for a character level (works on arrays)."""
+        return 2 + (np.maximum(total_level, 1) - 1) // 4
+
+    @staticmethod
+    def levels_to_sequence(character_levels):
+        """Turn a {class: level} dict into a level-up order (classes in sorted order)."""
+        return [
+            class_name
+            for class_name in sorted(character_levels)
+            for _ in range(character_levels[class_name])
+        ]
+
+    def get_progression_arrays(self, class_sequence, subclasses=None):
+        """
+        Resolve turn features for every character level of a level-up order.
+
+        Args:
+            class_sequence: Class names in the order levels were taken
+            subclasses: Dict of class name -> subclass name
+
+        Returns:
+            Dict of arrays indexed by character level - 1: total_level, proficiency,
+            attacks_per_action, action_surges, bonus_unarmed
+        """
+        tables = self.feature_tables
+        resolved = tables.resolve_progression(class_sequence, subclasses)
+        total_level = np.arange(1, len(resolved) + 1)
+
+        return {
+            'total_level': total_level,
+            'proficiency': self.get_proficiency_bonus(total_level),
+            'attacks_per_action': tables.column(resolved, 'attacks_per_action'),
+            'action_surges': tables.column(resolved, 'action_surges'),
+            'bonus_unarmed': tables.column(resolved, 'bonus_unarmed'),
+        }
+
+    @staticmethod
+    def average_hit_damage(attack):
+        """Average damage of one attack that hits (no hit chance or crits), like a spell's per-cast average."""
+        if not attack:
+            return 0.0
+        return sum(c["dice_count"] * (c["dice_sides"] + 1) / 2 + c["flat"] for c in attack["components"])
+
+    @staticmethod
+    def expected_attack_damage(attack, proficiency, target_ac, advantage=0, crit_threshold=20,
+                               damage_bonus=0):
+        """
+        Expected damage of one attack for an array of proficiency bonuses.
+        Same model as DamageCalculator.get_expected_damage.
+
+        damage_bonus is extra flat damage per hit (scalar or array shaped like
+        proficiency), e.g. an ability modifier that isn't in the components.
+        """
+        proficiency = np.asarray(proficiency)
+        if not attack:
+            return np.zeros(proficiency.shape, dtype=float)
+
+        components = attack["components"]
+        dice_avg = sum(c["dice_count"] * (c["dice_sides"] + 1) / 2 for c in components)
+        flat = sum(c["flat"] for c in components)
+
+        crit_threshold = min(max(crit_threshold, 2), 21)
+        attack_bonus = attack["to_hit"] + proficiency
+
+        # Rolls of max(2, AC - bonus) and up hit; crits always hit
+        lowest_hit = np.clip(target_ac - attack_bonus, 2, crit_threshold)
+        hit = (21 - lowest_hit) / 20
+        crit = np.full(hit.shape, (21 - crit_threshold) / 20)
+
+        if advantage > 0:
+            hit = 1 - (1 - hit) ** 2
+            crit = 1 - (1 - crit) ** 2
+        elif advantage < 0:
+            hit = hit ** 2
+            crit = crit ** 2
+
+        return hit * (dice_avg + flat + damage_bonus) + crit * dice_avg
+
+    def evaluate(self, class_sequence, subclasses, main_attack, offhand_attack=None,
+                 target_ac=15, advantage=0, crit_threshold=20, n_turns=1, unarmed=False):
+        """
+        Evaluate expected damage per turn at every level of a progression.
+
+        Args:
+            class_sequence: Class names in the order levels were taken
+            subclasses: Dict of class name -> subclass name
+            main_attack: {"components": [...], "to_hit": int} for the main hand
+            offhand_attack: Same for an off-hand weapon (bonus action), or None
+            target_ac: Armor class of the target
+            advantage: 1 = advantage, -1 = disadvantage, 0 = straight roll
+            crit_threshold: Lowest natural roll that counts as a critical hit
+            n_turns: Number of turns for the total (Action Surge used once)
+            unarmed: Main hand is an unarmed strike (enables Bonus Unarmed Attack)
+
+        Returns:
+            Dict of arrays indexed by character level - 1 with the progression
+            arrays plus: main_per_attack, bonus_per_turn, sustained_per_turn,
+            burst_turn, total_over_turns
+        """
+        progression = self.get_progression_arrays(class_sequence, subclasses)
+        proficiency = progression['proficiency']
+
+        main = self.expected_attack_damage(
+            main_attack, proficiency, target_ac, advantage, crit_threshold
+        )
+
+        # Bonus action: off-hand swing, otherwise a monk's bonus unarmed strike
+        if offhand_attack:
+            bonus = self.expected_attack_damage(
+                offhand_attack, proficiency, target_ac, advantage, crit_threshold
+            )
+        elif unarmed:
+            bonus = main * progression['bonus_unarmed']
+        else:
+            bonus = np.zeros_like(main)
+
+        action = progression['attacks_per_action'] * main
+        sustained = action + bonus
+        surges = np.minimum(progression['action_surges'], max(n_turns, 0))
+
+        progression.update({
+            'main_per_attack': main,
+            'bonus_per_turn': bonus,
+            'sustained_per_turn': sustained,
+            'burst_turn': sustained + np.minimum(progression['action_surges'], 1) * action,
+            'total_over_turns': n_turns * sustained + surges * action,
+        })
+        return progression
+
+    def get_attack_sequence(self, class_sequence, subclasses=None, has_offhand=False, unarmed=False):
+        """
+        Describe the attacks made in one turn at the final level of a progression.
+        Returns: list of strings like "Main Hand (Action)"
+        """
+        progression = self.get_progression_arrays(class_sequence, subclasses)
+        attacks = int(progression['attacks_per_action'][-1])
+
+        sequence = ["Main Hand (Action)"]
+        sequence += ["Main Hand (Extra Attack)"] * (attacks - 1)
+        if has_offhand:
+            sequence.append("Off Hand (Bonus Action)")
+        elif unarmed and progression['bonus_unarmed'][-1]:
+            sequence.append("Unarmed Strike (Bonus Action)")
+        if progression['action_surges'][-1]:
+            sequence += ["Main Hand (Action Surge)"] * attacks
+        return sequence
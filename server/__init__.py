@@ -0,0 +1,10 @@
+"""Local HTTP/JSON evaluation server package."""
+
+from .service import EvaluationService
+from .http_server import MicroBatcher, EvaluationServer
+
+__all__ = [
+    'EvaluationService',
+    'MicroBatcher',
+    'EvaluationServer',
+]
@@ -0,0 +1,55 @@
+"""Run the evaluation server: python -m server [--port 8765] [--workers N]"""
+import argparse
+import asyncio
+
+from .service import EvaluationService
+from .http_server import EvaluationServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local JSON server for build evaluations.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="pool workers for large batches (default: CPU count, 0: none)")
+    parser.add_argument("--backend", choices=("auto", "thread", "process"), default="auto",
+                        help="worker pool kind (auto: threads on free-threaded Python, else processes)")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0,
+                        help="how long to wait for more requests to join a batch")
+    parser.add_argument("--max-batch", type=int, default=1024)
+    parser.add_argument("--pool-threshold", type=int, default=512,
+                        help="smallest batch sent to the worker processes")
+    parser.add_argument("--data-path", default="data")
+    parser.add_argument("--resources-path", default="resources")
+    parser.add_argument("--bundle", default=None,
+                        help="memory-mapped data bundle to load instead of data/ (python -m loaders.data_bundle)")
+    parser.add_argument("--check-weapons", action="store_true",
+                        help="check that every weapon simulates non-zero damage, then exit")
+    args = parser.parse_args()
+
+    print("[*] Loading data...")
+    service = EvaluationService(args.data_path, args.resources_path, args.bundle)
+    if args.check_weapons:
+        failures = service.check_weapon_damage()
+        if failures:
+            print(f"[!] {len(failures)} weapons simulate zero damage: {', '.join(failures)}")
+            raise SystemExit(1)
+        print(f"[OK] All {len(service.data_loader.weapon_data)} weapons deal damage")
+        return
+    server = EvaluationServer(service, args.host, args.port, args.workers,
+                              args.batch_window_ms / 1000, args.max_batch, args.pool_threshold, args.backend)
+
+    async def run():
+        await server.start()
+        kind = "threads" if server.backend == "thread" else "processes"
+        print(f"[OK] Serving on http://{server.host}:{server.port} ({server.workers} worker {kind})")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\n[*] Server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""Local asyncio HTTP/JSON server with micro-batched build evaluation."""
+import asyncio
+import json
+import os
+import time
+from urllib.parse import urlsplit, parse_qs
+
+from utils import make_executor, resolve_backend
+from .service import _init_worker, _evaluate_chunk, _damage_distribution
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent submissions into batches.
+
+    Items submitted within `window` seconds of the first pending item are
+    run together with one call to run_batch, or sooner once `max_batch`
+    items are waiting. Each submitter gets back the results of its own
+    items, in order.
+    """
+
+    def __init__(self, run_batch, window=0.002, max_batch=1024):
+        """
+        Args:
+            run_batch: Coroutine function taking a list of items, returning a list of results
+            window: Seconds to wait for more items after the first one arrives
+            max_batch: Pending item count that flushes immediately
+        """
+        self.run_batch = run_batch
+        self.window = window
+        self.max_batch = max_batch
+
+        self._pending = []  # [(items, future)]
+        self._pending_count = 0
+        self._timer = None
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, items):
+        """Queue items for the next batch and wait for their results."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((items, future))
+        self._pending_count += len(items)
+
+        if self._pending_count >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        pending, self._pending, self._pending_count = self._pending, [], 0
+        asyncio.ensure_future(self._run(pending))
+
+    async def _run(self, pending):
+        items = [item for batch, _ in pending for item in batch]
+        self.batches += 1
+        self.items += len(items)
+        try:
+            results = await self.run_batch(items)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        start = 0
+        for batch, future in pending:
+            if not future.done():
+                future.set_result(results[start:start + len(batch)])
+            start += len(batch)
+
+
+class EvaluationServer:
+    """
+    Serves an EvaluationService over HTTP/1.1 (keep-alive, JSON bodies).
+
+    Endpoints:
+        POST /evaluate        one build -> {"objectives"}
+        POST /evaluate/batch  {"builds": [...]} -> {"results": [...]}
+        POST /distribution    weapon attack -> simulated damage distribution
+        GET  /search          ?q=&kind=&limit= -> {"results": [...]}
+        GET  /catalogue       gear slot items and classes
+        GET  /health          status and batching counters
+
+    Concurrent /evaluate and /evaluate/batch requests share one MicroBatcher,
+    so many small requests become one vectorized evaluation. Batches of at
+    least pool_threshold builds and every distribution go to a worker pool;
+    smaller batches run inline, where the warm GearFrontier caches make them
+    cheaper than a round trip to another process. On free-threaded builds
+    the pool is threads sharing this service; otherwise it is processes
+    whose workers load the data once at startup.
+    """
+
+    MAX_BODY = 16 * 1024 * 1024
+    MAX_BATCH_REQUEST = 10_000
+    STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                   413: "Payload Too Large", 500: "Internal Server Error"}
+
+    def __init__(self, service, host="127.0.0.1", port=8765, workers=None,
+                 batch_window=0.002, max_batch=1024, pool_threshold=512, backend="auto"):
+        """
+        Args:
+            service: Loaded EvaluationService
+            host: Interface to bind (localhost by default)
+            port: TCP port
+            workers: Pool workers (None for the CPU count, 0 for no pool)
+            batch_window: Micro-batching window in seconds
+            max_batch: Builds that flush a batch immediately
+            pool_threshold: Smallest batch sent to the pool
+            backend: "thread", "process" or "auto" (threads on free-threaded builds)
+        """
+        self.service = service
+        self.host = host
+        self.port = port
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.pool_threshold = pool_threshold
+        self.backend = resolve_backend(backend)
+        self.batcher = MicroBatcher(self._run_evaluations, batch_window, max_batch)
+
+        self.routes = {
+            "/evaluate": ("POST", self._evaluate),
+            "/evaluate/batch": ("POST", self._evaluate_batch),
+            "/distribution": ("POST", self._distribution),
+            "/search": ("GET", self._search),
+            "/catalogue": ("GET", self._catalogue),
+            "/health": ("GET", self._health),
+        }
+        self.pool = None
+        self._server = None
+        self.requests = 0
+        self.started = None
+
+    # --- Lifecycle ---
+
+    async def start(self):
+        """Start the worker pool (loading data in every worker process) and bind the socket."""
+        if self.workers > 0:
+            self.pool, _ = make_executor(
+                self.workers, self.backend, _init_worker,
+                (self.service.data_path, self.service.resources_path, self.service.bundle_path),
+            )
+            if self.backend == "process":
+                loop = asyncio.get_running_loop()
+                await asyncio.gather(*(loop.run_in_executor(self.pool, _evaluate_chunk, [])
+                                       for _ in range(self.workers)))
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.started = time.perf_counter()
+
+    async def serve_forever(self):
+        """Start if needed and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop accepting connections and shut the worker pool down."""
+        if self._server is not None:
+            self._server.close()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    # --- Evaluation ---
+
+    async def _run_evaluations(self, payloads):
+        """Evaluate one micro-batch inline or split across the pool."""
+        if self.pool is None or len(payloads) < self.pool_threshold:
+            return self.service.evaluate_builds(payloads)
+
+        loop = asyncio.get_running_loop()
+        size = -(-len(payloads) // self.workers)
+        chunks = [payloads[start:start + size] for start in range(0, len(payloads), size)]
+        evaluate = self.service.evaluate_builds if self.backend == "thread" else _evaluate_chunk
+        parts = await asyncio.gather(*(loop.run_in_executor(self.pool, evaluate, chunk) for chunk in chunks))
+        return [result for part in parts for result in part]
+
+    # --- Endpoints (return (status, JSON-serializable body)) ---
+
+    async def _evaluate(self, body, query):
+        result = (await self.batcher.submit([body]))[0]
+        return (400 if "error" in result else 200), result
+
+    async def _evaluate_batch(self, body, query):
+        builds = body.get("builds") if isinstance(body, dict) else None
+        if not isinstance(builds, list):
+            raise ValueError("expected {\"builds\": [...]}")
+        if len(builds) > self.MAX_BATCH_REQUEST:
+            raise ValueError(f"at most {self.MAX_BATCH_REQUEST} builds per request")
+        return 200, {"results": await self.batcher.submit(builds)}
+
+    async def _distribution(self, body, query):
+        loop = asyncio.get_running_loop()
+        if self.pool is not None:
+            distribution = self.service.damage_distribution if self.backend == "thread" else _damage_distribution
+            return 200, await loop.run_in_executor(self.pool, distribution, body)
+        return 200, await asyncio.to_thread(self.service.damage_distribution, body)
+
+    async def _search(self, body, query):
+        limit = int(query.get("limit", 20))
+        return 200, {"results": self.service.search(query.get("q", ""), query.get("kind"), limit)}
+
+    async def _catalogue(self, body, query):
+        return 200, self.service.catalogue()
+
+    async def _health(self, body, query):
+        batcher = self.batcher
+        return 200, {
+            "status": "ok",
+            "workers": self.workers,
+            "backend": self.backend,
+            "uptime": time.perf_counter() - self.started,
+            "requests": self.requests,
+            "batches": batcher.batches,
+            "evaluations": batcher.items,
+            "mean_batch": batcher.items / batcher.batches if batcher.batches else 0.0,
+        }
+
+    # --- HTTP ---
+
+    async def _dispatch(self, method, target, body):
+        url = urlsplit(target)
+        route = self.routes.get(url.path)
+        if route is None:
+            return 404, {"error": f"no such endpoint: {url.path}"}
+        if method != route[0]:
+            return 405, {"error": f"{url.path} expects {route[0]}"}
+
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            payload = json.loads(body) if body else {}
+            return await route[1](payload, query)
+        except json.JSONDecodeError as e:
+            return 400, {"error": f"invalid JSON: {e}"}
+        except (ValueError, TypeError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    def _response(self, status, payload, keep_alive):
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        head = (f"HTTP/1.1 {status} {self.STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        return head.encode() + body
+
+    async def _handle(self, reader, writer):
+        """Serve requests on one connection until it closes."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ", 2)
+                except ValueError:
+                    writer.write(self._response(400, {"error": "malformed request line"}, False))
+                    break
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > self.MAX_BODY:
+                    writer.write(self._response(413, {"error": "request body too large"}, False))
+                    break
+                try:
+                    body = await reader.readexactly(length) if length else b""
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                self.requests += 1
+                status, payload = await self._dispatch(method, target, body)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,151 @@
+"""
+Load generator for the evaluation server.
+
+Opens keep-alive connections to a running server and sends random valid
+builds as fast as the server answers, then reports throughput and latency:
+
+    python -m server &
+    python -m server.load_generator --requests 50000 --concurrency 64
+    python -m server.load_generator --batch-size 100 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import numpy as np
+
+
+async def _request(reader, writer, method, path, payload=None, host="127.0.0.1"):
+    """Send one HTTP/1.1 request on an open connection; returns (status, decoded body)."""
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+                  f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode() + body)
+    await writer.drain()
+
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    length = 0
+    for line in header_lines:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return int(status_line.split(" ")[1]), json.loads(await reader.readexactly(length))
+
+
+def random_build(catalogue, rng):
+    """A random valid build from the server's catalogue."""
+    chosen = rng.sample(list(catalogue['classes']), rng.randint(1, 3))
+    levels = {}
+    for _ in range(catalogue['max_level']):
+        class_name = rng.choice(chosen)
+        levels[class_name] = levels.get(class_name, 0) + 1
+    subclasses = {c: rng.choice(catalogue['classes'][c]) for c in levels if catalogue['classes'][c]}
+
+    slots = catalogue['slots']
+    gear = {slot: rng.choice(slots[slot]) for slot in
+            ("slot_helmet", "slot_cape", "slot_armor", "slot_gloves", "slot_boots", "slot_amulet",
+             "melee_main", "ranged_main")}
+    gear["slot_ring1"], gear["slot_ring2"] = rng.sample(slots["slot_ring1"][1:], 2)
+    base = [15, 14, 13, 12, 10, 8]
+    rng.shuffle(base)
+    return {
+        "levels": levels,
+        "subclasses": subclasses,
+        "abilities": dict(zip(["Strength", "Dexterity", "Constitution", "Intelligence", "Wisdom", "Charisma"],
+                              base)),
+        "gear": gear,
+        "target_ac": rng.randint(10, 20),
+    }
+
+
+async def run_load(host="127.0.0.1", port=8765, requests=20000, concurrency=64, batch_size=1,
+                   distinct=2000, seed=0):
+    """
+    Drive the server and measure it.
+
+    Args:
+        requests: Total HTTP requests to send
+        concurrency: Open connections, each sending one request at a time
+        batch_size: Builds per request (1 uses /evaluate, more use /evaluate/batch)
+        distinct: Distinct random builds to cycle through
+        seed: Seed for the random builds
+
+    Returns:
+        Dict with request/evaluation counts, errors, elapsed seconds,
+        throughput, latency percentiles (ms) and the server's /health counters
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    _, catalogue = await _request(reader, writer, "GET", "/catalogue", host=host)
+    rng = random.Random(seed)
+    builds = [random_build(catalogue, rng) for _ in range(distinct)]
+
+    latencies = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def client():
+        nonlocal errors
+        client_reader, client_writer = await asyncio.open_connection(host, port)
+        try:
+            for i in counter:
+                if batch_size == 1:
+                    path, payload = "/evaluate", builds[i % distinct]
+                else:
+                    start = i * batch_size
+                    path, payload = "/evaluate/batch", {
+                        "builds": [builds[(start + k) % distinct] for k in range(batch_size)]}
+                sent = time.perf_counter()
+                status, result = await _request(client_reader, client_writer, "POST", path, payload, host)
+                latencies.append(time.perf_counter() - sent)
+                if status != 200 or (batch_size > 1 and any("error" in r for r in result["results"])):
+                    errors += 1
+        finally:
+            client_writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    _, health = await _request(reader, writer, "GET", "/health", host=host)
+    writer.close()
+
+    latencies = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'evaluations': len(latencies) * batch_size,
+        'errors': errors,
+        'elapsed': elapsed,
+        'requests_per_second': len(latencies) / elapsed,
+        'evaluations_per_second': len(latencies) * batch_size / elapsed,
+        'latency_ms': {str(p): float(np.percentile(latencies, p)) for p in (50, 95, 99)},
+        'server': health,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the evaluation server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"[*] {args.requests} requests x {args.batch_size} builds over {args.concurrency} connections...")
+    report = asyncio.run(run_load(args.host, args.port, args.requests, args.concurrency,
+                                  args.batch_size, seed=args.seed))
+    latency = report['latency_ms']
+    print(f"[OK] {report['requests']} requests, {report['evaluations']} evaluations in {report['elapsed']:.2f}s "
+          f"({report['errors']} errors)")
+    print(f"[->] {report['requests_per_second']:.0f} requests/s, "
+          f"{report['evaluations_per_second']:.0f} evaluations/s")
+    print(f"[->] Latency p50 {latency['50']:.2f} ms, p95 {latency['95']:.2f} ms, p99 {latency['99']:.2f} ms")
+    print(f"[->] Server: {report['server']['batches']} batches, "
+          f"mean batch {report['server']['mean_batch']:.1f} builds")
+
+
+if __name__ == "__main__":
+    main()
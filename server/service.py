@@ -0,0 +1,294 @@
+"""Evaluation service behind the HTTP server: data loaded once, JSON in, JSON out."""
+import contextlib
+import io
+
+from loaders import DataLoader, DataBundle
+from models import Character, ArmorCalculator, DamageCalculator, TurnEngine
+from analysis import GearFrontier
+from simulation import CombatSimulator
+from utils import AbilityScoreCalculator, EquipmentCategorizer
+
+
+# Service of a worker process (set by _init_worker)
+_WORKER = None
+
+
+def _init_worker(data_path, resources_path, bundle_path=None):
+    global _WORKER
+    with contextlib.redirect_stdout(io.StringIO()):
+        _WORKER = EvaluationService(data_path, resources_path, bundle_path)
+
+
+def _evaluate_chunk(payloads):
+    """Evaluate build payloads in a worker process."""
+    return _WORKER.evaluate_builds(payloads)
+
+
+def _damage_distribution(payload):
+    """Simulate a damage distribution in a worker process."""
+    return _WORKER.damage_distribution(payload)
+
+
+class EvaluationService:
+    """
+    Build evaluation, damage distributions and catalogue search on plain dicts.
+
+    Everything is loaded once in __init__; requests only read the shared
+    GearFrontier caches, so a warm service evaluates a batch of builds with
+    one vectorized GearFrontier.evaluate_batch call. Invalid payloads raise
+    ValueError (or come back as {"error"} entries inside a batch).
+    """
+
+    SEARCH_KINDS = ("weapon", "equipment", "spell", "enemy", "class")
+    MAX_SIMULATED_ATTACKS = 1_000_000
+
+    def __init__(self, data_path="data", resources_path="resources", bundle_path=None):
+        """
+        Load game data and build the evaluators.
+
+        With bundle_path the data comes from a memory-mapped DataBundle
+        (see loaders/data_bundle.py) instead of the JSON files, so worker
+        processes share one read-only copy and skip parsing and the
+        FeatureTables compile.
+        """
+        self.data_path = data_path
+        self.resources_path = resources_path
+        self.bundle_path = bundle_path
+
+        if bundle_path:
+            self.bundle = DataBundle(bundle_path)
+            self.data_loader = DataLoader.from_bundle(self.bundle, resources_path)
+            self.features_loader = self.data_loader.features_loader
+            feature_tables = self.bundle.feature_tables(self.features_loader)
+        else:
+            self.bundle = None
+            self.data_loader = DataLoader(data_path, resources_path)
+            self.features_loader = self.data_loader.features_loader
+            feature_tables = None
+        equipment, weapons = self.data_loader.equipment_data, self.data_loader.weapon_data
+        self.categorizer = EquipmentCategorizer(equipment, weapons)
+        categories = self.categorizer.get_all_categories()
+
+        self.damage_calc = DamageCalculator(equipment, weapons)
+        self.armor_calc = ArmorCalculator(equipment, weapons, categories['shields'])
+        self.turn_engine = TurnEngine(self.features_loader, feature_tables)
+        self.gear_frontier = GearFrontier(self.categorizer, self.damage_calc, self.armor_calc, self.turn_engine)
+        self.simulator = CombatSimulator()
+
+        frontier = self.gear_frontier
+        self.slot_items = {slot: ["None"] + frontier.slot_items[slot] for slot in frontier.ACCESSORY_SLOTS}
+        self.slot_items["slot_armor"] = ["None"] + frontier.slot_items["slot_armor"]
+        self.slot_items["slot_ring1"] = self.slot_items["slot_ring2"] = ["None"] + frontier.slot_items["slot_ring"]
+        self.slot_items["melee_main"] = ["Unarmed"] + frontier.melee_mains
+        self.slot_items["melee_off"] = ["None"] + frontier.melee_offhands
+        self.slot_items["ranged_main"] = ["None"] + frontier.ranged_mains
+        self.slot_items["ranged_off"] = ["None"] + frontier.ranged_offhands
+        self._slot_sets = {slot: set(items) for slot, items in self.slot_items.items()}
+
+        self.classes = {name.lower(): name for name in self.features_loader.get_available_classes()}
+        self._search_index = self._build_search_index()
+
+    # --- Builds ---
+
+    def parse_build(self, payload):
+        """
+        Validate a build payload.
+
+        Payload keys: levels {class: level}, subclasses {class: subclass},
+        abilities {ability: score} or modifiers {ability: modifier},
+        gear {slot tag: item}, target_ac (default 15).
+
+        Returns:
+            (gear, turn stats, ability modifiers, target AC)
+        """
+        if not isinstance(payload, dict):
+            raise ValueError("build must be an object")
+
+        levels = payload.get("levels") or {}
+        if not isinstance(levels, dict):
+            raise ValueError("levels must be an object of class -> level")
+        for class_name, level in levels.items():
+            if class_name.lower() not in self.classes:
+                raise ValueError(f"unknown class: {class_name}")
+            if not isinstance(level, int) or level < 1:
+                raise ValueError(f"invalid level for {class_name}: {level}")
+        if sum(levels.values()) > Character.MAX_LEVEL:
+            raise ValueError(f"total level above {Character.MAX_LEVEL}")
+
+        subclasses = payload.get("subclasses") or {}
+        for class_name, subclass in subclasses.items():
+            options = self.features_loader.get_subclass_options(class_name.lower())
+            if subclass not in options:
+                raise ValueError(f"unknown subclass for {class_name}: {subclass}")
+
+        if "modifiers" in payload:
+            mods = {ability: int(payload["modifiers"].get(ability, 0))
+                    for ability in AbilityScoreCalculator.ABILITIES}
+        else:
+            mods = AbilityScoreCalculator.calculate_all_modifiers(payload.get("abilities") or {})
+
+        gear = {}
+        for slot, item in (payload.get("gear") or {}).items():
+            if slot not in self._slot_sets:
+                raise ValueError(f"unknown gear slot: {slot}")
+            if item not in self._slot_sets[slot]:
+                raise ValueError(f"{item} can't go in {slot}")
+            gear[slot] = item
+        if not self.gear_frontier.melee_offhand_allowed(gear.get("melee_main", "Unarmed"),
+                                                        gear.get("melee_off", "None")):
+            raise ValueError("melee off hand can't be held with that main hand")
+        if not self.gear_frontier.ranged_offhand_allowed(gear.get("ranged_main", "None"),
+                                                         gear.get("ranged_off", "None")):
+            raise ValueError("ranged off hand can't be held with that main hand")
+        if gear.get("slot_ring1", "None") != "None" and gear.get("slot_ring1") == gear.get("slot_ring2"):
+            raise ValueError("the same ring can't be worn twice")
+
+        target_ac = payload.get("target_ac", 15)
+        if not isinstance(target_ac, int):
+            raise ValueError("target_ac must be an integer")
+
+        turn_stats = self.gear_frontier.get_turn_stats(levels, subclasses)
+        return gear, turn_stats, mods, target_ac
+
+    def evaluate_builds(self, payloads):
+        """
+        Objectives (AC, Melee, Ranged) of many builds in one vectorized pass.
+
+        Returns:
+            List in payload order of {"objectives": {...}} or {"error": message}
+        """
+        results = [None] * len(payloads)
+        parsed, rows = [], []
+        for i, payload in enumerate(payloads):
+            try:
+                parsed.append(self.parse_build(payload))
+                rows.append(i)
+            except (ValueError, TypeError, AttributeError) as e:
+                results[i] = {"error": str(e)}
+
+        if parsed:
+            objectives = self.gear_frontier.evaluate_batch(*map(list, zip(*parsed)))
+            for i, values in zip(rows, objectives):
+                results[i] = {"objectives": values}
+        return results
+
+    def evaluate_build(self, payload):
+        """Objectives of one build; raises ValueError for an invalid payload."""
+        result = self.evaluate_builds([payload])[0]
+        if "error" in result:
+            raise ValueError(result["error"])
+        return result
+
+    # --- Damage distribution ---
+
+    def damage_distribution(self, payload):
+        """
+        Simulated damage distribution of one weapon attack per round.
+
+        Payload keys: weapon (name), handedness ("1h"/"2h", default the
+        weapon's best), ability_mod, proficiency (default 2), target_ac,
+        attacks (rolled attacks, default 100000), attacks_per_round,
+        advantage, seed.
+
+        Returns:
+            Dict with mean damage, hit/crit rates, per-type means, percentiles
+            and the per-round distribution as [damage, probability] pairs
+        """
+        if not isinstance(payload, dict):
+            raise ValueError("request must be an object")
+        item = self.damage_calc.weap_map.get(payload.get("weapon"))
+        if not item:
+            raise ValueError(f"unknown weapon: {payload.get('weapon')}")
+
+        handedness = payload.get("handedness")
+        if handedness not in ("1h", "2h"):
+            handedness = self.default_handedness(item)
+        ability_mod = int(payload.get("ability_mod", 0))
+        attack = self.damage_calc.build_weapon_attack(item, handedness, ability_mod, [], item['name'])
+
+        attacks = int(payload.get("attacks", 100_000))
+        if not 1 <= attacks <= self.MAX_SIMULATED_ATTACKS:
+            raise ValueError(f"attacks must be between 1 and {self.MAX_SIMULATED_ATTACKS}")
+
+        result = self.simulator.simulate_attacks(
+            attack["components"], attack["to_hit"] + int(payload.get("proficiency", 2)),
+            int(payload.get("target_ac", 15)), attacks,
+            advantage=int(payload.get("advantage", 0)), seed=payload.get("seed"),
+            collect_histogram=True, attacks_per_round=max(1, int(payload.get("attacks_per_round", 1))),
+        )
+        return {
+            'weapon': item['name'],
+            'handedness': handedness,
+            'attacks': result['attacks'],
+            'seed': result['seed'],
+            'hit_rate': result['hit_rate'],
+            'crit_rate': result['crit_rate'],
+            'mean_damage': result['mean_damage'],
+            'mean_damage_by_type': result['mean_damage_by_type'],
+            'percentiles': {str(p): v for p, v in result['percentiles'].items()},
+            'distribution': [[value, float(p)] for value, p in result['histogram'].distribution().items()],
+        }
+
+    def default_handedness(self, item):
+        """'2h' when the weapon has two-handed base damage (versatile or two-handed), else '1h'."""
+        return '2h' if self.damage_calc.parse_weapon_base_components(item, '2h', item['name']) else '1h'
+
+    def check_weapon_damage(self, attacks=200, target_ac=1):
+        """
+        Simulate every weapon with its default handedness against a low AC.
+
+        Returns:
+            Names of weapons whose mean damage is zero (no base damage parsed)
+        """
+        failures = []
+        for item in self.data_loader.weapon_data:
+            result = self.damage_distribution(
+                {"weapon": item['name'], "target_ac": target_ac, "attacks": attacks, "seed": 0}
+            )
+            if result['mean_damage'] <= 0:
+                failures.append(item['name'])
+        return failures
+
+    # --- Catalogue ---
+
+    def _build_search_index(self):
+        """(lowercase name, entry) pairs for every searchable record."""
+        loader = self.data_loader
+        entries = [("weapon", item['name'], item.get('type', '')) for item in loader.weapon_data]
+        entries += [("equipment", item['name'], item.get('type', '')) for item in loader.equipment_data]
+        entries += [("spell", spell['name'], spell.get('school', '')) for spell in self.features_loader.spells]
+        entries += [("enemy", enemy['name'], f"AC {enemy.get('ac', '')}") for enemy in loader.enemy_data]
+        entries += [("class", name, ", ".join(self.features_loader.get_subclass_options(key)))
+                    for key, name in self.classes.items()]
+        return [(name.lower(), {"kind": kind, "name": name, "type": type_name})
+                for kind, name, type_name in entries]
+
+    def search(self, query="", kind=None, limit=20):
+        """
+        Case-insensitive substring search over weapons, equipment, spells, enemies and classes.
+
+        Args:
+            query: Text to look for in names (empty matches everything)
+            kind: One of SEARCH_KINDS to restrict results, or None
+            limit: Maximum results (0 for all)
+
+        Returns:
+            List of {kind, name, type}, names starting with the query first
+        """
+        if kind and kind not in self.SEARCH_KINDS:
+            raise ValueError(f"kind must be one of {', '.join(self.SEARCH_KINDS)}")
+        query = (query or "").lower()
+        matches = [
+            (not name.startswith(query), name, entry) for name, entry in self._search_index
+            if query in name and (not kind or entry["kind"] == kind)
+        ]
+        matches.sort(key=lambda match: match[:2])
+        return [entry for _, _, entry in matches[:limit or None]]
+
+    def catalogue(self):
+        """Items allowed in every gear slot and the subclasses of every class."""
+        return {
+            'slots': self.slot_items,
+            'classes': {name: self.features_loader.get_subclass_options(key) for key, name in self.classes.items()},
+            'max_level': Character.MAX_LEVEL,
+        }
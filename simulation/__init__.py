@@ -0,0 +1,11 @@
+"""Simulation package for Monte Carlo combat analysis."""
+
+from .rng import SimulationRNG
+from .sketches import DamageHistogram
+from .simulator import CombatSimulator
+
+__all__ = [
+    'SimulationRNG',
+    'DamageHistogram',
+    'CombatSimulator',
+]
@@ -0,0 +1,85 @@
+"""Mergeable fixed-bin damage histograms for bounded-memory statistics."""
+import numpy as np
+
+
+class DamageHistogram:
+    """
+    Exact histogram of integer damage values over a known range.
+
+    Damage from dice and flat bonuses is always an integer between a known
+    minimum and maximum, so one bin per value gives exact counts, means and
+    quantiles in memory that depends only on the range, never on the number
+    of samples. Histograms with the same range merge by adding counts, which
+    lets per-worker results combine across a process pool.
+    """
+
+    def __init__(self, low, high):
+        """Initialize an empty histogram covering [low, high]."""
+        self.low = int(low)
+        self.high = max(int(high), self.low)
+        self.counts = np.zeros(self.high - self.low + 1, dtype=np.int64)
+        self.total = 0
+
+    @classmethod
+    def from_components(cls, components, attacks_per_round=1):
+        """Create a histogram covering every damage value the components can roll."""
+        hit_min = sum(c["dice_count"] + c["flat"] for c in components)
+        crit_max = sum(2 * c["dice_count"] * c["dice_sides"] + c["flat"] for c in components)
+
+        # A miss deals 0, so the range always includes it
+        low = min(0, hit_min) * attacks_per_round
+        high = max(0, crit_max) * attacks_per_round
+        return cls(low, high)
+
+    def update(self, values):
+        """Add an array of integer damage samples."""
+        values = np.asarray(values, dtype=np.int64)
+        if values.size == 0:
+            return
+
+        offsets = np.clip(values - self.low, 0, len(self.counts) - 1)
+        self.counts += np.bincount(offsets, minlength=len(self.counts))
+        self.total += int(values.sum())
+
+    def merge(self, other):
+        """Add the counts of another histogram with the same range."""
+        if (other.low, other.high) != (self.low, self.high):
+            raise ValueError(
+                f"Cannot merge histogram [{other.low}, {other.high}] into [{self.low}, {self.high}]"
+            )
+        self.counts += other.counts
+        self.total += other.total
+        return self
+
+    @property
+    def count(self):
+        """Number of samples recorded."""
+        return int(self.counts.sum())
+
+    def mean(self):
+        """Mean of all samples, or 0 when empty."""
+        count = self.count
+        return self.total / count if count else 0.0
+
+    def quantile(self, q):
+        """Smallest damage value with at least a fraction q of samples at or below it."""
+        count = self.count
+        if count == 0:
+            return None
+
+        cumulative = np.cumsum(self.counts)
+        target = max(1, int(np.ceil(q * count)))
+        return self.low + int(np.searchsorted(cumulative, target))
+
+    def percentiles(self, points=(5, 25, 50, 75, 95, 99)):
+        """Get a dict of percentile -> damage value."""
+        return {p: self.quantile(p / 100) for p in points}
+
+    def distribution(self):
+        """Get a dict of damage value -> probability for the recorded samples."""
+        count = self.count
+        if count == 0:
+            return {}
+
+        nonzero = np.nonzero(self.counts)[0]
+        return {self.low + int(i): self.counts[i] / count for i in nonzero}
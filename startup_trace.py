@@ -0,0 +1,206 @@
+"""
+Startup Trace
+=============
+Timeline of module imports, data file reads and parses, index builds and
+widget construction, written as Chrome trace JSON (chrome://tracing or
+https://ui.perfetto.dev) plus a summary table on the console.
+
+Tracing is off unless enabled; a disabled span() costs one attribute check.
+It lives outside the packages so it can be imported (and start timing
+imports) before any of them:
+
+    import startup_trace
+    startup_trace.enable_from_argv(sys.argv)   # --trace-startup [PATH]
+    startup_trace.trace_imports(("dearpygui", "loaders", "models"))
+
+    with startup_trace.span("parse weapons.json", "json"):
+        ...
+    startup_trace.write("startup_trace.json")
+"""
+
+import builtins
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupTracer:
+    """Collects complete ("X") and instant ("i") events in Chrome trace format."""
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.origin = time.perf_counter_ns()
+        self._threads = {}  # {thread id: thread name}
+        self._original_import = None
+
+    def _now(self):
+        """Microseconds since the tracer was created."""
+        return (time.perf_counter_ns() - self.origin) / 1000
+
+    def _thread(self):
+        thread = threading.current_thread()
+        self._threads.setdefault(thread.ident, thread.name)
+        return thread.ident
+
+    def begin(self, name, category="startup", **args):
+        """Start a span; returns a token for end() (None when disabled)."""
+        if not self.enabled:
+            return None
+        return (name, category, args, self._now(), self._thread())
+
+    def end(self, token):
+        """Finish a span started with begin()."""
+        if token is None:
+            return
+        name, category, args, start, tid = token
+        event = {"name": name, "cat": category, "ph": "X", "ts": start,
+                 "dur": self._now() - start, "pid": os.getpid(), "tid": tid}
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    @contextmanager
+    def span(self, name, category="startup", **args):
+        token = self.begin(name, category, **args)
+        try:
+            yield
+        finally:
+            self.end(token)
+
+    def instant(self, name, category="startup"):
+        """Mark a point in time (e.g. first frame)."""
+        if self.enabled:
+            self.events.append({"name": name, "cat": category, "ph": "i", "s": "g", "ts": self._now(),
+                                "pid": os.getpid(), "tid": self._thread()})
+
+    def trace_imports(self, modules):
+        """
+        Time the first import of the given top-level modules (and their
+        submodules) by wrapping builtins.__import__ while tracing is enabled.
+        """
+        if not self.enabled or self._original_import is not None:
+            return
+        watched = set(modules)
+        original = self._original_import = builtins.__import__
+
+        def traced_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level == 0 and name.split(".")[0] in watched and name not in sys.modules:
+                with self.span(f"import {name}", "import"):
+                    return original(name, globals, locals, fromlist, level)
+            return original(name, globals, locals, fromlist, level)
+
+        builtins.__import__ = traced_import
+
+    def stop_import_tracing(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def to_chrome_trace(self):
+        """Chrome trace JSON object (events plus thread names)."""
+        metadata = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+                    for tid, name in self._threads.items()]
+        return {"traceEvents": metadata + sorted(self.events, key=lambda e: e["ts"]), "displayTimeUnit": "ms"}
+
+    def write(self, path):
+        """Write the Chrome trace JSON; returns the path."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
+        return path
+
+    def summary(self, top=15):
+        """
+        Summary table: time per category, then the slowest spans.
+
+        Returns:
+            Multi-line string
+        """
+        spans = [e for e in self.events if e["ph"] == "X"]
+        by_category = {}
+        for event in spans:
+            total, count = by_category.get(event["cat"], (0.0, 0))
+            by_category[event["cat"]] = (total + event["dur"], count + 1)
+
+        lines = [f"{'Category':<14}{'Spans':>7}{'Incl. ms':>12}"]  # spans nest, so categories overlap
+        for category, (total, count) in sorted(by_category.items(), key=lambda item: -item[1][0]):
+            lines.append(f"{category:<14}{count:>7}{total / 1000:>12.1f}")
+
+        lines.append("")
+        lines.append(f"{'Slowest spans':<48}{'Category':<12}{'Start ms':>10}{'ms':>10}")
+        for event in sorted(spans, key=lambda e: -e["dur"])[:top]:
+            lines.append(f"{event['name'][:47]:<48}{event['cat']:<12}"
+                         f"{event['ts'] / 1000:>10.1f}{event['dur'] / 1000:>10.1f}")
+
+        marks = [e for e in self.events if e["ph"] == "i"]
+        if marks:
+            lines.append("")
+            lines += [f"{e['name']:<48}{'':<12}{e['ts'] / 1000:>10.1f}" for e in sorted(marks, key=lambda e: e["ts"])]
+        return "\n".join(lines)
+
+
+# Process-wide tracer used by the module functions below
+TRACER = StartupTracer()
+
+DEFAULT_TRACE_PATH = "startup_trace.json"
+
+
+def enable_from_argv(argv, flag="--trace-startup"):
+    """
+    Enable tracing if argv has the flag (alone or as flag=PATH); checked
+    before argparse runs so imports can be traced.
+
+    Returns:
+        True when tracing is enabled
+    """
+    if any(arg == flag or arg.startswith(f"{flag}=") for arg in argv):
+        TRACER.enabled = True
+    return TRACER.enabled
+
+
+def enabled():
+    return TRACER.enabled
+
+
+def span(name, category="startup", **args):
+    return TRACER.span(name, category, **args)
+
+
+def begin(name, category="startup", **args):
+    return TRACER.begin(name, category, **args)
+
+
+def end(token):
+    TRACER.end(token)
+
+
+def instant(name, category="startup"):
+    TRACER.instant(name, category)
+
+
+def trace_imports(modules):
+    TRACER.trace_imports(modules)
+
+
+def write(path=DEFAULT_TRACE_PATH):
+    return TRACER.write(path)
+
+
+def summary(top=15):
+    return TRACER.summary(top)
+
+
+def load_json(path, label=None):
+    """json.load a file, tracing the read and the parse separately."""
+    label = label or os.path.basename(str(path))
+    if not TRACER.enabled:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    with TRACER.span(f"read {label}", "io"):
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    with TRACER.span(f"parse {label}", "json", bytes=len(text)):
+        return json.loads(text)
@@ -1,6 +1,7 @@
 """UI rendering utilities for damage breakdowns and other components."""
 import os
 import dearpygui.dearpygui as dpg
+import startup_trace
 
 
 # Damage type color mappings
@@ -75,11 +76,12 @@ def load_damage_type_textures():
         if not os.path.isfile(file_path):
             continue
         
-        width, height, channels, data = dpg.load_image(file_path)
-        texture_tag = f"tex_damage_{dmg_key}"
-        
-        if not dpg.does_item_exist(texture_tag):
-            dpg.add_static_texture(width, height, data, tag=texture_tag)
+        with startup_trace.span(f"texture {filename}", "texture"):
+            width, height, channels, data = dpg.load_image(file_path)
+            texture_tag = f"tex_damage_{dmg_key}"
+            
+            if not dpg.does_item_exist(texture_tag):
+                dpg.add_static_texture(width, height, data, tag=texture_tag)
         
         DAMAGE_TYPE_TEXTURES[dmg_key] = texture_tag
 
@@ -2,6 +2,9 @@
 
 from .ability_calculator import AbilityScoreCalculator
 from .equipment_categorizer import EquipmentCategorizer
+from .memory_report import MemoryReport, deep_sizeof
+from .parallel import free_threaded, make_executor, resolve_backend
+from .startup_pipeline import StartupPipeline
 from .weapon_parser import (
     get_weapon_handedness,
     parse_dice_string,
@@ -13,6 +16,12 @@ from .weapon_parser import (
 __all__ = [
     'AbilityScoreCalculator',
     'EquipmentCategorizer',
+    'MemoryReport',
+    'deep_sizeof',
+    'free_threaded',
+    'make_executor',
+    'resolve_backend',
+    'StartupPipeline',
     'get_weapon_handedness',
     'parse_dice_string',
     'parse_damage_value',
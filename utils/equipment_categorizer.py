@@ -27,6 +27,25 @@ class EquipmentCategorizer:
         self._categorize_equipment()
         self._categorize_weapons()
     
+    def refresh(self, equipment=False, weapons=False):
+        """
+        Re-categorize after the data lists changed (lists are updated in place).
+        
+        Returns:
+            Set of category names whose contents changed
+        """
+        before = {key: list(items) for key, items in self.get_all_categories().items()}
+        if equipment:
+            for items in (self.helmets, self.armor_clothing, self.boots, self.capes,
+                          self.gloves, self.amulets, self.rings, self.shields):
+                items.clear()
+            self._categorize_equipment()
+        if weapons:
+            for items in (self.melee_1h, self.melee_2h, self.ranged_1h, self.ranged_2h):
+                items.clear()
+            self._categorize_weapons()
+        return {key for key, items in self.get_all_categories().items() if items != before[key]}
+    
     def _categorize_equipment(self):
         """Categorize equipment items by type."""
         for item in self.equip_data:
@@ -0,0 +1,202 @@
+"""Memory footprint accounting: object-graph sizes per subsystem and tracemalloc growth."""
+import gc
+import sys
+import tracemalloc
+import types
+
+
+# Leaves of the object graph (no references worth following)
+ATOMIC_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None), range)
+
+# Shared program structure, not data: never counted
+SKIPPED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                 types.MethodType, types.CodeType)
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    Size of an object and everything reachable from it.
+
+    Follows dict keys/values, list/tuple/set items, instance __dict__ and
+    __slots__; numpy arrays count their own buffer (views and memory maps
+    count only their header).
+
+    Args:
+        obj: Root object
+        seen: Set of object ids already counted (shared between calls to
+              attribute each object to the first root that reaches it)
+
+    Returns:
+        (bytes, object count)
+    """
+    seen = set() if seen is None else seen
+    total, count = 0, 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, SKIPPED_TYPES):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        count += 1
+
+        if isinstance(current, ATOMIC_TYPES):
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, "dtype") and hasattr(current, "nbytes"):
+            continue
+        else:
+            attributes = getattr(current, "__dict__", None)
+            if attributes is not None:
+                stack.append(attributes)
+            for cls in type(current).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if hasattr(current, slot):
+                        stack.append(getattr(current, slot))
+    return total, count
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class MemoryReport:
+    """
+    Retained memory per subsystem.
+
+    Subsystems are measured in the order they were added: "deep" is the
+    whole graph reachable from a subsystem, "retained" only what no earlier
+    subsystem already reaches. Adding the raw data first therefore makes a
+    name map's retained size its own dict overhead, and a cache's retained
+    size what the cache adds on top of the data it points to.
+
+    With tracing on, mark() records tracemalloc's current size (e.g. after
+    each startup stage) and measure_growth() tracks allocations across
+    repeated calls of a function.
+    """
+
+    def __init__(self, trace=True, frames=1):
+        """
+        Args:
+            trace: Start tracemalloc now (if not already tracing)
+            frames: Traceback depth stored per allocation
+        """
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.subsystems = []  # [(name, objects, external bytes)]
+        self.marks = []  # [(label, traced bytes)]
+
+    def add(self, name, *objects, external_bytes=0):
+        """
+        Register a subsystem.
+
+        Args:
+            name: Label in the report
+            *objects: Roots of its object graph (None is ignored)
+            external_bytes: Memory held outside Python objects (SQLite pages, mapped files)
+        """
+        self.subsystems.append((name, [obj for obj in objects if obj is not None], external_bytes))
+
+    def mark(self, label):
+        """Record tracemalloc's current traced size under a label."""
+        if tracemalloc.is_tracing():
+            self.marks.append((label, tracemalloc.get_traced_memory()[0]))
+
+    def measure(self):
+        """
+        Returns:
+            List of {"name", "objects", "deep_bytes", "retained_bytes", "external_bytes"}
+        """
+        seen = set()
+        rows = []
+        for name, objects, external_bytes in self.subsystems:
+            deep = sum(deep_sizeof(obj)[0] for obj in objects)
+            retained, count = 0, 0
+            for obj in objects:
+                size, objs = deep_sizeof(obj, seen)
+                retained += size
+                count += objs
+            rows.append({
+                'name': name,
+                'objects': count,
+                'deep_bytes': deep,
+                'retained_bytes': retained,
+                'external_bytes': external_bytes,
+            })
+        return rows
+
+    def measure_growth(self, function, calls=20, warmup=2, top=10):
+        """
+        Allocation growth across repeated calls (tracemalloc must be tracing).
+
+        Args:
+            function: Callable run with no arguments
+            calls: Measured calls
+            warmup: Unmeasured calls first (fills caches that are meant to fill)
+            top: Number of source lines to report
+
+        Returns:
+            {"calls", "per_call": [traced bytes after each call, relative to the start],
+             "growth_bytes": retained after the calls (snapshot diff, tracemalloc's own allocations excluded),
+             "top": [(source line, size diff, count diff)]}
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        for _ in range(warmup):
+            function()
+        gc.collect()
+        before = tracemalloc.take_snapshot()
+        start = tracemalloc.get_traced_memory()[0]
+
+        per_call = []
+        for _ in range(calls):
+            function()
+            per_call.append(tracemalloc.get_traced_memory()[0] - start)
+
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+        growing = [stat for stat in stats if stat.size_diff > 0][:top]
+        return {
+            'calls': calls,
+            'per_call': per_call,
+            'growth_bytes': sum(stat.size_diff for stat in stats),
+            'top': [(str(stat.traceback[0]), stat.size_diff, stat.count_diff) for stat in growing],
+        }
+
+    def format(self, growth=None):
+        """Report as a multi-line string (growth: optional measure_growth result)."""
+        rows = self.measure()
+        lines = [f"{'Subsystem':<40}{'Objects':>10}{'Deep':>12}{'Retained':>12}{'External':>12}"]
+        for row in rows:
+            external = format_bytes(row['external_bytes']) if row['external_bytes'] else "-"
+            lines.append(f"{row['name'][:39]:<40}{row['objects']:>10}{format_bytes(row['deep_bytes']):>12}"
+                         f"{format_bytes(row['retained_bytes']):>12}{external:>12}")
+        lines.append(f"{'Total':<40}{sum(r['objects'] for r in rows):>10}{'':>12}"
+                     f"{format_bytes(sum(r['retained_bytes'] for r in rows)):>12}"
+                     f"{format_bytes(sum(r['external_bytes'] for r in rows)):>12}")
+
+        if self.marks:
+            lines.append("")
+            lines.append(f"{'tracemalloc (after)':<40}{'Traced':>12}{'Delta':>12}")
+            previous = 0
+            for label, size in self.marks:
+                lines.append(f"{label[:39]:<40}{format_bytes(size):>12}{format_bytes(size - previous):>12}")
+                previous = size
+
+        if growth is not None:
+            lines.append("")
+            lines.append(f"Allocation growth over {growth['calls']} calls: {format_bytes(growth['growth_bytes'])} "
+                         f"({format_bytes(growth['growth_bytes'] / max(growth['calls'], 1))} per call)")
+            for source, size_diff, count_diff in growth['top']:
+                lines.append(f"  {format_bytes(size_diff):>10}  {count_diff:>+7} blocks  {source}")
+        return "\n".join(lines)
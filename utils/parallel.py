@@ -0,0 +1,55 @@
+"""
+Worker pools for batch evaluation: threads on free-threaded CPython, processes otherwise.
+
+On a free-threaded build (python3.14t with the GIL off) threads run Python
+code in parallel and share the evaluators and their caches, so there is
+nothing to pickle or load per worker. With the GIL, threads would take
+turns, so the default falls back to processes.
+
+    executor, backend = make_executor(4, initializer=_init_worker, initargs=(...))
+    if backend == "thread":
+        executor.submit(evaluate_genomes, gear_frontier, mods_table, chunk)
+    else:
+        executor.submit(_evaluate_chunk, chunk)   # uses the worker's own copy
+"""
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+BACKENDS = ("auto", "thread", "process")
+
+
+def free_threaded():
+    """True when Python runs without the GIL (free-threaded build, GIL not re-enabled)."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def resolve_backend(backend="auto"):
+    """"thread" or "process"; "auto" picks threads only when there is no GIL."""
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {', '.join(BACKENDS)}")
+    if backend == "auto":
+        return "thread" if free_threaded() else "process"
+    return backend
+
+
+def make_executor(workers, backend="auto", initializer=None, initargs=(), name="evaluate"):
+    """
+    Create a worker pool.
+
+    Args:
+        workers: Number of threads or processes
+        backend: "auto", "thread" or "process"
+        initializer: Per-process setup (loads the worker's own evaluators);
+                     not run for threads, which use the caller's objects
+        initargs: Arguments of initializer
+        name: Thread name prefix
+
+    Returns:
+        (executor, resolved backend)
+    """
+    backend = resolve_backend(backend)
+    if backend == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name), backend
+    return ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs), backend
@@ -0,0 +1,77 @@
+"""Staged startup: run loading steps in a background thread with progress reporting."""
+import threading
+import time
+import traceback
+
+import startup_trace
+
+
+class StartupPipeline:
+    """
+    Runs named loading stages in order, off the UI thread.
+
+    Every stage is (name, load, ready): load() does the slow work and
+    returns a result, ready(result) publishes it (fills widgets, enables
+    controls). Progress is reported before and after each stage so the
+    UI can show which step is running; a failing stage stops the
+    pipeline and is reported through on_error.
+    """
+
+    def __init__(self, stages, on_progress=None, on_error=None, on_done=None):
+        """
+        Args:
+            stages: List of (name, load, ready) with ready optional (None)
+            on_progress: Callable(completed stages, total stages, stage name, finished flag)
+            on_error: Callable(stage name, exception, formatted traceback)
+            on_done: Callable(timings) once every stage finished
+        """
+        self.stages = list(stages)
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self.on_done = on_done
+
+        self.timings = []  # [(stage name, seconds)]
+        self.ready = threading.Event()
+        self.failed = None
+        self._thread = None
+
+    def run(self):
+        """Run every stage in the calling thread; returns the timings."""
+        total = len(self.stages)
+        for index, (name, load, *rest) in enumerate(self.stages):
+            ready = rest[0] if rest else None
+            if self.on_progress:
+                self.on_progress(index, total, name, False)
+            start = time.perf_counter()
+            try:
+                with startup_trace.span(name, "stage"):
+                    with startup_trace.span(f"load {name.lower()}", "load"):
+                        result = load()
+                    if ready is not None:
+                        with startup_trace.span(f"publish {name.lower()}", "ui"):
+                            ready(result)
+            except Exception as e:
+                self.failed = (name, e)
+                if self.on_error:
+                    self.on_error(name, e, traceback.format_exc())
+                else:
+                    raise
+                return self.timings
+            self.timings.append((name, time.perf_counter() - start))
+            if self.on_progress:
+                self.on_progress(index + 1, total, name, True)
+
+        self.ready.set()
+        if self.on_done:
+            self.on_done(self.timings)
+        return self.timings
+
+    def start(self):
+        """Run the stages in a daemon thread; returns immediately."""
+        self._thread = threading.Thread(target=self.run, name="startup", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def wait(self, timeout=None):
+        """Block until every stage finished (or timeout); True when ready."""
+        return self.ready.wait(timeout)